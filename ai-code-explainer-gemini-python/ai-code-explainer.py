@@ -10,6 +10,16 @@ readable error messages instead of raising).
 
 Usage:
     python main.py
+    python ai-code-explainer.py --repo path/to/package --output code_explanations --workers 8 --rpm 60
+
+    python ai-code-explainer.py --repo path/to/package --diff HEAD~1
+
+With `--repo`, every Python file below the directory is split into its
+functions and classes (see `code_symbols`), each symbol is explained
+concurrently under a rate limit, and a Markdown report is written per module.
+Explanations are kept in a store keyed on each symbol's normalized AST, so a
+re-run only sends the symbols whose code changed. With `--diff`, only the
+symbols touched by `git diff` are explained.
 
 Requirements:
     - google-genai
@@ -17,10 +27,23 @@ Requirements:
     - GEMINI_API_KEY environment variable (or set in .env)
 """
 
+import argparse
+import hashlib
 import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Iterator, Optional
 from dotenv import load_dotenv
 from google import genai
 
+# Make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from genai_common import (RateLimiter, RequestUsage, ResponseCache, generate_content_cached,
+                          generate_content_cached_async, get_context_cache, get_genai_client, usage_from_response)
+from code_symbols import MAX_SYMBOL_TOKENS, Symbol, estimate_tokens, iter_changed_symbols, iter_module_symbols
+
 # Load environment variables from .env file (if present)
 load_dotenv()
 
@@ -28,20 +51,47 @@ load_dotenv()
 # Model selection and generation temperature for more deterministic output
 TARGET_MODEL = "gemini-3-flash-preview"
 TEMPERATURE = 0.2
+# Role given to the model for every explanation
+SYSTEM_INSTRUCTIONS = "You are an expert Senior Developer. Please analyze the following Python code:"
+
+# Sections requested for every file; only the code changes between requests
+ANALYSIS_RUBRIC = """
+        Please provide:
+        1. A short overview of what the code does.
+        2. Explanation of key components and program flow.
+        3. Any potential issues, bugs, or suggested improvements.
+        4. Time and space complexity analysis for the main functions.
+        """
+
+# Prompt prefix uploaded once when context caching is enabled. Cached content
+# has to come before the request, so the rubric precedes the code here.
+CACHED_PROMPT_PREFIX = f"""
+        Analyze the Python code in the next message and provide the requested sections.
+{ANALYSIS_RUBRIC}"""
+
 # Relative path to the example code file to analyze
 TARGET_FILE = "data/code.py"
 
+# Repository mode settings
+DEFAULT_REPORT_DIR = "code_explanations"  # Directory receiving one Markdown report per module
+DEFAULT_REPO_WORKERS = 4  # Concurrent symbol requests
+DEFAULT_REQUESTS_PER_MINUTE = 60  # Request budget shared by all workers
+DEFAULT_STORE_FILE = ".code_explanations.sqlite"  # Explanations keyed on normalized AST hashes
+STORE_MAX_ENTRIES = 1_000_000  # Explanations kept in the store
+
 
 def create_genai_client() -> 'genai.Client':
     """Initialize and return an authenticated GenAI client.
 
     The client relies on the `GEMINI_API_KEY` being available in the
     environment (for example via a local `.env` file loaded above).
+    The process-wide client from `genai_common` is returned, so every
+    request reuses its pooled keep-alive connections.
 
     Returns:
         genai.Client: An authenticated GenAI client instance.
     """
-    return genai.Client()
+    return get_genai_client()
 
 def create_user_prompt(content: str) -> str:
     """Build a structured prompt instructing the model how to analyze code.
@@ -58,18 +108,23 @@ def create_user_prompt(content: str) -> str:
     # the model produce structured, easy-to-read output.
     user_prompt = f"""
         Analyze this Python code and provide the requested sections.
+{create_code_section(content)}{ANALYSIS_RUBRIC}"""
+    return user_prompt
 
+def create_code_section(content: str) -> str:
+    """Wrap the code to analyze in a fenced block.
+
+    Args:
+        content: The Python source code to be analyzed.
+
+    Returns:
+        The part of the prompt that changes per file.
+    """
+    return f"""
         ```python
         {content}
         ```
-
-        Please provide:
-        1. A short overview of what the code does.
-        2. Explanation of key components and program flow.
-        3. Any potential issues, bugs, or suggested improvements.
-        4. Time and space complexity analysis for the main functions.
-        """
-    return user_prompt
+"""
 
 def read_code_from_file(file_path: str) -> str:
     """Read and return the contents of a file.
@@ -97,12 +152,33 @@ def read_code_from_file(file_path: str) -> str:
         raise FileNotFoundError(f"Could not find input file at: {file_path}")
 
 
+def describe_api_error(e: Exception) -> str:
+    """Turn an exception from the GenAI API into a readable message.
+
+    Args:
+        e: The exception raised while calling the model.
+
+    Returns:
+        The error message shown to the user.
+    """
+    if isinstance(e, AttributeError):
+        return "Error: Invalid response format from the API."
+    if isinstance(e, ValueError):
+        return f"Invalid input value: {e}"
+    if isinstance(e, ConnectionError):
+        return "Error: Failed to connect to the API. Check your internet connection."
+    if isinstance(e, TimeoutError):
+        return "Error: Request timed out. Please try again."
+    return f"An unexpected error occurred while calling the GenAI API: {e}"
+
 def explain_code(client: 'genai.Client', prompt: str) -> str:
     """Call the GenAI model to analyze code and return the textual result.
 
     The function provides a short `system_instruction` to the model to
     encourage an expert-level analysis. Common API errors are handled and
-    returned as readable messages to keep the CLI interactive.
+    returned as readable messages to keep the CLI interactive. When the
+    response cache is enabled (`GENAI_CACHE`), re-explaining unchanged code
+    is served from the cache instead of calling the model again.
 
     Args:
         client: Authenticated GenAI client instance.
@@ -111,48 +187,380 @@ def explain_code(client: 'genai.Client', prompt: str) -> str:
     Returns:
         The model's response text, or an error string describing the failure.
     """
-    system_instructions = "You are an expert Senior Developer. Please analyze the following Python code:"
     try:
-        response = client.models.generate_content(
+        response = generate_content_cached(
+            client,
             model=TARGET_MODEL,
             config=genai.types.GenerateContentConfig(
-                system_instruction=system_instructions,
+                system_instruction=SYSTEM_INSTRUCTIONS,
                 temperature=TEMPERATURE
             ),
-            contents=prompt
+            contents=prompt,
+            cacheable=True
         )
         return response.text
-    except AttributeError:
-        return "Error: Invalid response format from the API."
-    except ValueError as e:
-        return f"Invalid input value: {e}"
-    except ConnectionError:
-        return "Error: Failed to connect to the API. Check your internet connection."
-    except TimeoutError:
-        return "Error: Request timed out. Please try again."
     except Exception as e:
-        return f"An unexpected error occurred while calling the GenAI API: {e}"
+        return describe_api_error(e)
+
+async def explain_code_async(client: 'genai.Client', prompt: str) -> str:
+    """Async version of `explain_code`, using the SDK's async client (`client.aio`).
+
+    Same request, response cache and error messages as `explain_code`,
+    without blocking the event loop; fan out many calls with
+    `genai_common.gather_bounded`.
+
+    Args:
+        client: Authenticated GenAI client instance.
+        prompt: The user-facing prompt produced by `create_user_prompt`.
+
+    Returns:
+        The model's response text, or an error string describing the failure.
+    """
+    try:
+        response = await generate_content_cached_async(
+            client,
+            model=TARGET_MODEL,
+            config=genai.types.GenerateContentConfig(
+                system_instruction=SYSTEM_INSTRUCTIONS,
+                temperature=TEMPERATURE
+            ),
+            contents=prompt,
+            cacheable=True
+        )
+        return response.text
+    except Exception as e:
+        return describe_api_error(e)
+
+def explain_code_content(client: 'genai.Client', content: str) -> tuple[str, Optional[RequestUsage]]:
+    """Explain source code and report the token usage of the request.
+
+    With context caching enabled (`GENAI_CONTEXT_CACHE`), the system
+    instruction and `CACHED_PROMPT_PREFIX` are uploaded once and only the
+    code is sent with each request. Without it, the prompt from
+    `create_user_prompt` is sent as usual. Like `explain_code`, API errors
+    are returned as readable messages.
+
+    Args:
+        client: Authenticated GenAI client instance.
+        content: The Python source code to be analyzed.
+
+    Returns:
+        The model's response text (or an error string) and the input, cached
+        and output token counts of the request, which are None on error.
+    """
+    config = genai.types.GenerateContentConfig(
+        system_instruction=SYSTEM_INSTRUCTIONS,
+        temperature=TEMPERATURE
+    )
+    context_cache = get_context_cache()
+    try:
+        if context_cache is not None:
+            response, usage = context_cache.generate(
+                client,
+                model=TARGET_MODEL,
+                system_instruction=SYSTEM_INSTRUCTIONS,
+                prefix=CACHED_PROMPT_PREFIX,
+                contents=create_code_section(content),
+                config=config,
+                cacheable=True
+            )
+            return response.text, usage
+        response = generate_content_cached(
+            client,
+            model=TARGET_MODEL,
+            config=config,
+            contents=create_user_prompt(content),
+            cacheable=True
+        )
+        return response.text, usage_from_response(response)
+    except Exception as e:
+        return describe_api_error(e), None
+
+def open_explanation_store(path: str) -> ResponseCache:
+    """Open the persistent store of symbol explanations.
+
+    The store is a `ResponseCache` with only a small memory tier; its SQLite
+    tier holds the explanations across runs.
+
+    Args:
+        path: SQLite file of the store.
+
+    Returns:
+        The store.
+    """
+    return ResponseCache(max_entries=256, sqlite_path=path, max_disk_entries=STORE_MAX_ENTRIES)
+
+def explanation_key(symbol: Symbol) -> str:
+    """Build the store key of a symbol.
+
+    The key combines the symbol's normalized AST hash with the model and
+    prompt, so reformatting or moving code keeps its explanation while a
+    structural change (or a new prompt) misses.
+
+    Args:
+        symbol: The symbol to look up.
+
+    Returns:
+        A sha256 hex digest.
+    """
+    payload = "\0".join((TARGET_MODEL, str(TEMPERATURE), SYSTEM_INSTRUCTIONS, ANALYSIS_RUBRIC, symbol.ast_hash))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def explain_symbol(client: 'genai.Client', symbol: Symbol, limiter: Optional[RateLimiter] = None,
+                   store: Optional[ResponseCache] = None) -> dict:
+    """Explain one function or class with its imports and signature as context (repo mode worker).
+
+    When the store already has an explanation for the symbol's normalized
+    AST, it is returned without calling the model.
+
+    Args:
+        client: Authenticated GenAI client instance.
+        symbol: The symbol to explain.
+        limiter: Optional rate limiter shared by all workers.
+        store: Optional store of explanations from earlier runs.
+
+    Returns:
+        A record with the symbol, its explanation (or None), an error message
+        (or None), whether it came from the store, its token counts and the
+        seconds taken.
+    """
+    key = explanation_key(symbol) if store is not None else None
+    stored = store.get(key) if store is not None else None
+    if stored is not None:
+        return {"symbol": symbol, "explanation": stored, "error": None, "stored": True,
+                "input_tokens": 0, "output_tokens": 0, "seconds": 0.0}
+    content = symbol.context()
+    if limiter is not None:
+        limiter.acquire(estimate_tokens(content) + estimate_tokens(ANALYSIS_RUBRIC))
+    started = time.perf_counter()
+    text, usage = explain_code_content(client, content)
+    error = None
+    if usage is None:
+        error = text
+    elif not text:
+        error = "Error: Empty response received from the API."
+    elif store is not None:
+        store.put(key, text)
+    return {
+        "symbol": symbol,
+        "explanation": None if error else text,
+        "error": error,
+        "stored": False,
+        "input_tokens": usage.input_tokens if usage else 0,
+        "output_tokens": usage.output_tokens if usage else 0,
+        "seconds": time.perf_counter() - started,
+    }
+
+def iter_repo_explanations(client: 'genai.Client', modules: Iterator[tuple[str, list[Symbol], Optional[str]]],
+                           max_workers: int = DEFAULT_REPO_WORKERS, limiter: Optional[RateLimiter] = None,
+                           store: Optional[ResponseCache] = None) -> Iterator[dict]:
+    """Explain the symbols of every module concurrently and yield each module once it is complete.
+
+    Modules are consumed lazily and at most `max_workers` symbols are in
+    flight, so memory stays bounded by the modules currently being explained.
+
+    Args:
+        client: Authenticated GenAI client instance.
+        modules: Modules with their symbols, from `iter_module_symbols` or `iter_changed_symbols`.
+        max_workers: Maximum number of concurrent symbol requests.
+        limiter: Optional rate limiter shared by all workers.
+        store: Optional store of explanations from earlier runs.
+
+    Yields:
+        One dict per module with its path, the symbol records in source
+        order, and an error message (None unless the module could not be parsed).
+
+    Raises:
+        ValueError: If `max_workers` is below 1.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    records: dict[str, list] = {}
+    remaining: dict[str, int] = {}
+
+    def finish(futures: set[Future]) -> Iterator[dict]:
+        for future in futures:
+            record = future.result()
+            module = record["symbol"].module
+            records[module].append(record)
+            remaining[module] -= 1
+            if remaining[module] == 0:
+                del remaining[module]
+                symbols = sorted(records.pop(module), key=lambda r: r["symbol"].start_line)
+                yield {"module": module, "symbols": symbols, "error": None}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: set[Future] = set()
+        for module, symbols, error in modules:
+            if error or not symbols:
+                yield {"module": module, "symbols": [], "error": error}
+                continue
+            records[module] = []
+            remaining[module] = len(symbols)
+            for symbol in symbols:
+                if len(pending) >= max_workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from finish(done)
+                pending.add(executor.submit(explain_symbol, client, symbol, limiter, store))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from finish(done)
+
+def write_module_report(output_dir: str, result: dict, suffix: str = ".md") -> str:
+    """Write the Markdown report of one module.
+
+    Args:
+        output_dir: Directory receiving the reports (mirrors the source tree).
+        result: A module result from `iter_repo_explanations`.
+        suffix: Appended to the module path to name the report.
+
+    Returns:
+        Path of the written report.
+    """
+    report_path = os.path.join(output_dir, result["module"] + suffix)
+    os.makedirs(os.path.dirname(report_path), exist_ok=True)
+    with open(report_path, "w", encoding="utf-8") as report:
+        report.write(f"# {result['module']}\n")
+        if result["error"]:
+            report.write(f"\n{result['error']}\n")
+        for record in result["symbols"]:
+            symbol = record["symbol"]
+            report.write(f"\n## {symbol.kind} `{symbol.name}` (lines {symbol.start_line}-{symbol.end_line})\n\n")
+            report.write((record["explanation"] or record["error"]).strip() + "\n")
+    return report_path
+
+def run_repo(client: 'genai.Client', root: str, output_dir: str, max_workers: int = DEFAULT_REPO_WORKERS,
+             limiter: Optional[RateLimiter] = None, store: Optional[ResponseCache] = None,
+             diff_revision: Optional[str] = None, max_symbol_tokens: int = MAX_SYMBOL_TOKENS) -> dict:
+    """Explain a source tree symbol by symbol and write one report per module.
+
+    Args:
+        client: Authenticated GenAI client instance.
+        root: Source directory (or a single file).
+        output_dir: Directory receiving the Markdown reports.
+        max_workers: Maximum number of concurrent symbol requests.
+        limiter: Optional rate limiter shared by all workers.
+        store: Optional store of explanations; unchanged symbols are served from it.
+        diff_revision: Only explain the code changed since this git revision;
+            the reports are then written as `<module>.diff.md`.
+        max_symbol_tokens: Classes estimated above this size are explained
+            method by method.
+
+    Returns:
+        Counts of modules, symbols, stored symbols and failures, the elapsed
+        seconds, files per minute and average tokens per file.
+
+    Raises:
+        ValueError: If `git diff` fails in diff mode.
+    """
+    if diff_revision:
+        print(f"Explaining the Python code in {root} changed since {diff_revision} "
+              f"with {max_workers} worker(s)...")
+        modules = iter_changed_symbols(root, diff_revision, max_symbol_tokens)
+    else:
+        print(f"Explaining the Python files in {root} with {max_workers} worker(s)...")
+        modules = iter_module_symbols(root, max_symbol_tokens)
+    started = time.perf_counter()
+    totals: dict = defaultdict(int)
+    for result in iter_repo_explanations(client, modules, max_workers, limiter, store):
+        report_path = write_module_report(output_dir, result, ".diff.md" if diff_revision else ".md")
+        failed = sum(1 for record in result["symbols"] if record["error"])
+        stored = sum(1 for record in result["symbols"] if record["stored"])
+        tokens = sum(record["input_tokens"] + record["output_tokens"] for record in result["symbols"])
+        totals["modules"] += 1
+        totals["symbols"] += len(result["symbols"])
+        totals["stored_symbols"] += stored
+        totals["failed_symbols"] += failed
+        totals["failed_modules"] += bool(result["error"])
+        totals["tokens"] += tokens
+        status = result["error"] or (f"{failed} failed" if failed else "ok")
+        print(f"{result['module']:<50} {len(result['symbols']):>4} symbol(s) {stored:>4} stored "
+              f"{tokens:>8} tokens  {status}  -> {report_path}")
+    elapsed = time.perf_counter() - started
+    summary = dict(totals, elapsed_seconds=elapsed,
+                   files_per_minute=totals["modules"] / (elapsed / 60) if elapsed else 0.0,
+                   tokens_per_file=totals["tokens"] / totals["modules"] if totals["modules"] else 0.0)
+    print(f"\nExplained {summary['symbols']} symbol(s) in {summary['modules']} module(s) in {elapsed:.1f}s "
+          f"({summary['stored_symbols']} from the store, {summary['failed_symbols']} symbol(s) and "
+          f"{summary['failed_modules']} module(s) failed).")
+    print(f"Files per minute: {summary['files_per_minute']:.1f} | Tokens per file: {summary['tokens_per_file']:.0f}")
+    return summary
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Parse command-line options.
+
+    Without options the tool explains `TARGET_FILE` in a single request, as before.
+
+    Args:
+        argv: Arguments to parse; defaults to `sys.argv`.
+
+    Returns:
+        The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Explain Python code with Google Gemini.")
+    parser.add_argument("--repo", metavar="PATH",
+                        help="Source directory to explain function by function and class by class.")
+    parser.add_argument("--output", default=DEFAULT_REPORT_DIR,
+                        help=f"Directory for the per-module reports (default: {DEFAULT_REPORT_DIR}).")
+    parser.add_argument("--workers", type=int, default=DEFAULT_REPO_WORKERS,
+                        help=f"Concurrent symbol requests (default: {DEFAULT_REPO_WORKERS}).")
+    parser.add_argument("--rpm", type=float, default=DEFAULT_REQUESTS_PER_MINUTE,
+                        help=f"Requests per minute (default: {DEFAULT_REQUESTS_PER_MINUTE}).")
+    parser.add_argument("--tpm", type=float, help="Estimated tokens per minute (default: unlimited).")
+    parser.add_argument("--diff", metavar="REVISION", nargs="?", const="HEAD",
+                        help="Only explain the code changed since a git revision (default: HEAD).")
+    parser.add_argument("--max-symbol-tokens", type=int, default=MAX_SYMBOL_TOKENS,
+                        help=f"Classes estimated above this many tokens are explained method by method "
+                             f"(default: {MAX_SYMBOL_TOKENS}).")
+    parser.add_argument("--store", default=DEFAULT_STORE_FILE,
+                        help=f"SQLite store of explanations reused across runs (default: {DEFAULT_STORE_FILE}).")
+    parser.add_argument("--no-store", action="store_true", help="Explain every symbol without the store.")
+    return parser.parse_args(argv)
 
 def main() -> None:
-    """Script entry point: read file, build prompt, call model, and print result."""
+    """Script entry point: read file, build prompt, call model, and print result.
+
+    With `--repo` a whole source tree is explained symbol by symbol instead
+    (see `run_repo`), optionally limited to the code changed since a git
+    revision with `--diff`.
+    """
+    args = parse_args()
     print("--- Welcome to your AI Code Explainer! ---")
+    if args.repo:
+        client = create_genai_client()
+        context_cache = get_context_cache()
+        store = None if args.no_store else open_explanation_store(os.path.abspath(args.store))
+        try:
+            run_repo(client, os.path.abspath(args.repo), os.path.abspath(args.output), args.workers,
+                     RateLimiter(args.rpm, args.tpm), store, args.diff, args.max_symbol_tokens)
+        except ValueError as e:
+            print(f"Error: {e}")
+        finally:
+            if context_cache is not None:
+                context_cache.release(client)
+        return
     print("Analyzing code from file:", TARGET_FILE)
 
     # Read source code to analyze
     code_content = read_code_from_file(TARGET_FILE)
 
-    # Build the prompt that instructs the model how to analyze the code
-    user_prompt = create_user_prompt(code_content)
-
-    # Initialize client and make the API call
+    # Initialize client and make the API call (the prompt is built from the
+    # shared rubric and the code, see `explain_code_content`)
     client = create_genai_client()
     print("Explaining code... Please wait.\n")
-    result = explain_code(client, user_prompt)
+    context_cache = get_context_cache()
+    try:
+        result, usage = explain_code_content(client, code_content)
+    finally:
+        if context_cache is not None:
+            context_cache.release(client)
 
     # Print a readable separator and the model's output
     print("-" * 60)
     print(result)
     print("-" * 60)
+    if usage is not None:
+        print(usage.summary())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,360 @@
+"""
+Split Python modules into symbols (functions and classes) with `ast`.
+
+Each symbol carries the minimal context needed to explain it on its own:
+the module-level imports it actually uses and the signature of the class it
+belongs to (for methods). Classes are explained as a whole unless they are
+larger than a token budget, in which case each method becomes a symbol of
+its own. Module-level code outside any function or class is not explained
+separately; a module without functions or classes becomes a single symbol.
+
+Every symbol also gets a hash of its normalized AST (plus its context), which
+ignores whitespace, comments and line numbers, so a store of explanations
+keyed on it only misses when the code structurally changed.
+`iter_changed_symbols` selects just the symbols touched by a `git diff`.
+"""
+
+import ast
+import hashlib
+import os
+import re
+import subprocess
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+# Rough characters-per-token ratio used to size symbols
+CHARS_PER_TOKEN = 4
+# Classes estimated above this many tokens are split into their methods
+MAX_SYMBOL_TOKENS = 3000
+# Directories never searched for source files
+SKIPPED_DIRECTORIES = {"__pycache__", "venv", ".venv", "env", "node_modules", "build", "dist", "site-packages"}
+# Hunk header of a unified diff: "@@ -old_start[,old_count] +new_start[,new_count] @@"
+HUNK_HEADER_PATTERN = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+# Escape sequences git uses in quoted paths, besides three-digit octal bytes
+GIT_PATH_ESCAPES = {b"a": b"\a", b"b": b"\b", b"t": b"\t", b"n": b"\n", b"v": b"\v", b"f": b"\f", b"r": b"\r",
+                    b'"': b'"', b"\\": b"\\"}
+
+
+@dataclass
+class Symbol:
+    """A function, class or method extracted from a module.
+
+    Attributes:
+        module: Path of the module, relative to the source root.
+        name: Qualified name, such as `parse` or `Parser.parse`.
+        kind: "function", "class", "method", "module" or "hunk" (changed
+            module-level lines in diff mode).
+        source: Source code of the symbol, including decorators.
+        start_line: First line of the symbol in the module (1-based).
+        end_line: Last line of the symbol in the module.
+        imports: Module-level import statements the symbol uses.
+        parent_signature: Signature of the enclosing class, for methods.
+        ast_hash: Hash of the normalized AST of the symbol and its context.
+    """
+
+    module: str
+    name: str
+    kind: str
+    source: str
+    start_line: int
+    end_line: int
+    imports: list[str] = field(default_factory=list)
+    parent_signature: Optional[str] = None
+    ast_hash: str = ""
+
+    def context(self) -> str:
+        """Render the symbol with its imports and enclosing signature for the prompt.
+
+        Returns:
+            The code sent to the model: a module comment, the used imports,
+            the enclosing class signature (for methods) and the symbol source.
+        """
+        lines = [f"# Module: {self.module} (lines {self.start_line}-{self.end_line})"]
+        lines.extend(self.imports)
+        if self.parent_signature:
+            lines.append(f"{self.parent_signature}  # enclosing class")
+        lines.append(self.source)
+        return "\n".join(lines)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text from its length."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def collect_source_files(root: str) -> list[str]:
+    """Find the Python files below a directory (or return the file itself).
+
+    Hidden directories and common virtualenv/build directories are skipped.
+
+    Args:
+        root: A directory or a single `.py` file.
+
+    Returns:
+        Sorted absolute paths of the Python files.
+    """
+    root = os.path.abspath(root)
+    if os.path.isfile(root):
+        return [root]
+    paths = []
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories[:] = [d for d in subdirectories if not d.startswith(".") and d not in SKIPPED_DIRECTORIES]
+        paths.extend(os.path.join(directory, name) for name in files if name.endswith(".py"))
+    return sorted(paths)
+
+
+def signature_of(node: ast.AST) -> str:
+    """Return the header line of a function or class definition, without its body.
+
+    Args:
+        node: A `FunctionDef`, `AsyncFunctionDef` or `ClassDef` node.
+
+    Returns:
+        The signature, such as `def parse(text: str) -> dict:` or `class Parser(Base):`.
+    """
+    if isinstance(node, ast.ClassDef):
+        bases = [ast.unparse(base) for base in node.bases] + [ast.unparse(k) for k in node.keywords]
+        return f"class {node.name}({', '.join(bases)}):" if bases else f"class {node.name}:"
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+    return f"{prefix} {node.name}({ast.unparse(node.args)}){returns}:"
+
+
+def normalized_hash(*parts: object) -> str:
+    """Hash AST nodes (and strings) independently of formatting.
+
+    Nodes are dumped without line and column attributes, so whitespace,
+    comments and the position of the code do not change the hash.
+
+    Args:
+        parts: AST nodes or strings to hash together.
+
+    Returns:
+        A sha256 hex digest.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        text = ast.dump(part, include_attributes=False) if isinstance(part, ast.AST) else str(part)
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _import_bindings(tree: ast.Module, lines: list[str]) -> list[tuple[str, set[str], ast.AST]]:
+    """Return each module-level import statement with the names it binds and its node."""
+    bindings = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            names = {(alias.asname or alias.name).split(".")[0] for alias in node.names}
+            text = "\n".join(lines[node.lineno - 1:node.end_lineno]).strip()
+            bindings.append((text, names, node))
+    return bindings
+
+
+def _used_names(node: ast.AST) -> set[str]:
+    """Return the names a node reads (the roots of attribute chains included)."""
+    return {child.id for child in ast.walk(node) if isinstance(child, ast.Name)}
+
+
+def _node_source(node: ast.AST, lines: list[str]) -> tuple[str, int]:
+    """Return the source of a definition including its decorators, and its first line."""
+    start = min([node.lineno] + [decorator.lineno for decorator in getattr(node, "decorator_list", [])])
+    return "\n".join(lines[start - 1:node.end_lineno]), start
+
+
+def extract_symbols(source: str, module: str, max_tokens: int = MAX_SYMBOL_TOKENS) -> list[Symbol]:
+    """Split a module into its top-level functions and classes.
+
+    Args:
+        source: Source code of the module.
+        module: Module path reported with each symbol.
+        max_tokens: Classes estimated above this size are split into their methods.
+
+    Returns:
+        The symbols in source order; the whole module as one symbol when it
+        defines no functions or classes (and is not empty).
+
+    Raises:
+        SyntaxError: If the module cannot be parsed.
+    """
+    tree = ast.parse(source)
+    lines = source.splitlines()
+    imports = _import_bindings(tree, lines)
+
+    def make_symbol(node: ast.AST, name: str, kind: str, parent: Optional[ast.ClassDef] = None) -> Symbol:
+        text, start = _node_source(node, lines)
+        names = _used_names(node)
+        used = [(import_text, import_node) for import_text, bound, import_node in imports if bound & names]
+        parent_signature = signature_of(parent) if parent is not None else None
+        ast_hash = normalized_hash(kind, node, *(import_node for _, import_node in used), parent_signature or "")
+        return Symbol(module, name, kind, text, start, node.end_lineno, [import_text for import_text, _ in used],
+                      parent_signature, ast_hash)
+
+    symbols = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            symbols.append(make_symbol(node, node.name, "function"))
+        elif isinstance(node, ast.ClassDef):
+            text, _ = _node_source(node, lines)
+            methods = [child for child in node.body if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))]
+            if estimate_tokens(text) <= max_tokens or not methods:
+                symbols.append(make_symbol(node, node.name, "class"))
+                continue
+            for method in methods:
+                symbols.append(make_symbol(method, f"{node.name}.{method.name}", "method", node))
+    if not symbols and source.strip():
+        symbols.append(Symbol(module, "<module>", "module", source, 1, len(lines),
+                              ast_hash=normalized_hash("module", tree)))
+    return symbols
+
+
+def iter_module_symbols(root: str, max_tokens: int = MAX_SYMBOL_TOKENS
+                        ) -> Iterator[tuple[str, list[Symbol], Optional[str]]]:
+    """Parse every Python file below `root` into symbols, one file at a time.
+
+    Args:
+        root: Source directory (or a single file).
+        max_tokens: Classes estimated above this size are split into their methods.
+
+    Yields:
+        The module path relative to `root`, its symbols, and an error message
+        (None unless the file could not be read or parsed).
+    """
+    base = os.path.abspath(root) if os.path.isdir(root) else os.path.dirname(os.path.abspath(root))
+    for path in collect_source_files(root):
+        module = os.path.relpath(path, base)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                yield module, extract_symbols(file.read(), module, max_tokens), None
+        except (SyntaxError, UnicodeDecodeError, ValueError) as e:
+            yield module, [], f"Could not parse {module}: {e}"
+
+
+def _diff_path(path: str) -> str:
+    """Return the file name of a `+++` diff header line, unquoted.
+
+    Git appends a tab to names containing spaces and quotes names containing
+    control characters, double quotes or backslashes, C-style.
+    """
+    path = path.removesuffix("\t")
+    if path.startswith('"') and path.endswith('"'):
+        raw = re.sub(rb"\\([0-7]{3}|.)",
+                     lambda m: bytes([int(m.group(1), 8)]) if len(m.group(1)) == 3 else GIT_PATH_ESCAPES[m.group(1)],
+                     path[1:-1].encode("utf-8"))
+        path = raw.decode("utf-8", errors="surrogateescape")
+    return path
+
+
+def changed_line_ranges(root: str, revision: str = "HEAD", pathspec: str = "*.py"
+                        ) -> dict[str, list[tuple[int, int]]]:
+    """Run `git diff` and collect the changed line ranges of every Python file.
+
+    The working tree is compared against `revision`; untracked files are not
+    included. A hunk that only deletes lines is reported as the single line
+    where the deletion happened.
+
+    Args:
+        root: Directory inside a git repository; paths are reported relative to it.
+        revision: Revision (or range such as `main...HEAD`) to diff against.
+        pathspec: Files to diff, as a git pathspec.
+
+    Returns:
+        Changed (first, last) line ranges in the new version of each file, keyed
+        by path relative to `root`. Deleted files are left out.
+
+    Raises:
+        ValueError: If git is not available or the diff fails.
+    """
+    command = ["git", "-C", root, "-c", "core.quotePath=false", "diff", "--relative", "--unified=0", "--no-color",
+               "--no-ext-diff", revision, "--", pathspec]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, encoding="utf-8", check=True)
+    except FileNotFoundError:
+        raise ValueError("git is required for diff mode but was not found")
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f"git diff failed: {e.stderr.strip() or e}")
+
+    ranges: dict[str, list[tuple[int, int]]] = {}
+    current: Optional[list[tuple[int, int]]] = None
+    for line in result.stdout.splitlines():
+        if line.startswith("+++ "):
+            path = _diff_path(line[4:])
+            current = None if path == "/dev/null" else ranges.setdefault(path[2:] if path.startswith("b/") else path, [])
+            continue
+        match = HUNK_HEADER_PATTERN.match(line)
+        if match and current is not None:
+            start = int(match.group(1))
+            count = 1 if match.group(2) is None else int(match.group(2))
+            current.append((max(start, 1), max(start, 1) + max(count, 1) - 1))
+    return ranges
+
+
+def select_changed_symbols(module: str, symbols: list[Symbol], ranges: list[tuple[int, int]],
+                           source: str) -> list[Symbol]:
+    """Keep the symbols that overlap a changed range, and turn the other ranges into hunk symbols.
+
+    Args:
+        module: Module path reported with hunk symbols.
+        symbols: Symbols of a module, from `extract_symbols`.
+        ranges: Changed (first, last) line ranges of the module.
+        source: Source code of the module.
+
+    Returns:
+        The touched symbols in source order, plus one "hunk" symbol per run of
+        changed lines that lies outside every symbol (module-level code). A
+        range that partly overlaps symbols only contributes its uncovered lines.
+    """
+    lines = source.splitlines()
+    selected = [s for s in symbols if any(first <= s.end_line and s.start_line <= last for first, last in ranges)]
+    for first, last in ranges:
+        uncovered = [line for line in range(first, last + 1)
+                     if not any(s.start_line <= line <= s.end_line for s in symbols)]
+        # Split the uncovered lines into contiguous runs
+        runs: list[list[int]] = []
+        for line in uncovered:
+            if runs and runs[-1][-1] == line - 1:
+                runs[-1].append(line)
+            else:
+                runs.append([line])
+        for run in runs:
+            start, end = run[0], run[-1]
+            text = "\n".join(lines[start - 1:end])
+            if not text.strip():
+                continue
+            selected.append(Symbol(module, f"lines {start}-{end}", "hunk", text, start, end,
+                                   ast_hash=normalized_hash("hunk", " ".join(text.split()))))
+    return sorted(selected, key=lambda symbol: symbol.start_line)
+
+
+def iter_changed_symbols(root: str, revision: str = "HEAD", max_tokens: int = MAX_SYMBOL_TOKENS
+                         ) -> Iterator[tuple[str, list[Symbol], Optional[str]]]:
+    """Like `iter_module_symbols`, but only for the code touched by `git diff revision`.
+
+    Args:
+        root: Directory inside a git repository (or a single file in one).
+        revision: Revision (or range) to diff against.
+        max_tokens: Classes estimated above this size are split into their methods.
+
+    Yields:
+        The module path relative to `root` (or to the file's directory), its
+        touched symbols, and an error message (None unless the file could not
+        be read or parsed).
+
+    Raises:
+        ValueError: If the diff fails.
+    """
+    if os.path.isdir(root):
+        base, pathspec = root, "*.py"
+    else:
+        # git -C needs a directory; diff only the given file from its directory
+        base, pathspec = os.path.dirname(os.path.abspath(root)), f":(literal){os.path.basename(root)}"
+    for module, ranges in sorted(changed_line_ranges(base, revision, pathspec).items()):
+        path = os.path.join(base, module)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                source = file.read()
+            symbols = extract_symbols(source, module, max_tokens)
+        except (OSError, SyntaxError, UnicodeDecodeError, ValueError) as e:
+            yield module, [], f"Could not parse {module}: {e}"
+            continue
+        yield module, select_changed_symbols(module, symbols, ranges, source), None
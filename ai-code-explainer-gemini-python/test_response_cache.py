@@ -0,0 +1,43 @@
+"""Tests for the code explainer's use of the shared response cache.
+
+Run from the repository root with `python -m pytest ai-code-explainer-gemini-python`.
+"""
+
+import importlib.util
+import os
+
+import pytest
+from google import genai
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ai-code-explainer.py")
+spec = importlib.util.spec_from_file_location("ai_code_explainer", SCRIPT)
+explainer = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(explainer)
+
+import genai_common.response_cache as response_cache
+from genai_common.fake_server import FakeGeminiServer, LatencyModel
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    # Only GENAI_CACHE: no temperature override, so the default limit of 0 applies
+    monkeypatch.setenv("GENAI_CACHE", "1")
+    for name in ("GENAI_CACHE_DB", "GENAI_CACHE_MAX_TEMPERATURE"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(response_cache, "_response_cache", None)
+    yield
+
+
+def test_repeated_explain_code_is_a_cache_hit(fresh_cache):
+    with FakeGeminiServer(latency=LatencyModel.parse("constant:0")) as server:
+        client = genai.Client(api_key="fake", http_options=genai.types.HttpOptions(base_url=server.url))
+        prompt = explainer.create_user_prompt("def add(a, b):\n    return a + b\n")
+
+        first = explainer.explain_code(client, prompt)
+        second = explainer.explain_code(client, prompt)
+
+    stats = response_cache.get_response_cache().stats()
+    assert second == first
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["bypassed"] == 0
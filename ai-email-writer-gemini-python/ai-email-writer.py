@@ -21,12 +21,19 @@ Notes:
       the helper functions so the CLI remains interactive-friendly.
 """
 
+import argparse
 import os
+import sys
 from typing import Tuple, Optional
 from dotenv import load_dotenv
 from google import genai
 
 
+# Make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from genai_common import get_genai_client
+from genai_common.streaming import StreamResult, stream_generate
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -92,12 +99,33 @@ def create_genai_client(model: str = TARGET_MODEL, config: Optional[genai.types.
     Initializes and returns a Google GenAI client.
     
     The client automatically uses the GEMINI_API_KEY from the environment
-    to authenticate with Google's API.
+    to authenticate with Google's API. It is the shared client from
+    `genai_common`, created once per process and reused by every call.
     
     Returns:
         genai.Client: An authenticated GenAI client instance.
     """
-    return genai.Client()
+    return get_genai_client()
+
+def describe_api_error(e: Exception) -> str:
+    """
+    Turns an exception raised while calling the Gemini API into the error message returned to the CLI.
+    
+    Args:
+        e (Exception): The exception raised by the request.
+
+    Returns:
+        str: A human-readable error string.
+    """
+    if isinstance(e, AttributeError):
+        return "Error: Invalid response format from the API."
+    if isinstance(e, ValueError):
+        return f"Invalid input value: {e}"
+    if isinstance(e, ConnectionError):
+        return "Error: Failed to connect to the API. Check your internet connection."
+    if isinstance(e, TimeoutError):
+        return "Error: Request timed out. Please try again."
+    return f"An error occurred: {e}"
 
 def generate_email(client: genai.Client, prompt: str) -> str:
     """
@@ -125,16 +153,77 @@ def generate_email(client: genai.Client, prompt: str) -> str:
             contents=prompt
         )
         return response.text
-    except AttributeError:
-        return "Error: Invalid response format from the API."
-    except ValueError as e:
-        return f"Invalid input value: {e}"
-    except ConnectionError:
-        return "Error: Failed to connect to the API. Check your internet connection."
-    except TimeoutError:
-        return "Error: Request timed out. Please try again."
     except Exception as e:
-        return f"An error occurred: {e}"
+        return describe_api_error(e)
+
+async def generate_email_async(client: genai.Client, prompt: str) -> str:
+    """
+    Async version of `generate_email`, using the SDK's async client (`client.aio`).
+    
+    Sends the same request and returns the same error strings as
+    `generate_email`, without blocking the event loop. Use
+    `genai_common.gather_bounded` to generate many emails concurrently.
+    
+    Args:
+        client (genai.Client): An authenticated GenAI client instance.
+        prompt (str): The formatted prompt containing purpose, tone,
+            recipient, and key points.
+
+    Returns:
+        str: The AI-generated email or message content, or a human-readable
+             error string if the API call fails.
+    """
+    system_instructions: str = "You are a helpful assistant that writes emails and messages."
+    try:
+        response = await client.aio.models.generate_content(
+            model=TARGET_MODEL,
+            config=genai.types.GenerateContentConfig(system_instruction=system_instructions),
+            contents=prompt
+        )
+        return response.text
+    except Exception as e:
+        return describe_api_error(e)
+
+def generate_email_stream(client: genai.Client, prompt: str) -> Tuple[str, Optional[StreamResult]]:
+    """
+    Generates an email or message and prints it as the model streams it back.
+    
+    Uses the same system instructions as `generate_email`, but each chunk of
+    text is written to the console as soon as it arrives.
+    
+    Args:
+        client (genai.Client): An authenticated GenAI client instance.
+        prompt (str): The formatted prompt containing purpose, tone,
+            recipient, and key points.
+
+    Returns:
+        tuple: The full email text and its `StreamResult` (time-to-first-token
+             and total latency). On failure the text is the same error string
+             `generate_email` returns and the `StreamResult` is None.
+    """
+    system_instructions: str = "You are a helpful assistant that writes emails and messages."
+    try:
+        result = stream_generate(
+            client,
+            model=TARGET_MODEL,
+            config=genai.types.GenerateContentConfig(system_instruction=system_instructions),
+            contents=prompt
+        )
+        return result.text, result
+    except Exception as e:
+        return describe_api_error(e), None
+
+def parse_args(argv: Optional[list] = None) -> argparse.Namespace:
+    """
+    Parses command-line options.
+    
+    Returns:
+        argparse.Namespace: The parsed options (`stream`).
+    """
+    parser = argparse.ArgumentParser(description="Write emails and messages with Google Gemini.")
+    parser.add_argument("--stream", action="store_true",
+                        help="Print the email as it is generated and report time-to-first-token.")
+    return parser.parse_args(argv)
 
 def main() -> None:
     """
@@ -148,10 +237,11 @@ def main() -> None:
     6. Displaying the generated email/message to the user
     The function guides the user through an interactive process to create
     customized emails or messages with specific tone and purpose.
+    With `--stream` the email is printed while it is being generated.
     Returns:
         None
     """
-    
+    args: argparse.Namespace = parse_args()
     print("--- Welcome to your AI Email & Message Writer! ---")
     print("Please provide details for the email/message you want to create.")
     purpose: str
@@ -163,6 +253,15 @@ def main() -> None:
     user_prompt: str = create_email_prompt(purpose, tone, recipient, key_points)
     client: genai.Client = create_genai_client()
     print("Generating email/message... Please wait.\n")
+    if args.stream:
+        print("--- Generated Email/Message ---")
+        result, stream_result = generate_email_stream(client, user_prompt)
+        if stream_result is None:
+            print(result)
+        else:
+            print(f"\n\n{stream_result.timing_summary()}")
+        print("-" * 30)
+        return
     result: str = generate_email(client, user_prompt)
     print("--- Generated Email/Message ---")
     print(result)
@@ -10,12 +10,29 @@ Requirements:
 
 Example:
     python ai_meeting_notes_generator.py
+    python ai-meeting-notes-generator.py --chunked --chunk-tokens 6000 --overlap-turns 3 --fan-out 4
+    python ai-meeting-notes-generator.py --batch transcripts/ --output meeting_notes.jsonl --workers 8 --rpm 60
 """
 
 from dotenv import load_dotenv
 from google import genai
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+import argparse
+import functools
+import glob
 import json
 import os
+import re
+import sys
+import threading
+import time
+
+# Make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from genai_common import (RateLimiter, generate_content_cached, generate_content_cached_async, get_genai_client,
+                          response_finish_reason)
 
 # Load environment variables from .env file
 load_dotenv()
@@ -32,13 +49,41 @@ Extract key information from the following meeting transcript and provide the ou
 Meeting transcript:
 """
 
+# Fields of the meeting notes, in the order the model should produce them
+NOTES_FIELDS: tuple[str, ...] = ("meeting_title", "date", "participants", "key_points", "action_items", "decisions")
+
+# Prompt for the targeted repair request that asks only for fields missing from a truncated response
+REPAIR_PROMPT: str = """
+Extract only the following fields from the meeting transcript below and provide the output in valid JSON format:
+{fields}
+
+Meeting transcript:
+"""
+
+# Chunked extraction settings for long transcripts
+CHARS_PER_TOKEN: int = 4  # Rough characters-per-token ratio used to size chunks
+DEFAULT_CHUNK_TOKENS: int = 6000  # Estimated transcript tokens per chunk
+DEFAULT_OVERLAP_TURNS: int = 3  # Speaker turns repeated at the start of the next chunk
+DEFAULT_FAN_OUT: int = 4  # Concurrent chunk requests
+LIST_FIELDS: tuple[str, ...] = ("participants", "key_points", "action_items", "decisions")
+NEAR_DUPLICATE_SIMILARITY: float = 0.8  # Word-set overlap above which two items count as the same
+
+# Batch processing settings
+DEFAULT_BATCH_OUTPUT: str = "meeting_notes.jsonl"  # JSONL file for batch results
+DEFAULT_BATCH_WORKERS: int = 4  # Concurrent transcripts in batch mode
+DEFAULT_REQUESTS_PER_MINUTE: float = 60  # Request budget shared by all batch workers
+
+# A speaker turn starts with "Name:" at the beginning of a line
+SPEAKER_TURN_PATTERN = re.compile(r"^[^\S\n]*[A-Z][\w .'()-]{0,40}:[^\S\n]", re.MULTILINE)
+
 # Function to create a GenAI client
 
 def create_genai_client() -> genai.Client:
     """
     Initializes and returns a Google GenAI client.
     
-    This function creates a client instance for interacting with the Google Gemini API.
+    This function returns the shared client instance for interacting with the Google Gemini API
+    (see `genai_common.get_genai_client`), so connections are pooled across requests.
     The API key is automatically read from the GEMINI_API_KEY environment variable.
     
     Returns:
@@ -56,23 +101,31 @@ def create_genai_client() -> genai.Client:
         )
     
     try:
-        return genai.Client(api_key=api_key)
+        return get_genai_client()
     except Exception as e:
         raise Exception(f"Failed to initialize GenAI client: {str(e)}")
 
 # Function to extract information and generate structured JSON
 
-def extract_meeting_notes(client: genai.Client, text: str) -> dict:
+def extract_meeting_notes(client: genai.Client, text: str, limiter: Optional[RateLimiter] = None) -> dict:
     """
     Generates structured meeting notes from the given text using the Gemini API.
     
     This function uses multi-step prompting to extract key information from a meeting
     transcript and returns it in a structured JSON format including meeting title,
-    participants, key points, action items, and decisions.
+    participants, key points, action items, and decisions. The request goes through
+    the shared response cache, which serves repeated transcripts when enabled.
+    
+    The model is asked for JSON matching the notes schema (structured output).
+    If the response is cut off, the complete part is kept (``parse_partial_json``)
+    and only the missing fields are requested again, instead of paying for a
+    full new generation. Outcomes are counted in ``PARSE_STATS``.
     
     Args:
         client (genai.Client): An initialized Google GenAI client instance.
         text (str): The meeting transcript text to analyze.
+        limiter (Optional[RateLimiter]): Rate limiter charged before every request,
+            including a repair request.
     
     Returns:
         dict: A dictionary containing structured meeting notes with the following keys:
@@ -93,36 +146,765 @@ def extract_meeting_notes(client: genai.Client, text: str) -> dict:
     user_prompt: str = create_user_prompt(text, EXTRACT_INFO_PROMPT)
     
     try:
-        response = client.models.generate_content(
+        if limiter is not None:
+            limiter.acquire(estimate_tokens(user_prompt))
+        response = generate_content_cached(
+            client,
             model=TARGET_MODEL, 
-            contents=f"{user_prompt}"
+            contents=f"{user_prompt}",
+            config=create_structured_config(),
+            should_cache=is_complete_notes_response,
+            cacheable=True
         )
         
         if not response.text:
             return {"error": "Empty response received from Gemini API"}
         
-        # Extract JSON from response (may contain markdown formatting)
-        response_text = response.text.strip()
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]  # Remove ```json
-        if response_text.startswith('```'):
-            response_text = response_text[3:]  # Remove ```
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]  # Remove closing ```
+        notes, missing = parse_notes_response(response.text)
+        if missing:
+            notes.update(request_missing_fields(client, text, missing, limiter))
+        return finish_notes(notes, missing, response.text)
         
-        notes = json.loads(response_text.strip())
-        return notes
+    except AttributeError as e:
+        return {"error": f"Invalid API response structure: {str(e)}"}
+    except Exception as e:
+        return {"error": f"API request failed: {str(e)}"}
+
+async def extract_meeting_notes_async(client: genai.Client, text: str, limiter: Optional[RateLimiter] = None) -> dict:
+    """
+    Async version of ``extract_meeting_notes`` using the SDK's async client (``client.aio``).
+    
+    Same structured request, partial-JSON recovery, repair request, response
+    cache and error dictionaries as ``extract_meeting_notes``, without blocking
+    the event loop. Use ``genai_common.gather_bounded`` to process many
+    transcripts concurrently.
+    
+    Args:
+        client (genai.Client): An initialized Google GenAI client instance.
+        text (str): The meeting transcript text to analyze.
+        limiter (Optional[RateLimiter]): Rate limiter charged before every request,
+            including a repair request.
+    
+    Returns:
+        dict: The structured meeting notes, or a dictionary with an ``error`` key.
+    
+    Raises:
+        ValueError: If the transcript text is empty or invalid.
+    """
+    if not text or not text.strip():
+        raise ValueError("Meeting transcript text cannot be empty")
+    
+    user_prompt: str = create_user_prompt(text, EXTRACT_INFO_PROMPT)
+    
+    try:
+        if limiter is not None:
+            await limiter.acquire_async(estimate_tokens(user_prompt))
+        response = await generate_content_cached_async(
+            client,
+            model=TARGET_MODEL,
+            contents=f"{user_prompt}",
+            config=create_structured_config(),
+            should_cache=is_complete_notes_response,
+            cacheable=True
+        )
+        
+        if not response.text:
+            return {"error": "Empty response received from Gemini API"}
+        
+        notes, missing = parse_notes_response(response.text)
+        if missing:
+            notes.update(await request_missing_fields_async(client, text, missing, limiter))
+        return finish_notes(notes, missing, response.text)
         
-    except json.JSONDecodeError as e:
-        return {
-            "error": f"Failed to parse JSON response: {str(e)}",
-            "raw_response": response.text if 'response' in locals() else "No response"
-        }
     except AttributeError as e:
         return {"error": f"Invalid API response structure: {str(e)}"}
     except Exception as e:
         return {"error": f"API request failed: {str(e)}"}
 
+def parse_notes_response(response_text: str) -> tuple[dict, Optional[tuple[str, ...]]]:
+    """
+    Parses the model's notes and records the outcome in ``PARSE_STATS``.
+    
+    Args:
+        response_text (str): The raw response text.
+    
+    Returns:
+        tuple[dict, Optional[tuple[str, ...]]]: The parsed (possibly partial) notes,
+        and None when the response parsed completely, otherwise the fields that
+        still have to be requested again (possibly none).
+    """
+    notes, complete = parse_partial_json(response_text, drop_unfinished=True)
+    if complete:
+        PARSE_STATS.record(responses=1)
+        return notes, None
+    
+    # Truncated or malformed output: keep what parsed and fetch only the missing fields
+    PARSE_STATS.record(responses=1, parse_failures=1)
+    return notes, find_missing_fields(notes)
+
+def finish_notes(notes: dict, missing_before_repair: Optional[tuple[str, ...]], response_text: str) -> dict:
+    """
+    Checks the notes after an optional repair request and records a recovery.
+    
+    Args:
+        notes (dict): The parsed notes, updated with any repaired fields.
+        missing_before_repair (Optional[tuple[str, ...]]): Result of ``parse_notes_response``.
+        response_text (str): The raw response, returned when fields are still missing.
+    
+    Returns:
+        dict: The notes, or an error dictionary naming the fields that are still missing.
+    """
+    if missing_before_repair is None:
+        return notes
+    missing: tuple[str, ...] = find_missing_fields(notes)
+    if missing:
+        return {
+            "error": f"Failed to parse JSON response: missing fields {', '.join(missing)}",
+            "raw_response": response_text
+        }
+    # Without any salvaged field the repair request was a full regeneration
+    PARSE_STATS.record(recovered=1, full_calls_saved=int(len(missing_before_repair) < len(NOTES_FIELDS)))
+    return notes
+
+# Functions for structured JSON output
+
+def create_notes_schema(fields: tuple[str, ...] = NOTES_FIELDS) -> genai.types.Schema:
+    """
+    Builds the response schema for meeting notes, or for a subset of their fields.
+    
+    ``meeting_title`` and ``date`` are strings; every other field is a list of strings.
+    
+    Args:
+        fields (tuple[str, ...]): The fields to include, all of them required.
+    
+    Returns:
+        genai.types.Schema: An object schema with the fields in the given order.
+    """
+    properties: dict[str, genai.types.Schema] = {
+        field: genai.types.Schema(type="STRING") if field in ("meeting_title", "date")
+        else genai.types.Schema(type="ARRAY", items=genai.types.Schema(type="STRING"))
+        for field in fields
+    }
+    return genai.types.Schema(type="OBJECT", properties=properties, required=list(fields),
+                              property_ordering=list(fields))
+
+def create_structured_config(fields: tuple[str, ...] = NOTES_FIELDS) -> genai.types.GenerateContentConfig:
+    """
+    Creates a generation config that makes the model answer with JSON matching the notes schema.
+    
+    Args:
+        fields (tuple[str, ...]): The fields the response must contain.
+    
+    Returns:
+        genai.types.GenerateContentConfig: Config with a JSON MIME type and response schema.
+    """
+    return genai.types.GenerateContentConfig(
+        response_mime_type="application/json",
+        response_schema=create_notes_schema(fields),
+    )
+
+def strip_json_fences(text: str) -> str:
+    """
+    Removes markdown code fences around a JSON response, if present.
+    
+    Structured output does not add fences, but cached responses from older runs may have them.
+    
+    Args:
+        text (str): The response text.
+    
+    Returns:
+        str: The text without leading ```json / ``` and trailing ``` fences.
+    """
+    text = text.strip()
+    if text.startswith('```json'):
+        text = text[7:]  # Remove ```json
+    if text.startswith('```'):
+        text = text[3:]  # Remove ```
+    if text.endswith('```'):
+        text = text[:-3]  # Remove closing ```
+    return text.strip()
+
+def parse_partial_json(text: str, drop_unfinished: bool = False) -> tuple[dict, bool]:
+    """
+    Parses a JSON object, recovering as much as possible from truncated output.
+    
+    The text is scanned once, remembering the last position where every value
+    seen so far was complete, together with the containers still open there.
+    If the whole text is not valid JSON, it is cut at that position and the
+    open containers are closed, so a response cut off by the output limit
+    still yields every field and list item it finished. An unfinished item
+    (for example a half-written string) is dropped. A complete object followed
+    by trailing text is recovered whole.
+    
+    Args:
+        text (str): The model response, optionally wrapped in code fences.
+        drop_unfinished (bool): Also drop the top-level field that was still
+            being written when the output stopped (such as a list that may be
+            missing its last items), so it can be requested again.
+    
+    Returns:
+        tuple[dict, bool]: The recovered object (empty if nothing could be
+        recovered) and whether the text was complete, valid JSON.
+    """
+    text = strip_json_fences(text)
+    try:
+        value = json.loads(text)
+        return (value, True) if isinstance(value, dict) else ({}, False)
+    except json.JSONDecodeError:
+        pass
+    try:
+        # A complete object followed by trailing text keeps all of its fields
+        value, _ = json.JSONDecoder().raw_decode(text.strip())
+        if isinstance(value, dict):
+            return value, False
+    except json.JSONDecodeError:
+        pass
+
+    closers: dict[str, str] = {"{": "}", "[": "]"}
+    stack: list[str] = []
+    expect_key: bool = False  # Inside an object, before the next key
+    in_string: bool = False
+    escaped: bool = False
+    string_is_key: bool = False
+    safe_end: int = -1
+    safe_stack: list[str] = []
+    for index, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+                if not string_is_key:
+                    safe_end, safe_stack = index + 1, list(stack)
+            continue
+        if char == '"':
+            in_string, string_is_key = True, bool(stack) and stack[-1] == "{" and expect_key
+        elif char in closers:
+            stack.append(char)
+            expect_key = char == "{"
+        elif char in "}]":
+            if not stack:
+                break
+            stack.pop()
+            expect_key = False
+            safe_end, safe_stack = index + 1, list(stack)
+        elif char == ":":
+            expect_key = False
+        elif char == ",":
+            # Everything before a separator is complete (this also covers numbers and literals)
+            safe_end, safe_stack = index, list(stack)
+            expect_key = bool(stack) and stack[-1] == "{"
+    if safe_end <= 0 or not safe_stack:
+        return {}, False
+    candidate = text[:safe_end] + "".join(closers[opener] for opener in reversed(safe_stack))
+    try:
+        value = json.loads(candidate)
+    except json.JSONDecodeError:
+        return {}, False
+    if not isinstance(value, dict):
+        return {}, False
+    if drop_unfinished and len(safe_stack) > 1 and value:
+        value.pop(next(reversed(value)))
+    return value, False
+
+def is_complete_notes_response(response: Any, fields: tuple[str, ...] = NOTES_FIELDS) -> bool:
+    """
+    Tells whether a response holds complete, valid notes and may be stored in the response cache.
+    
+    A response cut off by the output limit (finish reason ``MAX_TOKENS``) or
+    whose JSON does not parse or match the schema is not cached; otherwise
+    every later run would be served the broken response and have to repair it.
+    
+    Args:
+        response (Any): The SDK response.
+        fields (tuple[str, ...]): The fields the response was asked for.
+    
+    Returns:
+        bool: True when the response finished with ``STOP`` and its JSON has every field with the right type.
+    """
+    if response_finish_reason(response) != "STOP":
+        return False
+    try:
+        notes = json.loads(strip_json_fences(response.text or ""))
+    except json.JSONDecodeError:
+        return False
+    return isinstance(notes, dict) and all(
+        isinstance(notes.get(field), str if field in ("meeting_title", "date") else list) for field in fields
+    )
+
+def find_missing_fields(notes: dict) -> tuple[str, ...]:
+    """
+    Lists the meeting-notes fields absent from a parsed response.
+    
+    Args:
+        notes (dict): The parsed (possibly partial) notes.
+    
+    Returns:
+        tuple[str, ...]: Missing fields in ``NOTES_FIELDS`` order.
+    """
+    return tuple(field for field in NOTES_FIELDS if field not in notes)
+
+@dataclass
+class ParseStats:
+    """
+    Counters for JSON parsing of model responses, shared by all requests in the process.
+    
+    Attributes:
+        responses (int): Responses parsed.
+        parse_failures (int): Responses that were not complete, valid JSON.
+        recovered (int): Failed responses completed by partial parsing and/or a repair request.
+        repair_calls (int): Targeted repair requests sent for missing fields.
+        full_calls_saved (int): Recovered responses that kept at least one field, each of
+            which would otherwise have cost another full extraction request.
+    """
+    
+    responses: int = 0
+    parse_failures: int = 0
+    recovered: int = 0
+    repair_calls: int = 0
+    full_calls_saved: int = 0
+    
+    def __post_init__(self):
+        self._lock = threading.Lock()
+    
+    def record(self, **increments: int) -> None:
+        """Adds the given amounts to the named counters."""
+        with self._lock:
+            for name, amount in increments.items():
+                setattr(self, name, getattr(self, name) + amount)
+    
+    def summary(self) -> dict:
+        """
+        Returns the counters with the parse failure rate.
+        
+        Returns:
+            dict: The counters and ``parse_failure_rate``.
+        """
+        with self._lock:
+            return {
+                "responses": self.responses,
+                "parse_failures": self.parse_failures,
+                "parse_failure_rate": self.parse_failures / self.responses if self.responses else 0.0,
+                "recovered": self.recovered,
+                "repair_calls": self.repair_calls,
+                "full_calls_saved": self.full_calls_saved,
+            }
+
+# Parse statistics of every extraction in this process
+PARSE_STATS: ParseStats = ParseStats()
+
+def request_missing_fields(client: genai.Client, text: str, fields: tuple[str, ...],
+                           limiter: Optional[RateLimiter] = None) -> dict:
+    """
+    Asks the model for only the given fields of the meeting notes.
+    
+    Used after a truncated response, so only the missing part is generated
+    again instead of the full notes.
+    
+    Args:
+        client (genai.Client): An initialized Google GenAI client instance.
+        text (str): The meeting transcript text.
+        fields (tuple[str, ...]): The fields to extract.
+        limiter (Optional[RateLimiter]): Rate limiter charged before the request.
+    
+    Returns:
+        dict: The requested fields that could be parsed (possibly none).
+    """
+    PARSE_STATS.record(repair_calls=1)
+    user_prompt: str = create_user_prompt(text, create_repair_prompt(fields))
+    if limiter is not None:
+        limiter.acquire(estimate_tokens(user_prompt))
+    response = generate_content_cached(
+        client,
+        model=TARGET_MODEL,
+        contents=user_prompt,
+        config=create_structured_config(fields),
+        should_cache=functools.partial(is_complete_notes_response, fields=fields),
+        cacheable=True
+    )
+    repaired, _ = parse_partial_json(response.text or "")
+    return {field: repaired[field] for field in fields if field in repaired}
+
+async def request_missing_fields_async(client: genai.Client, text: str, fields: tuple[str, ...],
+                                       limiter: Optional[RateLimiter] = None) -> dict:
+    """
+    Async version of ``request_missing_fields``.
+    
+    Args:
+        client (genai.Client): An initialized Google GenAI client instance.
+        text (str): The meeting transcript text.
+        fields (tuple[str, ...]): The fields to extract.
+        limiter (Optional[RateLimiter]): Rate limiter charged before the request.
+    
+    Returns:
+        dict: The requested fields that could be parsed (possibly none).
+    """
+    PARSE_STATS.record(repair_calls=1)
+    user_prompt: str = create_user_prompt(text, create_repair_prompt(fields))
+    if limiter is not None:
+        await limiter.acquire_async(estimate_tokens(user_prompt))
+    response = await generate_content_cached_async(
+        client,
+        model=TARGET_MODEL,
+        contents=user_prompt,
+        config=create_structured_config(fields),
+        should_cache=functools.partial(is_complete_notes_response, fields=fields),
+        cacheable=True
+    )
+    repaired, _ = parse_partial_json(response.text or "")
+    return {field: repaired[field] for field in fields if field in repaired}
+
+def create_repair_prompt(fields: tuple[str, ...]) -> str:
+    """
+    Builds the prompt template of a repair request for the given fields.
+    
+    Args:
+        fields (tuple[str, ...]): The fields to extract.
+    
+    Returns:
+        str: ``REPAIR_PROMPT`` with an empty JSON template of the fields.
+    """
+    return REPAIR_PROMPT.format(fields=json.dumps(
+        {field: "" if field in ("meeting_title", "date") else [] for field in fields}
+    ))
+
+# Functions for chunked extraction of long transcripts
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the number of tokens in a text without calling the API.
+    
+    Args:
+        text (str): The text to measure.
+    
+    Returns:
+        int: The estimated token count, based on ``CHARS_PER_TOKEN``.
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def split_into_turns(text: str) -> list[str]:
+    """
+    Splits a transcript into speaker turns.
+    
+    A turn starts at a line beginning with "Name:" and runs until the next one,
+    so multi-line turns stay together. Any text before the first turn (such as
+    a header) is kept as its own leading piece.
+    
+    Args:
+        text (str): The meeting transcript.
+    
+    Returns:
+        list[str]: The turns in transcript order, without surrounding whitespace.
+    """
+    starts: list[int] = [match.start() for match in SPEAKER_TURN_PATTERN.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    boundaries = starts + [len(text)]
+    turns = (text[start:end].strip() for start, end in zip(boundaries, boundaries[1:]))
+    return [turn for turn in turns if turn]
+
+def split_transcript(text: str, max_tokens: int = DEFAULT_CHUNK_TOKENS,
+                     overlap_turns: int = DEFAULT_OVERLAP_TURNS) -> list[str]:
+    """
+    Splits a transcript into chunks on speaker-turn boundaries, with overlap.
+    
+    Turns are packed greedily into chunks of at most ``max_tokens`` estimated
+    tokens. Every chunk after the first repeats the last ``overlap_turns`` turns
+    of the previous chunk (as far as they fit), so a discussion that crosses a
+    boundary is seen whole by at least one request. A single turn larger than
+    the budget is cut into fixed-size pieces.
+    
+    Args:
+        text (str): The meeting transcript.
+        max_tokens (int): Maximum estimated tokens per chunk.
+        overlap_turns (int): Turns repeated from the end of the previous chunk.
+    
+    Returns:
+        list[str]: The chunks, in transcript order.
+    
+    Raises:
+        ValueError: If ``max_tokens`` is below 1 or ``overlap_turns`` is negative.
+    """
+    if max_tokens < 1:
+        raise ValueError("max_tokens must be at least 1")
+    if overlap_turns < 0:
+        raise ValueError("overlap_turns cannot be negative")
+    max_chars: int = max_tokens * CHARS_PER_TOKEN
+
+    turns: list[str] = []
+    for turn in split_into_turns(text):
+        turns.extend(turn[start:start + max_chars] for start in range(0, len(turn), max_chars))
+
+    chunks: list[str] = []
+    current: list[str] = []
+    current_chars: int = 0
+    new_turns: int = 0  # Turns in the current chunk that are not overlap
+    for turn in turns:
+        if new_turns and current_chars + 1 + len(turn) > max_chars:
+            chunks.append("\n".join(current))
+            overlap = current[-overlap_turns:] if overlap_turns else []
+            # Drop the oldest overlap turns until the next turn fits
+            while overlap and sum(len(item) + 1 for item in overlap) + len(turn) > max_chars:
+                overlap = overlap[1:]
+            current, new_turns = list(overlap), 0
+            current_chars = sum(len(item) + 1 for item in current) - 1 if current else 0
+        current_chars += len(turn) + (1 if current else 0)
+        current.append(turn)
+        new_turns += 1
+    if new_turns:
+        chunks.append("\n".join(current))
+    return chunks
+
+def _normalize_item(item: Any) -> str:
+    """Returns a case- and punctuation-insensitive form of a notes item for comparison."""
+    if isinstance(item, dict):
+        item = " ".join(str(value) for _, value in sorted(item.items()) if value)
+    return " ".join(re.findall(r"\w+", str(item).casefold()))
+
+def _is_near_duplicate(words: set[str], seen: list[set[str]]) -> bool:
+    """Tells whether a word set overlaps one of the seen word sets by ``NEAR_DUPLICATE_SIMILARITY``."""
+    for other in seen:
+        union = len(words | other)
+        if union and len(words & other) / union >= NEAR_DUPLICATE_SIMILARITY:
+            return True
+    return False
+
+def merge_unique(items: list[Any], fuzzy: bool = True) -> list[Any]:
+    """
+    Merges items extracted from several chunks, dropping duplicates.
+    
+    Items are compared case- and punctuation-insensitively; with ``fuzzy``,
+    items whose words mostly overlap (such as the same action item extracted
+    from two overlapping chunks) are also treated as duplicates. The first
+    occurrence is kept, so the order follows the transcript.
+    
+    Args:
+        items (list[Any]): Strings or dicts from the per-chunk notes.
+        fuzzy (bool): Also drop near duplicates.
+    
+    Returns:
+        list[Any]: The unique items in first-seen order.
+    """
+    merged: list[Any] = []
+    seen_keys: set[str] = set()
+    seen_words: list[set[str]] = []
+    for item in items:
+        key = _normalize_item(item)
+        if not key or key in seen_keys:
+            continue
+        words = set(key.split())
+        if fuzzy and _is_near_duplicate(words, seen_words):
+            continue
+        seen_keys.add(key)
+        seen_words.append(words)
+        merged.append(item)
+    return merged
+
+def merge_meeting_notes(chunk_notes: list[dict]) -> dict:
+    """
+    Combines the notes extracted from each chunk into one set of meeting notes.
+    
+    The merge is done locally, without another model call: the title and date
+    come from the first chunk that has them, and the list fields are
+    concatenated in chunk order and deduplicated with ``merge_unique``
+    (participants by exact name only). Chunks that failed are skipped and their
+    errors are listed under ``chunk_errors``.
+    
+    Args:
+        chunk_notes (list[dict]): Notes returned by ``extract_meeting_notes`` for each chunk.
+    
+    Returns:
+        dict: Meeting notes with the same keys as a single extraction.
+    """
+    merged: dict = {"meeting_title": "", "date": "", **{field: [] for field in LIST_FIELDS}}
+    errors: list[dict] = []
+    collected: dict[str, list[Any]] = {field: [] for field in LIST_FIELDS}
+    for index, notes in enumerate(chunk_notes):
+        if "error" in notes:
+            errors.append({"chunk": index, "error": notes["error"]})
+            continue
+        for field in ("meeting_title", "date"):
+            if not merged[field] and notes.get(field):
+                merged[field] = notes[field]
+        for field in LIST_FIELDS:
+            values = notes.get(field) or []
+            collected[field].extend(values if isinstance(values, list) else [values])
+    for field in LIST_FIELDS:
+        merged[field] = merge_unique(collected[field], fuzzy=field != "participants")
+    if errors:
+        merged["chunk_errors"] = errors
+        if len(errors) == len(chunk_notes):
+            merged["error"] = "Extraction failed for every chunk"
+    return merged
+
+def extract_meeting_notes_chunked(client: genai.Client, text: str, chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+                                  overlap_turns: int = DEFAULT_OVERLAP_TURNS,
+                                  fan_out: int = DEFAULT_FAN_OUT,
+                                  limiter: Optional[RateLimiter] = None) -> tuple[dict, list[dict]]:
+    """
+    Extracts meeting notes from a long transcript chunk by chunk.
+    
+    The workflow is:
+    1. Split the transcript on speaker turns into overlapping chunks
+    2. Run ``extract_meeting_notes`` on every chunk in parallel
+    3. Merge and deduplicate the per-chunk notes locally (``merge_meeting_notes``)
+    
+    Args:
+        client (genai.Client): An initialized Google GenAI client instance.
+        text (str): The meeting transcript text to analyze.
+        chunk_tokens (int): Estimated transcript tokens per chunk.
+        overlap_turns (int): Speaker turns repeated between consecutive chunks.
+        fan_out (int): Maximum number of concurrent chunk requests.
+        limiter (Optional[RateLimiter]): Rate limiter charged before every chunk and repair request.
+    
+    Returns:
+        tuple[dict, list[dict]]: The merged meeting notes, and one timing record
+        per chunk with its turn count, estimated tokens, seconds and error (if any).
+    
+    Raises:
+        ValueError: If the transcript text is empty or invalid.
+    """
+    if not text or not text.strip():
+        raise ValueError("Meeting transcript text cannot be empty")
+    chunks: list[str] = split_transcript(text, chunk_tokens, overlap_turns)
+
+    def extract_chunk(chunk: str) -> tuple[dict, float]:
+        started = time.perf_counter()
+        notes = extract_meeting_notes(client, chunk, limiter)
+        return notes, time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=max(1, min(fan_out, len(chunks)))) as executor:
+        results: list[tuple[dict, float]] = list(executor.map(extract_chunk, chunks))
+
+    timings: list[dict] = [
+        {"chunk": index, "turns": len(split_into_turns(chunk)), "tokens": estimate_tokens(chunk),
+         "seconds": round(seconds, 3), "error": notes.get("error")}
+        for index, (chunk, (notes, seconds)) in enumerate(zip(chunks, results))
+    ]
+    return merge_meeting_notes([notes for notes, _ in results]), timings
+
+# Functions for batch processing of many transcripts
+
+def collect_transcript_paths(source: str) -> list[str]:
+    """
+    Resolves a directory or glob pattern into a sorted list of transcript files.
+    
+    A directory selects every ``.txt`` file directly inside it; anything else is
+    treated as a glob pattern (``**`` is supported for recursive matches).
+    
+    Args:
+        source (str): A directory path or a glob pattern such as ``transcripts/*.txt``.
+    
+    Returns:
+        list[str]: Sorted absolute paths of the matching files, so that
+                   ``read_text_from_file`` does not resolve them against the script directory.
+    """
+    if os.path.isdir(source):
+        source = os.path.join(source, "*.txt")
+    return sorted(os.path.abspath(path) for path in glob.glob(source, recursive=True) if os.path.isfile(path))
+
+def process_transcript(client: genai.Client, file_path: str, limiter: Optional[RateLimiter] = None) -> dict:
+    """
+    Reads one transcript and extracts its meeting notes (batch worker).
+    
+    The file is only read when its turn comes, so a batch holds at most one
+    transcript per worker in memory. A file that cannot be read or a request
+    that fails gives an error record, so the rest of the batch still runs.
+    
+    Args:
+        client (genai.Client): An initialized Google GenAI client instance.
+        file_path (str): Path of the transcript file.
+        limiter (Optional[RateLimiter]): Rate limiter shared by all workers, charged
+            before every request (including repair requests).
+    
+    Returns:
+        dict: The file, its notes (or None), an error message (or None) and the seconds taken.
+    """
+    started = time.perf_counter()
+    try:
+        transcript = read_text_from_file(file_path)
+        notes = extract_meeting_notes(client, transcript, limiter)
+        error = notes.get("error")
+    except (OSError, UnicodeDecodeError, ValueError, genai.errors.APIError) as e:
+        notes, error = None, str(e)
+    return {"file": file_path, "notes": None if error else notes, "error": error,
+            "seconds": round(time.perf_counter() - started, 3)}
+
+def iter_batch_notes(client: genai.Client, file_paths: list[str], max_workers: int = DEFAULT_BATCH_WORKERS,
+                     limiter: Optional[RateLimiter] = None) -> Iterator[dict]:
+    """
+    Processes transcripts concurrently and yields each result as soon as it finishes.
+    
+    At most ``max_workers`` transcripts are in flight; a new one is only
+    submitted when a running one completes, so memory stays bounded for any
+    number of files.
+    
+    Args:
+        client (genai.Client): An initialized Google GenAI client instance.
+        file_paths (list[str]): Transcript files to process.
+        max_workers (int): Maximum number of concurrent transcripts.
+        limiter (Optional[RateLimiter]): Rate limiter shared by all workers.
+    
+    Yields:
+        dict: One record per transcript (see ``process_transcript``), in completion order.
+    
+    Raises:
+        ValueError: If ``max_workers`` is below 1.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: set[Future] = set()
+        for path in file_paths:
+            if len(pending) >= max_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(executor.submit(process_transcript, client, path, limiter))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+def run_batch(client: genai.Client, source: str, output_path: str, max_workers: int = DEFAULT_BATCH_WORKERS,
+              limiter: Optional[RateLimiter] = None) -> dict:
+    """
+    Extracts meeting notes from every matching transcript and streams them to a JSONL file.
+    
+    Each line is written and flushed as soon as its transcript completes, so
+    results are never accumulated in memory and survive an interrupted run.
+    
+    Args:
+        client (genai.Client): An initialized Google GenAI client instance.
+        source (str): Directory or glob pattern selecting the transcripts.
+        output_path (str): Destination JSONL file.
+        max_workers (int): Maximum number of concurrent transcripts.
+        limiter (Optional[RateLimiter]): Rate limiter shared by all workers.
+    
+    Returns:
+        dict: Counts of processed and failed transcripts and the elapsed seconds.
+    """
+    file_paths: list[str] = collect_transcript_paths(source)
+    print(f"Found {len(file_paths)} transcript(s); processing with {max_workers} worker(s)...")
+    started: float = time.perf_counter()
+    processed, failed = 0, 0
+    with open(output_path, "w", encoding="utf-8") as output:
+        for record in iter_batch_notes(client, file_paths, max_workers, limiter):
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+            processed += 1
+            if record["error"]:
+                failed += 1
+                print(f"Failed: {record['file']}: {record['error']}")
+    elapsed: float = time.perf_counter() - started
+    print(f"Wrote {processed} result(s) ({failed} failed) to {output_path} in {elapsed:.1f}s.")
+    stats: dict = PARSE_STATS.summary()
+    print(f"Parse failures: {stats['parse_failures']}/{stats['responses']} ({stats['parse_failure_rate']:.0%}) | "
+          f"repair calls: {stats['repair_calls']} | full calls saved: {stats['full_calls_saved']}")
+    return {"processed": processed, "failed": failed, "elapsed_seconds": elapsed}
+
 # Function to read text from a file
 
 def read_text_from_file(file_path: str) -> str:
@@ -179,6 +961,41 @@ def create_user_prompt(text: str, prompt_template: str) -> str:
     
     return f"{prompt_template}\n{text}"
 
+# Function to parse command-line options
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """
+    Parses command-line options.
+    
+    Without options the tool processes ``TARGET_FILE`` in a single request, as before.
+    
+    Args:
+        argv (Optional[list[str]]): Arguments to parse; defaults to ``sys.argv``.
+    
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Generate structured meeting notes with Google Gemini.")
+    parser.add_argument("--batch", metavar="SOURCE",
+                        help="Directory or glob of transcripts to process concurrently.")
+    parser.add_argument("--output", default=DEFAULT_BATCH_OUTPUT,
+                        help=f"JSONL file for batch results (default: {DEFAULT_BATCH_OUTPUT}).")
+    parser.add_argument("--workers", type=int, default=DEFAULT_BATCH_WORKERS,
+                        help=f"Concurrent transcripts in batch mode (default: {DEFAULT_BATCH_WORKERS}).")
+    parser.add_argument("--rpm", type=float, default=DEFAULT_REQUESTS_PER_MINUTE,
+                        help=f"Requests per minute in batch mode (default: {DEFAULT_REQUESTS_PER_MINUTE:g}).")
+    parser.add_argument("--tpm", type=float,
+                        help="Estimated tokens per minute in batch mode (default: unlimited).")
+    parser.add_argument("--chunked", action="store_true",
+                        help="Extract notes from TARGET_FILE in parallel chunks (for long transcripts).")
+    parser.add_argument("--chunk-tokens", type=int, default=DEFAULT_CHUNK_TOKENS,
+                        help=f"Estimated transcript tokens per chunk (default: {DEFAULT_CHUNK_TOKENS}).")
+    parser.add_argument("--overlap-turns", type=int, default=DEFAULT_OVERLAP_TURNS,
+                        help=f"Speaker turns repeated between chunks (default: {DEFAULT_OVERLAP_TURNS}).")
+    parser.add_argument("--fan-out", type=int, default=DEFAULT_FAN_OUT,
+                        help=f"Concurrent chunk requests (default: {DEFAULT_FAN_OUT}).")
+    return parser.parse_args(argv)
+
 # Main function
 
 def main() -> None:
@@ -191,25 +1008,44 @@ def main() -> None:
     3. Extracts and structures meeting notes using Gemini API
     4. Outputs the results in formatted JSON
     
+    With ``--chunked`` the transcript is split on speaker turns and extracted in
+    parallel chunks, and the time taken by each chunk is printed. With
+    ``--batch`` every matching transcript is processed concurrently under a
+    rate limit and the results are streamed to a JSONL file.
+    
     The function handles all errors gracefully and provides informative error messages
     to help diagnose issues.
     
     Raises:
         SystemExit: If a critical error occurs that prevents execution.
     """
+    args: argparse.Namespace = parse_args()
     try:
         # Initialize the GenAI client
         print("--- Welcome to your AI Meeting Notes Generator! ---")
         print("Initializing Google Gemini API client...")
         client = create_genai_client()
         
+        if args.batch:
+            run_batch(client, args.batch, os.path.abspath(args.output), args.workers,
+                      RateLimiter(args.rpm, args.tpm))
+            return
+        
         # Read the meeting transcript
         print(f"Reading meeting transcript from {TARGET_FILE}...")
         transcript = read_text_from_file(TARGET_FILE)
         
         # Extract meeting notes
-        print("Generating structured meeting notes...")
-        meeting_notes = extract_meeting_notes(client, transcript)
+        timings: list[dict] = []
+        if args.chunked:
+            print(f"Generating structured meeting notes from ~{estimate_tokens(transcript)} tokens "
+                  f"in chunks of {args.chunk_tokens}...")
+            meeting_notes, timings = extract_meeting_notes_chunked(
+                client, transcript, args.chunk_tokens, args.overlap_turns, args.fan_out
+            )
+        else:
+            print("Generating structured meeting notes...")
+            meeting_notes = extract_meeting_notes(client, transcript)
         
         # Output results
         print("\n" + "="*50)
@@ -217,6 +1053,19 @@ def main() -> None:
         print("="*50 + "\n")
         print(json.dumps(meeting_notes, indent=4, ensure_ascii=False))
         
+        stats: dict = PARSE_STATS.summary()
+        if stats["parse_failures"]:
+            print(f"\nParse failures: {stats['parse_failures']}/{stats['responses']} "
+                  f"({stats['parse_failure_rate']:.0%}) | recovered: {stats['recovered']} | "
+                  f"repair calls: {stats['repair_calls']} | full calls saved: {stats['full_calls_saved']}")
+        
+        if timings:
+            print("\n--- Time Per Chunk ---")
+            for timing in timings:
+                status = "failed" if timing["error"] else "ok"
+                print(f"chunk {timing['chunk']:>3} {timing['turns']:>5} turn(s) "
+                      f"{timing['tokens']:>8} tokens {timing['seconds']:>8.2f}s  {status}")
+        
         # Check if there was an error in processing
         if "error" in meeting_notes:
             print("\n⚠️  Warning: An error occurred during processing.")
@@ -7,13 +7,19 @@ Features:
     - Compare multiple prompts with different configurations side-by-side
     - A/B test various temperature and top_p values to understand their impact
     - Chain prompts for multi-step workflows and iterative refinement
-    - Evaluate outputs with basic metrics (word count, unique words)
+    - Evaluate outputs with batch metrics (word counts, distinct-n, overlap, similarity)
 
 Usage:
     Run the script and choose between two modes:
     1. Test and Compare Prompts: Compare two outputs with different configurations
     2. Prompt Chaining Demo: Generate output and iteratively refine it
 
+    Or sweep a grid of configurations from a YAML/JSON spec without prompts:
+    python ai-prompt-playground.py --grid sweep.yaml --output results.csv --workers 8 --rpm 120
+
+    Or run a multi-step prompt chain (a DAG of steps) from a spec:
+    python ai-prompt-playground.py --chain chain.json
+
 Requirements:
     - GEMINI_API_KEY environment variable set in .env file
     - google-genai package installed
@@ -23,19 +29,59 @@ Author: AI Code Examples
 Date: 2026
 """
 
+import argparse
+import csv
+import itertools
+import json
 import os
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dotenv import load_dotenv
 from google import genai
 
+try:
+    import yaml
+except ImportError:  # PyYAML is optional; JSON grid specs work without it
+    yaml = None
+
+# Make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from genai_common import RateLimiter, ResponseCache, get_genai_client, latency_summary, usage_from_response
+from evaluation import evaluate_batch
+from prompt_chain import load_chain_spec, print_step_timings, run_chain
+
 # Load environment variables from .env file
 # This file should contain GEMINI_API_KEY=your_api_key_here
 load_dotenv()
 
+# Model used for every generation
+TARGET_MODEL = "gemini-3-flash-preview"
+
+# Grid sweep defaults
+DEFAULT_SYSTEM_PROMPT = "You are a helpful assistant."
+DEFAULT_GRID_OUTPUT = "grid_results.csv"
+DEFAULT_GRID_WORKERS = 8
+DEFAULT_REQUESTS_PER_MINUTE = 120
+
+# Memo file for prompt chain step outputs, relative to the working directory
+DEFAULT_CHAIN_MEMO = ".chain_memo.sqlite"
+
+# Columns of the grid results file, in order
+GRID_COLUMNS = [
+    "cell", "prompt_index", "system_prompt_index", "temperature", "top_p", "repeat",
+    "latency_seconds", "input_tokens", "output_tokens", "words", "unique_words",
+    "distinct_1", "distinct_2", "self_overlap_1", "self_overlap_2", "mean_similarity", "max_similarity",
+    "error", "prompt", "system_prompt", "output",
+]
+
 def create_genai_client():
     """Create and return an authenticated Gemini AI client instance.
     
     Retrieves the API key from environment variables and initializes
-    the Gemini client for making API calls.
+    the Gemini client for making API calls. The client is shared across the
+    process (see `genai_common`), so repeated generations reuse connections.
     
     Returns:
         genai.Client: An authenticated client instance for interacting with Gemini API.
@@ -43,7 +89,7 @@ def create_genai_client():
     Raises:
         ValueError: If GEMINI_API_KEY is not found in environment variables.
     """
-    return genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+    return get_genai_client()
 
 def generate_output(client, user_prompt, system_prompt, temperature, top_p):
     """Generate AI content using Gemini API with specified configuration.
@@ -67,7 +113,38 @@ def generate_output(client, user_prompt, system_prompt, temperature, top_p):
     try:
         # Generate content using Gemini Flash model
         response = client.models.generate_content(
-            model="gemini-3-flash-preview",
+            model=TARGET_MODEL,
+            config=config,
+            contents=user_prompt
+        )
+        return response.text
+    except Exception as e:
+        return f"Error: {e}"
+
+async def generate_output_async(client, user_prompt, system_prompt, temperature, top_p):
+    """Async version of `generate_output`, using the SDK's async client (`client.aio`).
+
+    Same request and error message as `generate_output`, without blocking the
+    event loop; fan out many calls with `genai_common.gather_bounded`.
+
+    Args:
+        client (genai.Client): The Gemini API client instance.
+        user_prompt (str): The user's input prompt for content generation.
+        system_prompt (str): System instruction to guide the model's behavior.
+        temperature (float): Controls randomness (0.0-1.0).
+        top_p (float): Nucleus sampling parameter (0.0-1.0).
+
+    Returns:
+        str: The generated text from the model, or an error message if generation fails.
+    """
+    config = genai.types.GenerateContentConfig(
+        system_instruction=system_prompt,
+        temperature=temperature,
+        top_p=top_p
+    )
+    try:
+        response = await client.aio.models.generate_content(
+            model=TARGET_MODEL,
             config=config,
             contents=user_prompt
         )
@@ -75,19 +152,38 @@ def generate_output(client, user_prompt, system_prompt, temperature, top_p):
     except Exception as e:
         return f"Error: {e}"
 
+def compute_output_metrics(outputs):
+    """Compute evaluation metrics for each AI-generated output.
+    
+    Every output is tokenized once and all metrics are computed over the whole
+    batch with NumPy (see `evaluation.evaluate_batch`), so large sweeps stay fast.
+    
+    Args:
+        outputs (list[str]): List of AI-generated text outputs to evaluate.
+    
+    Returns:
+        tuple[list[dict], dict]: One dict per output with its `words`,
+        `unique_words`, `distinct_<n>`, `self_overlap_<n>`, `mean_similarity`
+        and `max_similarity`, and a summary of the whole batch.
+    """
+    return evaluate_batch(outputs)
+
 def evaluate_outputs(outputs):
-    """Display basic metrics for comparing multiple AI-generated outputs.
+    """Display metrics for comparing multiple AI-generated outputs.
     
     Provides word count and unique word count for each output to help
-    assess verbosity and vocabulary diversity.
+    assess verbosity and vocabulary diversity, plus distinct-2 (repetition
+    within an output) and similarity to the other outputs.
     
     Args:
         outputs (list[str]): List of AI-generated text outputs to evaluate.
     """
     print("\n--- Evaluation Metrics ---")
-    # Calculate and display basic metrics for each output
-    for i, out in enumerate(outputs):
-        print(f"Output {i+1}: {len(out.split())} words, {len(set(out.split()))} unique words")
+    # Calculate and display metrics for each output
+    per_output, _ = compute_output_metrics(outputs)
+    for i, metrics in enumerate(per_output):
+        print(f"Output {i+1}: {metrics['words']} words, {metrics['unique_words']} unique words, "
+              f"distinct-2 {metrics['distinct_2']:.2f}, similarity to others {metrics['mean_similarity']:.2f}")
     print("You can also manually compare the outputs above for relevance, tone, and creativity.")
 
 def prompt_chaining(client, initial_prompt, system_prompt, temperature, top_p):
@@ -114,13 +210,275 @@ def prompt_chaining(client, initial_prompt, system_prompt, temperature, top_p):
     print("\n--- Chained Output (Step 2) ---")
     print(chained_output)
 
+def load_grid_spec(path):
+    """Load a grid sweep specification from a YAML or JSON file.
+    
+    The spec lists the values to sweep; every key except `prompts` is optional:
+    
+        prompts: ["Write a haiku about rain", "Explain recursion"]
+        system_prompts: ["You are a helpful assistant.", "You are a poet."]
+        temperatures: [0.2, 0.7, 1.0]
+        top_ps: [0.7, 0.9]
+        repeats: 3
+    
+    A single value may be given instead of a list. YAML files need PyYAML.
+    
+    Args:
+        path (str): Path to a `.yaml`/`.yml` or `.json` spec file.
+    
+    Returns:
+        dict: The spec with list values and defaults filled in.
+        
+    Raises:
+        ValueError: If the spec is invalid, or it is YAML and PyYAML is not installed.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        if path.lower().endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise ValueError("PyYAML is required for YAML grid specs (pip install pyyaml), or use JSON.")
+            spec = yaml.safe_load(file)
+        else:
+            spec = json.load(file)
+    if not isinstance(spec, dict) or not spec.get("prompts"):
+        raise ValueError(f"Grid spec {path} must be a mapping with at least one entry under 'prompts'.")
+
+    def as_list(value):
+        return value if isinstance(value, list) else [value]
+
+    repeats = int(spec.get("repeats", 1))
+    if repeats < 1:
+        raise ValueError("repeats must be at least 1")
+    return {
+        "prompts": as_list(spec["prompts"]),
+        "system_prompts": as_list(spec.get("system_prompts", DEFAULT_SYSTEM_PROMPT)),
+        "temperatures": [float(value) for value in as_list(spec.get("temperatures", 0.7))],
+        "top_ps": [float(value) for value in as_list(spec.get("top_ps", 0.9))],
+        "repeats": repeats,
+    }
+
+def expand_grid(spec):
+    """Expand a grid spec into the cartesian product of its configurations.
+    
+    Args:
+        spec (dict): A spec returned by `load_grid_spec`.
+    
+    Returns:
+        list[dict]: One cell per prompt x system prompt x temperature x top_p x repeat.
+    """
+    combinations = itertools.product(
+        enumerate(spec["prompts"]), enumerate(spec["system_prompts"]),
+        spec["temperatures"], spec["top_ps"], range(spec["repeats"]),
+    )
+    return [
+        {
+            "cell": cell, "prompt_index": prompt_index, "system_prompt_index": system_index,
+            "temperature": temperature, "top_p": top_p, "repeat": repeat,
+            "prompt": prompt, "system_prompt": system_prompt,
+        }
+        for cell, ((prompt_index, prompt), (system_index, system_prompt), temperature, top_p, repeat)
+        in enumerate(combinations)
+    ]
+
+def run_grid_cell(client, cell, limiter=None):
+    """Generate the output of one grid cell and measure it.
+    
+    Args:
+        client (genai.Client): The Gemini API client instance.
+        cell (dict): A cell from `expand_grid`.
+        limiter (RateLimiter): Optional rate limiter shared by all cells.
+    
+    Returns:
+        dict: The cell with its `output`, `error`, `latency_seconds`,
+        `input_tokens` and `output_tokens` added.
+    """
+    if limiter is not None:
+        limiter.acquire()
+    config = genai.types.GenerateContentConfig(
+        system_instruction=cell["system_prompt"],
+        temperature=cell["temperature"],
+        top_p=cell["top_p"]
+    )
+    started = time.perf_counter()
+    try:
+        response = client.models.generate_content(model=TARGET_MODEL, config=config, contents=cell["prompt"])
+        usage = usage_from_response(response)
+        output, error = response.text or "", ""
+    except Exception as e:
+        usage, output, error = None, "", f"Error: {e}"
+    return {
+        **cell,
+        "output": output,
+        "error": error,
+        "latency_seconds": round(time.perf_counter() - started, 3),
+        "input_tokens": usage.input_tokens if usage else None,
+        "output_tokens": usage.output_tokens if usage else None,
+    }
+
+def grid_group_key(cell):
+    """Return the evaluation group of a cell: its prompt and system prompt.
+    
+    Outputs are only compared with outputs written for the same prompt and
+    system prompt (across temperatures, top_p values and repeats); comparing
+    them with answers to unrelated prompts would make the overlap and
+    similarity metrics meaningless.
+    
+    Args:
+        cell (dict): A cell from `expand_grid`.
+    
+    Returns:
+        tuple[int, int]: The prompt index and system prompt index.
+    """
+    return cell["prompt_index"], cell["system_prompt_index"]
+
+def iter_grid_groups(client, cells, workers=DEFAULT_GRID_WORKERS, limiter=None):
+    """Run grid cells concurrently and yield each evaluation group as soon as all of its cells finish.
+    
+    At most `workers` cells are in flight, and only the groups still running
+    are held in memory, so large sweeps stay bounded.
+    
+    Args:
+        client (genai.Client): The Gemini API client instance.
+        cells (list[dict]): Cells from `expand_grid`.
+        workers (int): Maximum concurrent requests.
+        limiter (RateLimiter): Optional rate limiter shared by all cells.
+    
+    Yields:
+        list[dict]: The result rows of one group, in cell order, with the
+        `evaluate_outputs` metrics of the group's successful cells added.
+    """
+    remaining = Counter(grid_group_key(cell) for cell in cells)
+    finished = defaultdict(list)
+
+    def complete(done):
+        for future in done:
+            row = future.result()
+            key = grid_group_key(row)
+            finished[key].append(row)
+            remaining[key] -= 1
+            if remaining[key] == 0:
+                rows = sorted(finished.pop(key), key=lambda item: item["cell"])
+                # Failed cells have no output, so they are left out of the group metrics
+                succeeded = [item for item in rows if not item["error"]]
+                per_output, _ = compute_output_metrics([item["output"] for item in succeeded])
+                for item, metrics in zip(succeeded, per_output):
+                    item.update(metrics)
+                yield rows
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        pending = set()
+        for cell in cells:
+            if len(pending) >= max(1, workers):
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from complete(done)
+            pending.add(executor.submit(run_grid_cell, client, cell, limiter))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from complete(done)
+
+def run_grid(client, spec, output_path, workers=DEFAULT_GRID_WORKERS, limiter=None):
+    """Run every cell of a grid sweep concurrently and stream the results to CSV.
+    
+    Cells are fanned out over a thread pool under the shared rate limit.
+    Each row of the CSV holds one cell: its configuration, latency, token
+    usage, the `evaluate_outputs` metrics and the generated text. The metrics
+    compare each output with the other outputs for the same prompt and system
+    prompt (see `grid_group_key`). A group's rows are written and flushed as
+    soon as its last cell finishes, so an interrupted sweep keeps every
+    completed group.
+    
+    Args:
+        client (genai.Client): The Gemini API client instance.
+        spec (dict): A spec returned by `load_grid_spec`.
+        output_path (str): Destination CSV file.
+        workers (int): Maximum concurrent requests.
+        limiter (RateLimiter): Optional rate limiter shared by all cells.
+    
+    Returns:
+        int: The number of rows written.
+    """
+    cells = expand_grid(spec)
+    print(f"Running {len(cells)} cell(s) with {workers} worker(s)...")
+    started = time.perf_counter()
+    written, errors, latencies = 0, 0, []
+    totals = defaultdict(float)
+    with open(output_path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=GRID_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        for rows in iter_grid_groups(client, cells, workers, limiter):
+            writer.writerows(rows)
+            file.flush()
+            written += len(rows)
+            for row in rows:
+                if row["error"]:
+                    errors += 1
+                    continue
+                latencies.append(row["latency_seconds"])
+                for metric in ("distinct_2", "self_overlap_2", "mean_similarity"):
+                    totals[metric] += row[metric]
+    elapsed = time.perf_counter() - started
+
+    latency = latency_summary(latencies)
+    print(f"Wrote {written} row(s) ({errors} failed) to {output_path} in {elapsed:.1f}s "
+          f"({written * 60 / elapsed if elapsed > 0 else 0:.0f} cells/min).")
+    print(f"Latency p50: {latency['p50']:.2f}s | p95: {latency['p95']:.2f}s")
+    if latencies:
+        print(f"Avg distinct-2: {totals['distinct_2'] / len(latencies):.2f} | "
+              f"avg self-overlap-2: {totals['self_overlap_2'] / len(latencies):.2f} | "
+              f"avg similarity: {totals['mean_similarity'] / len(latencies):.2f}")
+    return written
+
+def parse_args(argv=None):
+    """Parse command-line options.
+    
+    Without options the interactive menu is shown, as before.
+    
+    Args:
+        argv (list[str]): Arguments to parse; defaults to `sys.argv`.
+    
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Experiment with Gemini prompt configurations.")
+    parser.add_argument("--grid", metavar="SPEC",
+                        help="YAML or JSON spec of prompts, system prompts, temperatures, top_p values and repeats to sweep.")
+    parser.add_argument("--output", default=DEFAULT_GRID_OUTPUT,
+                        help=f"CSV file for grid results (default: {DEFAULT_GRID_OUTPUT}).")
+    parser.add_argument("--workers", type=int, default=DEFAULT_GRID_WORKERS,
+                        help=f"Concurrent requests in grid mode (default: {DEFAULT_GRID_WORKERS}).")
+    parser.add_argument("--rpm", type=float, default=DEFAULT_REQUESTS_PER_MINUTE,
+                        help=f"Requests per minute in grid mode (default: {DEFAULT_REQUESTS_PER_MINUTE}).")
+    parser.add_argument("--chain", metavar="SPEC",
+                        help="YAML or JSON spec of a multi-step prompt chain to run.")
+    parser.add_argument("--memo", default=DEFAULT_CHAIN_MEMO,
+                        help=f"SQLite file memoizing chain step outputs across runs (default: {DEFAULT_CHAIN_MEMO}).")
+    return parser.parse_args(argv)
+
 def main():
     """Main entry point for the Gemini Prompt Playground application.
     
     Provides an interactive menu for users to choose between:
     1. Comparing prompts with different configurations
     2. Testing prompt chaining workflows
+    
+    With `--grid` it instead sweeps every configuration in a spec file, and
+    with `--chain` it runs a multi-step prompt chain.
     """
+    args = parse_args()
+    if args.grid:
+        print("=== Gemini Prompt Playground: grid sweep ===")
+        spec = load_grid_spec(args.grid)
+        run_grid(create_genai_client(), spec, os.path.abspath(args.output), args.workers, RateLimiter(args.rpm))
+        return
+    if args.chain:
+        print("=== Gemini Prompt Playground: prompt chain ===")
+        steps, inputs = load_chain_spec(args.chain)
+        results = run_chain(create_genai_client(), steps, inputs, ResponseCache(sqlite_path=args.memo, max_temperature=None), args.workers)
+        for result in results.values():
+            print(f"\n--- {result.name} ({result.status}) ---")
+            print(result.output)
+        print_step_timings(results)
+        return
+
     print("=== Gemini Prompt Playground ===")
     print("1. Test and Compare Prompts")
     print("2. Prompt Chaining Demo")
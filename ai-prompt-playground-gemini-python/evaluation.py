@@ -0,0 +1,233 @@
+"""Batch evaluation metrics for prompt playground outputs.
+
+Computes, for every output of a batch and for the batch as a whole:
+    - Length: words and unique words (whitespace tokens, as before)
+    - Distinct-n: distinct n-grams / total n-grams, a measure of repetition
+    - Self-overlap-n: share of an output's distinct n-grams that also appear in
+      another output of the batch (a self-BLEU/ROUGE-style overlap; higher
+      means less diverse outputs)
+    - Embedding similarity: mean and max cosine similarity to the other
+      outputs, from hashed bag-of-words vectors or caller-supplied embeddings
+
+Each output is tokenized exactly once. Tokens are mapped to integer ids and
+every metric is computed with NumPy over the whole batch, so thousands of
+outputs are evaluated in seconds.
+"""
+
+import string
+
+import numpy as np
+
+# N-gram orders reported by default
+DEFAULT_NGRAM_ORDERS = (1, 2)
+# Dimension of the hashed bag-of-words vectors used for similarity
+DEFAULT_HASH_DIM = 1024
+# Rows of the similarity matrix computed at a time (bounds memory use)
+SIMILARITY_BLOCK_SIZE = 2048
+# Multiplier for combining token ids into n-gram keys (wraps around in uint64)
+_NGRAM_KEY_PRIME = np.uint64(1_000_003)
+
+_PUNCTUATION = string.punctuation + "“”‘’…"
+
+
+def encode_batch(outputs):
+    """Tokenize every output once and map the tokens to integer ids.
+
+    Tokens are whitespace-separated words. Besides the raw ids (used for
+    word counts), each token also gets a normalized id (lowercased, with
+    surrounding punctuation removed) used for the n-gram and similarity metrics.
+
+    Args:
+        outputs (list[str]): The outputs to encode.
+
+    Returns:
+        tuple: (raw_ids, normalized_ids, lengths, vocabulary_size) where the id
+        arrays hold the tokens of all outputs back to back, `lengths` holds the
+        token count of each output, and `vocabulary_size` is the number of
+        distinct normalized tokens.
+    """
+    raw_vocab = {}
+    normalized_vocab = {}
+    raw_to_normalized = []
+    raw_ids = []
+    lengths = np.empty(len(outputs), dtype=np.int64)
+    for index, text in enumerate(outputs):
+        tokens = text.split()
+        lengths[index] = len(tokens)
+        for token in tokens:
+            token_id = raw_vocab.get(token)
+            if token_id is None:
+                token_id = raw_vocab[token] = len(raw_vocab)
+                normalized = token.strip(_PUNCTUATION).lower() or token
+                raw_to_normalized.append(normalized_vocab.setdefault(normalized, len(normalized_vocab)))
+            raw_ids.append(token_id)
+    raw_ids = np.asarray(raw_ids, dtype=np.int64)
+    normalized_ids = np.asarray(raw_to_normalized, dtype=np.int64)[raw_ids] if len(raw_ids) else raw_ids
+    return raw_ids, normalized_ids, lengths, len(normalized_vocab)
+
+
+def _document_index(lengths):
+    """Return, for every token position, the index of the output it belongs to."""
+    return np.repeat(np.arange(len(lengths)), lengths)
+
+
+def ngram_keys(token_ids, lengths, n):
+    """Build one integer key per n-gram, without crossing output boundaries.
+
+    Args:
+        token_ids (np.ndarray): Token ids of all outputs back to back.
+        lengths (np.ndarray): Token count of each output.
+        n (int): N-gram order.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The output index and the key of every n-gram.
+    """
+    documents = _document_index(lengths)
+    count = len(token_ids) - n + 1
+    if count <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint64)
+    keys = token_ids[:count].astype(np.uint64)
+    for offset in range(1, n):
+        keys = keys * _NGRAM_KEY_PRIME + token_ids[offset:offset + count].astype(np.uint64)
+    valid = documents[:count] == documents[n - 1:n - 1 + count]
+    return documents[:count][valid], keys[valid]
+
+
+def _unique_pairs(documents, keys):
+    """Return the distinct (output, key) pairs, sorted by key.
+
+    `documents` must be in ascending order (as produced by `ngram_keys`), so a
+    stable sort by key keeps the pairs of each key grouped by output.
+    """
+    if len(keys) == 0:
+        return documents, keys
+    order = np.argsort(keys, kind="stable")
+    documents, keys = documents[order], keys[order]
+    first = np.ones(len(keys), dtype=bool)
+    first[1:] = (keys[1:] != keys[:-1]) | (documents[1:] != documents[:-1])
+    return documents[first], keys[first]
+
+
+def ngram_metrics(token_ids, lengths, n):
+    """Compute distinct-n and self-overlap-n for every output.
+
+    Args:
+        token_ids (np.ndarray): Normalized token ids of all outputs back to back.
+        lengths (np.ndarray): Token count of each output.
+        n (int): N-gram order.
+
+    Returns:
+        dict: Per-output arrays `distinct` and `self_overlap` (0.0 for outputs
+        shorter than n tokens), and the batch-level `corpus_distinct`.
+    """
+    outputs = len(lengths)
+    documents, keys = ngram_keys(token_ids, lengths, n)
+    totals = np.maximum(lengths - n + 1, 0)
+    unique_documents, unique_keys = _unique_pairs(documents, keys)
+    distinct_counts = np.bincount(unique_documents, minlength=outputs)
+
+    # Document frequency of every distinct pair's key: how many outputs contain it
+    if len(unique_keys):
+        boundaries = np.flatnonzero(np.r_[True, unique_keys[1:] != unique_keys[:-1], True])
+        frequencies = np.repeat(np.diff(boundaries), np.diff(boundaries))
+        corpus_distinct = (len(boundaries) - 1) / len(keys)
+    else:
+        frequencies = np.empty(0, dtype=np.int64)
+        corpus_distinct = 0.0
+    shared = np.bincount(unique_documents, weights=(frequencies > 1), minlength=outputs)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        distinct = np.where(totals > 0, distinct_counts / np.maximum(totals, 1), 0.0)
+        self_overlap = np.where(distinct_counts > 0, shared / np.maximum(distinct_counts, 1), 0.0)
+    return {"distinct": distinct, "self_overlap": self_overlap, "corpus_distinct": corpus_distinct}
+
+
+def hashed_embeddings(token_ids, lengths, dim=DEFAULT_HASH_DIM):
+    """Build bag-of-words count vectors by hashing token ids into `dim` buckets.
+
+    Args:
+        token_ids (np.ndarray): Normalized token ids of all outputs back to back.
+        lengths (np.ndarray): Token count of each output.
+        dim (int): Vector dimension.
+
+    Returns:
+        np.ndarray: A float32 matrix with one row per output.
+    """
+    cells = _document_index(lengths) * dim + token_ids % dim
+    counts = np.bincount(cells, minlength=len(lengths) * dim)
+    return counts.reshape(len(lengths), dim).astype(np.float32)
+
+
+def similarity_metrics(vectors, block_size=SIMILARITY_BLOCK_SIZE):
+    """Compute each output's mean and max cosine similarity to the other outputs.
+
+    The similarity matrix is computed block by block, so memory stays at
+    `block_size` x outputs floats even for very large batches.
+
+    Args:
+        vectors (np.ndarray): One embedding per output (any dimension).
+        block_size (int): Rows of the similarity matrix computed at a time.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Mean and max similarity per output
+        (0.0 when the batch has a single output or a vector is empty).
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    count = len(vectors)
+    mean = np.zeros(count, dtype=np.float32)
+    maximum = np.zeros(count, dtype=np.float32)
+    if count < 2:
+        return mean, maximum
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    unit = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+    for start in range(0, count, block_size):
+        stop = min(start + block_size, count)
+        block = unit[start:stop] @ unit.T
+        rows = np.arange(stop - start)
+        # Leave each output's similarity to itself out of its statistics
+        block[rows, rows + start] = 0.0
+        mean[start:stop] = block.sum(axis=1) / (count - 1)
+        block[rows, rows + start] = -np.inf
+        maximum[start:stop] = block.max(axis=1)
+    return mean, maximum
+
+
+def evaluate_batch(outputs, ngram_orders=DEFAULT_NGRAM_ORDERS, embeddings=None, hash_dim=DEFAULT_HASH_DIM):
+    """Evaluate a batch of outputs.
+
+    Args:
+        outputs (list[str]): The outputs to evaluate.
+        ngram_orders (tuple[int, ...]): N-gram orders for distinct-n and self-overlap-n.
+        embeddings (np.ndarray): Optional embeddings (one row per output), for
+            example from a Gemini embedding model; hashed bag-of-words vectors
+            are used when omitted.
+        hash_dim (int): Dimension of the hashed vectors.
+
+    Returns:
+        tuple[list[dict], dict]: One metrics dict per output (`words`,
+        `unique_words`, `distinct_<n>`, `self_overlap_<n>`, `mean_similarity`,
+        `max_similarity`), and the batch summary (`outputs`, `avg_<metric>` for
+        each metric, and `corpus_distinct_<n>`).
+    """
+    raw_ids, normalized_ids, lengths, _ = encode_batch(outputs)
+    columns = {"words": lengths}
+    documents, _ = _unique_pairs(_document_index(lengths), raw_ids.astype(np.uint64))
+    columns["unique_words"] = np.bincount(documents, minlength=len(outputs))
+    summary = {"outputs": len(outputs)}
+    for n in ngram_orders:
+        metrics = ngram_metrics(normalized_ids, lengths, n)
+        columns[f"distinct_{n}"] = metrics["distinct"]
+        columns[f"self_overlap_{n}"] = metrics["self_overlap"]
+        summary[f"corpus_distinct_{n}"] = round(float(metrics["corpus_distinct"]), 4)
+    if embeddings is None:
+        embeddings = hashed_embeddings(normalized_ids, lengths, hash_dim)
+    columns["mean_similarity"], columns["max_similarity"] = similarity_metrics(embeddings)
+
+    for name, values in columns.items():
+        summary[f"avg_{name}"] = round(float(np.mean(values)), 4) if len(values) else 0.0
+    rows = [
+        {name: int(values[index]) if name in ("words", "unique_words") else round(float(values[index]), 4)
+         for name, values in columns.items()}
+        for index in range(len(outputs))
+    ]
+    return rows, summary
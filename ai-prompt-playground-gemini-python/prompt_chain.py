@@ -0,0 +1,256 @@
+"""Prompt chain engine for the playground.
+
+A chain is a DAG of prompt steps. Each step's prompt is a template whose
+`{placeholders}` name chain inputs or earlier steps, whose outputs are
+substituted when the step runs:
+
+    {
+        "inputs": {"topic": "electric cars"},
+        "steps": [
+            {"name": "facts", "prompt": "List 5 facts about {topic}."},
+            {"name": "myths", "prompt": "List 5 myths about {topic}."},
+            {"name": "article", "prompt": "Write a short article using:\\n{facts}\\n{myths}",
+             "temperature": 0.9}
+        ]
+    }
+
+Steps whose dependencies are done run concurrently (`facts` and `myths`
+above run in parallel). Every step's response is memoized in a
+`ResponseCache` keyed on its model, settings and fully rendered prompt, so
+after editing one step only that step and the steps that depend on its
+output run again; everything else is served from the memo. With a SQLite
+memo file this holds across runs.
+"""
+
+import json
+import os
+import string
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+from google import genai
+
+# Make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from genai_common import CachedResponse, ResponseCache, generate_content_cached
+
+try:
+    import yaml
+except ImportError:  # PyYAML is optional; JSON chain specs work without it
+    yaml = None
+
+# Defaults for steps that do not set their own generation settings
+DEFAULT_MODEL = "gemini-3-flash-preview"
+DEFAULT_SYSTEM_PROMPT = "You are a helpful assistant."
+DEFAULT_TEMPERATURE = 0.7
+DEFAULT_TOP_P = 0.9
+DEFAULT_CHAIN_WORKERS = 4
+
+
+@dataclass
+class ChainStep:
+    """One prompt step of a chain.
+
+    Attributes:
+        name (str): Unique step name, used by later steps as `{name}`.
+        prompt (str): Prompt template referencing inputs and earlier steps.
+        system_prompt (str): System instruction for the step.
+        temperature (float): Sampling temperature.
+        top_p (float): Nucleus sampling parameter.
+    """
+
+    name: str
+    prompt: str
+    system_prompt: str = DEFAULT_SYSTEM_PROMPT
+    temperature: float = DEFAULT_TEMPERATURE
+    top_p: float = DEFAULT_TOP_P
+
+    @property
+    def references(self):
+        """Names referenced by the prompt template's placeholders."""
+        return {field for _, field, _, _ in string.Formatter().parse(self.prompt) if field}
+
+
+@dataclass
+class StepResult:
+    """Outcome of one step of a chain run.
+
+    Attributes:
+        name (str): Step name.
+        status (str): "ran", "memoized", "failed" or "skipped" (a dependency failed).
+        output (str): The generated text, or the error message.
+        latency_seconds (float): Time the step took.
+        started_at (float): Seconds from the start of the run until the step started.
+    """
+
+    name: str
+    status: str
+    output: str
+    latency_seconds: float = 0.0
+    started_at: float = 0.0
+
+
+def load_chain_spec(path):
+    """Load a chain from a YAML or JSON spec (see the module docstring for the format).
+
+    Args:
+        path (str): Path to a `.yaml`/`.yml` or `.json` spec file.
+
+    Returns:
+        tuple[list[ChainStep], dict]: The steps and the chain inputs.
+
+    Raises:
+        ValueError: If the spec is malformed, or it is YAML and PyYAML is not installed.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        if path.lower().endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise ValueError("PyYAML is required for YAML chain specs (pip install pyyaml), or use JSON.")
+            spec = yaml.safe_load(file)
+        else:
+            spec = json.load(file)
+    if not isinstance(spec, dict) or not isinstance(spec.get("steps"), list) or not spec["steps"]:
+        raise ValueError(f"Chain spec {path} must be a mapping with a non-empty 'steps' list.")
+    try:
+        steps = [ChainStep(**step) for step in spec["steps"]]
+    except TypeError as e:
+        raise ValueError(f"Invalid step in chain spec {path}: {e}")
+    inputs = {name: str(value) for name, value in (spec.get("inputs") or {}).items()}
+    return steps, inputs
+
+
+def order_steps(steps, inputs):
+    """Validate a chain and return its steps in dependency order.
+
+    Args:
+        steps (list[ChainStep]): The chain steps.
+        inputs (dict): Chain inputs available to every step.
+
+    Returns:
+        list[ChainStep]: The steps, each after all the steps it references.
+
+    Raises:
+        ValueError: On duplicate step names, names shadowing inputs, unknown
+            references, or a dependency cycle.
+    """
+    by_name = {}
+    for step in steps:
+        if step.name in by_name or step.name in inputs:
+            raise ValueError(f"Step name '{step.name}' is used more than once")
+        by_name[step.name] = step
+    for step in steps:
+        unknown = step.references - by_name.keys() - inputs.keys()
+        if unknown:
+            raise ValueError(f"Step '{step.name}' references unknown name(s): {', '.join(sorted(unknown))}")
+
+    ordered, done = [], set()
+    remaining = list(steps)
+    while remaining:
+        ready = [step for step in remaining if (step.references & by_name.keys()) <= done]
+        if not ready:
+            raise ValueError(f"Dependency cycle between steps: {', '.join(step.name for step in remaining)}")
+        for step in ready:
+            ordered.append(step)
+            done.add(step.name)
+        remaining = [step for step in remaining if step.name not in done]
+    return ordered
+
+
+def run_step(client, step, values, memo, model=DEFAULT_MODEL):
+    """Render a step's prompt and generate its output through the memo.
+
+    Args:
+        client (genai.Client): The Gemini API client instance.
+        step (ChainStep): The step to run.
+        values (dict): Chain inputs and the outputs of completed steps.
+        memo (ResponseCache): Memo of step responses.
+        model (str): Model name.
+
+    Returns:
+        tuple[str, str]: The status ("ran", "memoized" or "failed") and the
+        output text or error message.
+    """
+    config = genai.types.GenerateContentConfig(
+        system_instruction=step.system_prompt,
+        temperature=step.temperature,
+        top_p=step.top_p
+    )
+    try:
+        response = generate_content_cached(client, model=model, contents=step.prompt.format(**values),
+                                           config=config, cache=memo)
+        if not response.text:
+            return "failed", "Error: Empty response received from the API"
+        return ("memoized" if isinstance(response, CachedResponse) else "ran"), response.text
+    except Exception as e:
+        return "failed", f"Error: {e}"
+
+
+def run_chain(client, steps, inputs=None, memo=None, workers=DEFAULT_CHAIN_WORKERS, model=DEFAULT_MODEL):
+    """Run a chain, executing independent steps concurrently.
+
+    A step starts as soon as every step it references has finished. If a
+    step fails, the steps that depend on it are skipped; independent
+    branches still run.
+
+    Args:
+        client (genai.Client): The Gemini API client instance.
+        steps (list[ChainStep]): The chain steps.
+        inputs (dict): Values for input placeholders.
+        memo (ResponseCache): Memo of step responses; a fresh in-memory one when omitted.
+            A memo must cache every temperature (`max_temperature=None`), or
+            sampled steps run again on every call.
+        workers (int): Maximum concurrent steps.
+        model (str): Model name.
+
+    Returns:
+        dict[str, StepResult]: The result of every step, in dependency order.
+    """
+    inputs = inputs or {}
+    ordered = order_steps(steps, inputs)
+    memo = memo if memo is not None else ResponseCache(max_temperature=None)
+    step_names = {step.name for step in ordered}
+    values = dict(inputs)
+    results = {}
+    pending = {}
+    run_started = time.perf_counter()
+
+    def timed_step(step, step_values):
+        started = time.perf_counter()
+        status, output = run_step(client, step, step_values, memo, model)
+        return StepResult(step.name, status, output, time.perf_counter() - started, started - run_started)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        waiting = list(ordered)
+        while waiting or pending:
+            for step in list(waiting):
+                dependencies = step.references & step_names
+                if any(results.get(name) and results[name].status in ("failed", "skipped") for name in dependencies):
+                    results[step.name] = StepResult(step.name, "skipped", "Skipped: a dependency failed")
+                    waiting.remove(step)
+                elif dependencies <= results.keys():
+                    pending[executor.submit(timed_step, step, dict(values))] = step
+                    waiting.remove(step)
+            if not pending:
+                continue
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                del pending[future]
+                results[result.name] = result
+                if result.status in ("ran", "memoized"):
+                    values[result.name] = result.output
+    return {step.name: results[step.name] for step in ordered}
+
+
+def print_step_timings(results):
+    """Print the status, start offset and latency of every step of a chain run.
+
+    Args:
+        results (dict[str, StepResult]): Results returned by `run_chain`.
+    """
+    print("\n--- Step Timings ---")
+    for result in results.values():
+        print(f"{result.name:<20} {result.status:<9} start +{result.started_at:6.2f}s  "
+              f"latency {result.latency_seconds:6.2f}s")
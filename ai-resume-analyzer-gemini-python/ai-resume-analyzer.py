@@ -1,8 +1,21 @@
+import argparse
+import glob
+import hashlib
+import json
 import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, Optional
 from dotenv import load_dotenv
 from google import genai
 from pypdf import PdfReader
 
+# Make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from genai_common import (RequestUsage, generate_content_cached, generate_content_cached_async, get_context_cache,
+                          get_genai_client, latency_summary, usage_from_response)
+
 # Load environment variables from .env file (if present)
 load_dotenv()
 
@@ -11,21 +24,47 @@ load_dotenv()
 TARGET_MODEL = "gemini-3-flash-preview"
 TEMPERATURE = 1
 
+# Role given to the model for every analysis
+SYSTEM_INSTRUCTIONS = "You are an expert resume writing assistant. Please analyze the following resume:"
+
+# Fixed analysis instructions shared by every request; only the resume changes.
+# With context caching enabled they are uploaded once and reused.
+ANALYSIS_RUBRIC = """
+        Improve the following resume professionaly.
+        Also provide:
+        1. Key strengths and skills highlighted in the resume.
+        2. Areas for improvement in terms of content, structure, and formatting.
+        3. ATS (Applicant Tracking System) compatibility analysis and suggestions.
+"""
+
 # Relative path to the resume file to analyze
 TARGET_FILE = "data/resume.pdf"
 
+# Text extraction settings
+EXTRACT_CACHE_DIR = ".extract_cache"  # Extracted text cached by file hash, relative to this script
+PARALLEL_PAGE_THRESHOLD = 32  # PDFs with more pages are split across processes
+PAGES_PER_TASK = 16  # Pages extracted by one worker process at a time
+
+# Batch screening settings
+RESUME_EXTENSIONS = (".pdf", ".txt")
+DEFAULT_BATCH_OUTPUT = "screening_results.jsonl"
+DEFAULT_BATCH_WORKERS = 4  # Concurrent Gemini requests
+CHECKPOINT_SUFFIX = ".checkpoint"  # Checkpoint file name is the output path plus this suffix
+
 
 def create_genai_client() -> 'genai.Client':
     """Initialize and return an authenticated GenAI client.
 
     The client relies on the `GEMINI_API_KEY` being available in the
     environment (for example via a local `.env` file loaded above).
+    The shared client from `genai_common` is built on first use and
+    reused afterwards, keeping its HTTP connections alive.
 
     Returns:
         genai.Client: An authenticated GenAI client instance.
     """
     print("Creating Gen AI client...")
-    return genai.Client()
+    return get_genai_client()
 
 def create_user_prompt(content: str) -> str:
     """Create a detailed prompt for resume analysis.
@@ -39,29 +78,99 @@ def create_user_prompt(content: str) -> str:
     Returns:
         str: A formatted prompt for the GenAI model.
     """
-    user_prompt = f"""
+    user_prompt = f"\n{ANALYSIS_RUBRIC}{create_resume_section(content)}"
+    return user_prompt
 
-        Improve the following resume professionaly.
-        Also provide:
-        1. Key strengths and skills highlighted in the resume.
-        2. Areas for improvement in terms of content, structure, and formatting.
-        3. ATS (Applicant Tracking System) compatibility analysis and suggestions.
+def create_resume_section(content: str) -> str:
+    """Create the part of the prompt that changes per resume.
+
+    Args:
+        content: The resume text content to analyze.
 
+    Returns:
+        str: The resume section that follows `ANALYSIS_RUBRIC` in the prompt.
+    """
+    return f"""
         Resume content:
         {content}
         """
-    return user_prompt
 
-def read_resume_from_file(file_path: str) -> str:
+def iter_pdf_page_texts(file_path: str, start: int = 0, stop: Optional[int] = None) -> Iterator[str]:
+    """Yield the extracted text of each page of a PDF, one page at a time.
+
+    Args:
+        file_path: Absolute path to the PDF file.
+        start: Index of the first page to extract.
+        stop: Index after the last page to extract (defaults to the end).
+
+    Yields:
+        str: The text of each page, in page order.
+    """
+    reader = PdfReader(file_path)
+    for index in range(start, len(reader.pages) if stop is None else stop):
+        yield reader.pages[index].extract_text()
+
+def extract_pdf_page_range(file_path: str, start: int, stop: int) -> str:
+    """Extract and join the text of a range of PDF pages (process-pool worker).
+
+    Args:
+        file_path: Absolute path to the PDF file.
+        start: Index of the first page.
+        stop: Index after the last page.
+
+    Returns:
+        str: The concatenated text of the pages.
+    """
+    return "".join(iter_pdf_page_texts(file_path, start, stop))
+
+def extract_pdf_text(file_path: str, workers: Optional[int] = None) -> str:
+    """Extract the full text of a PDF, splitting large documents across processes.
+
+    Pages are streamed through a generator and joined once. PDFs with more
+    than `PARALLEL_PAGE_THRESHOLD` pages are cut into ranges of
+    `PAGES_PER_TASK` pages that are extracted in a process pool and joined
+    in page order, so the result is identical to a sequential extraction.
+
+    Args:
+        file_path: Absolute path to the PDF file.
+        workers: Worker processes for large PDFs (defaults to the CPU count);
+            1 forces sequential extraction.
+
+    Returns:
+        str: The text of all pages concatenated.
+    """
+    page_count = len(PdfReader(file_path).pages)
+    if workers == 1 or page_count <= PARALLEL_PAGE_THRESHOLD:
+        return "".join(iter_pdf_page_texts(file_path))
+    ranges = [(start, min(start + PAGES_PER_TASK, page_count)) for start in range(0, page_count, PAGES_PER_TASK)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        parts = executor.map(extract_pdf_page_range, [file_path] * len(ranges),
+                             [start for start, _ in ranges], [stop for _, stop in ranges])
+        return "".join(parts)
+
+def file_sha256(file_path: str) -> str:
+    """Return the sha256 hex digest of a file's bytes, read in blocks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def read_resume_from_file(file_path: str, cache_dir: Optional[str] = None, workers: Optional[int] = None) -> str:
     """Read and return the contents of a resume file.
 
     Supports both absolute and workspace-relative paths. When a relative
     path is provided, it is resolved relative to this script's directory.
     
-    For PDF files, uses pypdf to extract text. For other files, reads as plain text.
+    For PDF files, uses pypdf to extract text (see `extract_pdf_text`). For
+    other files, reads as plain text. With a `cache_dir`, extracted PDF text
+    is stored under the file's sha256 so the same PDF is never parsed twice.
 
     Args:
         file_path: Relative or absolute path to the resume file.
+        cache_dir: Optional directory for cached PDF text; relative paths are
+            resolved against this script's directory.
+        workers: Worker processes for large PDFs (see `extract_pdf_text`).
 
     Returns:
         str: The file contents of the resume as a string.
@@ -80,10 +189,21 @@ def read_resume_from_file(file_path: str) -> str:
     try:
         # Handle PDF files
         if file_path.lower().endswith('.pdf'):
-            reader = PdfReader(file_path)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
+            if cache_dir is None:
+                return extract_pdf_text(file_path, workers)
+            if not os.path.isabs(cache_dir):
+                cache_dir = os.path.join(os.path.dirname(__file__), cache_dir)
+            cache_path = os.path.join(cache_dir, f"{file_sha256(file_path)}.txt")
+            if os.path.exists(cache_path):
+                with open(cache_path, 'r', encoding='utf-8', newline='') as cached:
+                    return cached.read()
+            text = extract_pdf_text(file_path, workers)
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write to a temporary name first so readers never see a partial file
+            temp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8', newline='') as cached:
+                cached.write(text)
+            os.replace(temp_path, cache_path)
             return text
         # Handle text files
         else:
@@ -94,13 +214,98 @@ def read_resume_from_file(file_path: str) -> str:
     except Exception as e:
         raise ValueError(f"Error reading file at {file_path}: {str(e)}")
 
+def _read_resume_for_pool(file_path: str, cache_dir: Optional[str]) -> tuple[str, Optional[str], Optional[str]]:
+    """Process-pool worker for `read_resumes`; returns (path, text, error)."""
+    try:
+        return file_path, read_resume_from_file(file_path, cache_dir, workers=1), None
+    except (FileNotFoundError, ValueError) as e:
+        return file_path, None, str(e)
+
+def read_resumes(file_paths: Iterable[str], cache_dir: Optional[str] = EXTRACT_CACHE_DIR,
+                 workers: Optional[int] = None) -> Iterator[tuple[str, Optional[str], Optional[str]]]:
+    """Extract many resumes in parallel, one file per worker process.
+
+    Args:
+        file_paths: Resume files (PDF or text).
+        cache_dir: Directory for cached PDF text, or None to disable caching.
+        workers: Worker processes (defaults to the CPU count).
+
+    Yields:
+        tuple: (path, text, error) for each file in input order; `text` is
+        None and `error` holds the message when a file cannot be read.
+    """
+    paths = list(file_paths)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_read_resume_for_pool, paths, [cache_dir] * len(paths))
+
+
+def describe_api_error(e: Exception) -> str:
+    """Turn an exception from the GenAI API into a readable message.
+
+    Args:
+        e: The exception raised while calling the model.
+
+    Returns:
+        str: The error message shown to the user.
+    """
+    if isinstance(e, AttributeError):
+        return "Error: Invalid response format from the API."
+    if isinstance(e, ValueError):
+        return f"Invalid input value: {e}"
+    if isinstance(e, ConnectionError):
+        return "Error: Failed to connect to the API. Check your internet connection."
+    if isinstance(e, TimeoutError):
+        return "Error: Request timed out. Please try again."
+    return f"An unexpected error occurred while calling the GenAI API: {e}"
+
+def request_analysis(client: 'genai.Client', content: str) -> tuple[str, RequestUsage]:
+    """Ask the model to analyze a resume and return the feedback with its token usage.
+
+    With context caching enabled (`GENAI_CONTEXT_CACHE`), the system
+    instruction and `ANALYSIS_RUBRIC` are uploaded once and only the resume
+    section is sent with each request. Errors are raised rather than returned
+    as text, so batch screening can tell failed resumes apart and retry them.
+
+    Args:
+        client: Authenticated GenAI client instance.
+        content: The resume text content to analyze.
+
+    Returns:
+        tuple[str, RequestUsage]: The model's response text and the input,
+        cached and output token counts of the request.
+    """
+    config = genai.types.GenerateContentConfig(
+        system_instruction=SYSTEM_INSTRUCTIONS,
+        temperature=TEMPERATURE
+    )
+    context_cache = get_context_cache()
+    if context_cache is not None:
+        response, usage = context_cache.generate(
+            client,
+            model=TARGET_MODEL,
+            system_instruction=SYSTEM_INSTRUCTIONS,
+            prefix=ANALYSIS_RUBRIC,
+            contents=create_resume_section(content),
+            config=config,
+            cacheable=True
+        )
+        return response.text, usage
+    response = generate_content_cached(
+        client,
+        model=TARGET_MODEL,
+        config=config,
+        contents=create_user_prompt(content),
+        cacheable=True
+    )
+    return response.text, usage_from_response(response)
 
 def analyze_resume(client: 'genai.Client', prompt: str) -> str:
     """Call the GenAI model to analyze a resume and return the feedback.
 
     The function provides a system instruction to the model to position it as
     an expert resume writing assistant. Common API errors are handled and
-    returned as readable messages to keep the CLI interactive.
+    returned as readable messages to keep the CLI interactive. Identical
+    requests hit the shared response cache when it is enabled (`GENAI_CACHE`).
 
     Args:
         client: Authenticated GenAI client instance.
@@ -109,27 +314,287 @@ def analyze_resume(client: 'genai.Client', prompt: str) -> str:
     Returns:
         str: The model's response text with resume feedback, or an error string describing the failure.
     """
-    system_instructions = "You are an expert resume writing assistant. Please analyze the following resume:"
     try:
-        response = client.models.generate_content(
+        response = generate_content_cached(
+            client,
             model=TARGET_MODEL,
             config=genai.types.GenerateContentConfig(
-                system_instruction=system_instructions,
+                system_instruction=SYSTEM_INSTRUCTIONS,
                 temperature=TEMPERATURE
             ),
-            contents=prompt
+            contents=prompt,
+            cacheable=True
         )
         return response.text
-    except AttributeError:
-        return "Error: Invalid response format from the API."
-    except ValueError as e:
-        return f"Invalid input value: {e}"
-    except ConnectionError:
-        return "Error: Failed to connect to the API. Check your internet connection."
-    except TimeoutError:
-        return "Error: Request timed out. Please try again."
     except Exception as e:
-        return f"An unexpected error occurred while calling the GenAI API: {e}"
+        return describe_api_error(e)
+
+async def analyze_resume_async(client: 'genai.Client', prompt: str) -> str:
+    """Async version of `analyze_resume`, using the SDK's async client (`client.aio`).
+
+    Same request, response cache and error messages as `analyze_resume`,
+    without blocking the event loop; fan out many calls with
+    `genai_common.gather_bounded`.
+
+    Args:
+        client: Authenticated GenAI client instance.
+        prompt: The user-facing prompt produced by `create_user_prompt`.
+
+    Returns:
+        str: The model's response text with resume feedback, or an error string describing the failure.
+    """
+    try:
+        response = await generate_content_cached_async(
+            client,
+            model=TARGET_MODEL,
+            config=genai.types.GenerateContentConfig(
+                system_instruction=SYSTEM_INSTRUCTIONS,
+                temperature=TEMPERATURE
+            ),
+            contents=prompt,
+            cacheable=True
+        )
+        return response.text
+    except Exception as e:
+        return describe_api_error(e)
+
+def analyze_resume_content(client: 'genai.Client', content: str) -> tuple[str, Optional[RequestUsage]]:
+    """Analyze resume text, using context caching when it is enabled.
+
+    Like `analyze_resume`, API errors are returned as readable messages.
+
+    Args:
+        client: Authenticated GenAI client instance.
+        content: The resume text content to analyze.
+
+    Returns:
+        tuple[str, Optional[RequestUsage]]: The feedback (or an error string)
+        and the token usage of the request, which is None on error.
+    """
+    try:
+        return request_analysis(client, content)
+    except Exception as e:
+        return describe_api_error(e), None
+
+def collect_resume_paths(source: str) -> list[str]:
+    """Resolve a directory or glob pattern into a sorted list of resume files.
+
+    A directory selects every PDF and text file directly inside it; anything
+    else is treated as a glob pattern (`**` is supported for recursive matches).
+
+    Args:
+        source: A directory path or a glob pattern such as `resumes/*.pdf`.
+
+    Returns:
+        list[str]: Sorted absolute paths of the matching files, so that
+        `read_resume_from_file` does not resolve them against the script directory.
+    """
+    if os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in os.listdir(source)
+                 if name.lower().endswith(RESUME_EXTENSIONS)]
+    else:
+        paths = glob.glob(source, recursive=True)
+    return sorted(os.path.abspath(path) for path in paths if os.path.isfile(path))
+
+def load_checkpoint(checkpoint_path: str) -> set[str]:
+    """Return the sha256 digests of resumes already screened by a previous run.
+
+    Args:
+        checkpoint_path: Checkpoint file written by `run_screening`.
+
+    Returns:
+        set[str]: Digests of completed resumes; empty when there is no checkpoint yet.
+    """
+    if not os.path.exists(checkpoint_path):
+        return set()
+    with open(checkpoint_path, 'r', encoding='utf-8') as file:
+        return {line.split("\t", 1)[0] for line in file if line.strip()}
+
+def screen_resume(client: 'genai.Client', file_path: str, digest: str, content: str) -> dict:
+    """Analyze one extracted resume and build its result record (thread-pool worker).
+
+    Args:
+        client: Authenticated GenAI client instance.
+        file_path: Path of the resume file.
+        digest: sha256 of the resume file.
+        content: Extracted resume text.
+
+    Returns:
+        dict: The file, its digest, the analysis or error, the request latency
+        and its input and cached token counts.
+    """
+    started = time.perf_counter()
+    usage: Optional[RequestUsage] = None
+    try:
+        (analysis, usage), error = request_analysis(client, content), None
+    except Exception as e:
+        analysis, error = None, describe_api_error(e)
+    return {"file": file_path, "sha256": digest, "analysis": analysis, "error": error,
+            "latency_seconds": round(time.perf_counter() - started, 3),
+            "input_tokens": usage.input_tokens if usage else None,
+            "cached_tokens": usage.cached_tokens if usage else None}
+
+def iter_screening_results(client: 'genai.Client', resumes: Iterable[tuple[str, str]],
+                           workers: int = DEFAULT_BATCH_WORKERS, extract_workers: Optional[int] = None,
+                           cache_dir: Optional[str] = EXTRACT_CACHE_DIR) -> Iterator[dict]:
+    """Extract and analyze resumes concurrently, yielding results as they finish.
+
+    Text extraction runs in a process pool and analysis requests run in a
+    thread pool at the same time: as soon as a resume's text is ready its
+    request is submitted, while the next files are still being parsed. The
+    number of resumes in flight is bounded, so memory does not grow with the
+    size of the batch.
+
+    Args:
+        client: Authenticated GenAI client instance.
+        resumes: (path, sha256) pairs of the resumes to screen.
+        workers: Maximum concurrent Gemini requests.
+        extract_workers: Extraction processes (defaults to the CPU count).
+        cache_dir: Directory for cached PDF text, or None to disable caching.
+
+    Yields:
+        dict: One record per resume, in completion order (see `screen_resume`).
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    extract_workers = extract_workers or os.cpu_count() or 1
+    max_in_flight = workers + 2 * extract_workers
+    pending_resumes = iter(resumes)
+    digests: dict[str, str] = {}
+    with ProcessPoolExecutor(max_workers=extract_workers) as extractors, \
+            ThreadPoolExecutor(max_workers=workers) as analysts:
+        extracting: set[Future] = set()
+        analyzing: set[Future] = set()
+
+        def submit_extractions() -> None:
+            while len(extracting) + len(analyzing) < max_in_flight:
+                item = next(pending_resumes, None)
+                if item is None:
+                    return
+                path, digest = item
+                digests[path] = digest
+                extracting.add(extractors.submit(_read_resume_for_pool, path, cache_dir))
+
+        submit_extractions()
+        while extracting or analyzing:
+            done, _ = wait(extracting | analyzing, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in analyzing:
+                    analyzing.remove(future)
+                    yield future.result()
+                    continue
+                extracting.remove(future)
+                path, content, error = future.result()
+                digest = digests.pop(path)
+                if error is not None:
+                    yield {"file": path, "sha256": digest, "analysis": None, "error": error,
+                           "latency_seconds": None, "input_tokens": None, "cached_tokens": None}
+                else:
+                    analyzing.add(analysts.submit(screen_resume, client, path, digest, content))
+            submit_extractions()
+
+def run_screening(client: 'genai.Client', source: str, output_path: str, workers: int = DEFAULT_BATCH_WORKERS,
+                  extract_workers: Optional[int] = None, fresh: bool = False) -> dict:
+    """Screen every resume in a directory and append the results to a JSONL file.
+
+    Each finished resume is written and flushed immediately, then its sha256
+    is added to a checkpoint file next to the output. A run that is killed
+    and started again skips every resume in the checkpoint, so nothing is
+    billed twice; resumes that failed are not checkpointed and are retried.
+
+    Args:
+        client: Authenticated GenAI client instance.
+        source: Directory or glob pattern selecting the resumes.
+        output_path: Destination JSONL file.
+        workers: Maximum concurrent Gemini requests.
+        extract_workers: Extraction processes (defaults to the CPU count).
+        fresh: Ignore an existing checkpoint and overwrite the output.
+
+    Returns:
+        dict: Counts of screened, failed and skipped resumes, throughput in
+        resumes per minute, request latency statistics, and the input and
+        cached token totals.
+    """
+    checkpoint_path = output_path + CHECKPOINT_SUFFIX
+    if fresh and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    completed = load_checkpoint(checkpoint_path)
+
+    file_paths = collect_resume_paths(source)
+    resumes = [(path, file_sha256(path)) for path in file_paths]
+    todo = [(path, digest) for path, digest in resumes if digest not in completed]
+    skipped = len(resumes) - len(todo)
+    print(f"Found {len(resumes)} resume(s); {skipped} already screened, {len(todo)} to go "
+          f"with {workers} worker(s)...")
+
+    started = time.perf_counter()
+    screened, failed = 0, 0
+    input_tokens, cached_tokens = 0, 0
+    latencies: list[float] = []
+    with open(output_path, 'w' if fresh else 'a', encoding='utf-8') as output, \
+            open(checkpoint_path, 'a', encoding='utf-8') as checkpoint:
+        for record in iter_screening_results(client, todo, workers, extract_workers):
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+            if record["error"] is not None:
+                failed += 1
+                print(f"Failed: {record['file']}: {record['error']}")
+                continue
+            # Checkpoint only after the result is safely on disk
+            checkpoint.write(f"{record['sha256']}\t{record['file']}\n")
+            checkpoint.flush()
+            screened += 1
+            latencies.append(record["latency_seconds"])
+            input_tokens += record["input_tokens"]
+            cached_tokens += record["cached_tokens"]
+    elapsed = time.perf_counter() - started
+
+    stats = {
+        "screened": screened,
+        "failed": failed,
+        "skipped": skipped,
+        "elapsed_seconds": elapsed,
+        "resumes_per_minute": screened * 60 / elapsed if elapsed > 0 else 0.0,
+        "latency": latency_summary(latencies),
+        "input_tokens": input_tokens,
+        "cached_tokens": cached_tokens,
+    }
+    print(f"Screened {screened} resume(s) ({failed} failed, {skipped} skipped) in {elapsed:.1f}s "
+          f"-> {output_path}")
+    print(f"Throughput: {stats['resumes_per_minute']:.1f} resumes/min | "
+          f"Latency p50: {stats['latency']['p50']:.2f}s | p95: {stats['latency']['p95']:.2f}s")
+    print(f"Input tokens: {input_tokens} (cached: {cached_tokens})")
+    return stats
+
+def release_context_cache(client: 'genai.Client') -> None:
+    """Delete the prefixes uploaded for context caching, if it is enabled."""
+    context_cache = get_context_cache()
+    if context_cache is not None:
+        context_cache.release(client)
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Parse command-line options.
+
+    Without options the tool analyzes `TARGET_FILE`, as before.
+
+    Args:
+        argv: Arguments to parse; defaults to `sys.argv`.
+
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Analyze resumes with Google Gemini.")
+    parser.add_argument("--batch", metavar="SOURCE",
+                        help="Directory or glob of PDF/text resumes to screen.")
+    parser.add_argument("--output", default=DEFAULT_BATCH_OUTPUT,
+                        help=f"JSONL file for batch results (default: {DEFAULT_BATCH_OUTPUT}).")
+    parser.add_argument("--workers", type=int, default=DEFAULT_BATCH_WORKERS,
+                        help=f"Maximum concurrent requests in batch mode (default: {DEFAULT_BATCH_WORKERS}).")
+    parser.add_argument("--extract-workers", type=int,
+                        help="Text extraction processes in batch mode (default: CPU count).")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Ignore the checkpoint of a previous batch run and start over.")
+    return parser.parse_args(argv)
 
 def main() -> None:
     """Script entry point: read resume file, build prompt, call model, and print analysis.
@@ -139,26 +604,44 @@ def main() -> None:
     2. Reads the resume file (supports PDF and text formats)
     3. Creates a detailed analysis prompt
     4. Calls the GenAI model for expert feedback
-    5. Displays the analysis results
+    5. Displays the analysis results and the request's token usage
+
+    With `--batch` it instead screens every resume in a directory and writes
+    the results to a JSONL file, resuming from the checkpoint of an
+    interrupted run.
     """
+    args = parse_args()
+    if args.batch:
+        print("--- AI Resume Analyzer: batch screening ---")
+        client = create_genai_client()
+        try:
+            run_screening(client, args.batch, os.path.abspath(args.output), args.workers,
+                          args.extract_workers, args.fresh)
+        finally:
+            release_context_cache(client)
+        return
+
     print("--- Welcome to your AI Resume Analyzer! ---")
     print("Analyzing resume from file:", TARGET_FILE)
 
-    # Read resume to analyze
-    resume_content = read_resume_from_file(TARGET_FILE)
+    # Read resume to analyze (extracted PDF text is cached by file hash)
+    resume_content = read_resume_from_file(TARGET_FILE, EXTRACT_CACHE_DIR)
 
-    # Build the prompt that instructs the model how to analyze the resume
-    user_prompt = create_user_prompt(resume_content)
-
-    # Initialize client and make the API call
+    # Initialize client and make the API call (the prompt is built from the
+    # shared rubric and the resume, see `request_analysis`)
     client = create_genai_client()
     print("Analyzing resume... Please wait.\n")
-    result = analyze_resume(client, user_prompt)
+    try:
+        result, usage = analyze_resume_content(client, resume_content)
+    finally:
+        release_context_cache(client)
 
     # Print a readable separator and the model's output
     print("-" * 60)
     print(result)
     print("-" * 60)
+    if usage is not None:
+        print(usage.summary())
 
 
 if __name__ == "__main__":
@@ -1,5 +1,12 @@
+import argparse
+import os
+import sys
 from dotenv import load_dotenv
-from google import genai
+
+# Make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from genai_common import get_genai_client
+from genai_common.streaming import stream_generate
 
 # Load environment variables from .env file
 load_dotenv()
@@ -12,12 +19,25 @@ def create_genai_client(model=TARGET_MODEL, config=None):
     Initializes and returns a Google GenAI client.
     
     The client automatically uses the GEMINI_API_KEY from the environment
-    to authenticate with Google's API.
+    to authenticate with Google's API. The same pooled client is returned on
+    every call, so generating several stories does not reconnect each time.
     
     Returns:
         genai.Client: An authenticated GenAI client instance.
     """
-    return genai.Client()
+    return get_genai_client()
+
+def describe_api_error(e):
+    """Turn an exception from the Gemini API into the error message shown instead of a story."""
+    if isinstance(e, AttributeError):
+        return "Error: Invalid response format from the API."
+    if isinstance(e, ValueError):
+        return f"Invalid input value: {e}"
+    if isinstance(e, ConnectionError):
+        return "Error: Failed to connect to the API. Check your internet connection."
+    if isinstance(e, TimeoutError):
+        return "Error: Request timed out. Please try again."
+    return f"An error occurred: {e}"
 
 def generate_content(prompt, config=None):
     client = create_genai_client()
@@ -28,16 +48,37 @@ def generate_content(prompt, config=None):
             contents=prompt
         )
         return response.text
-    except AttributeError:
-        return "Error: Invalid response format from the API."
-    except ValueError as e:
-        return f"Invalid input value: {e}"
-    except ConnectionError:
-        return "Error: Failed to connect to the API. Check your internet connection."
-    except TimeoutError:
-        return "Error: Request timed out. Please try again."
     except Exception as e:
-        return f"An error occurred: {e}"
+        return describe_api_error(e)
+
+async def generate_content_async(prompt, config=None):
+    """Async version of generate_content, using the SDK's async client (client.aio).
+
+    Returns the same text or error message without blocking the event loop.
+    """
+    client = create_genai_client()
+    try:
+        response = await client.aio.models.generate_content(
+            model=TARGET_MODEL,
+            config=config,
+            contents=prompt
+        )
+        return response.text
+    except Exception as e:
+        return describe_api_error(e)
+
+def stream_content(prompt, config=None):
+    """Stream the model output to the console as it arrives.
+
+    Returns a (text, stream_result) pair. On failure the text is the same
+    error message generate_content would return and stream_result is None.
+    """
+    client = create_genai_client()
+    try:
+        result = stream_generate(client, model=TARGET_MODEL, config=config, contents=prompt)
+        return result.text, result
+    except Exception as e:
+        return describe_api_error(e), None
     
 def create_story_prompt(hero: str, genre: str, place: str, idea: str, age_group: str) -> str:
     
@@ -77,16 +118,35 @@ def get_user_input():
 def generate_story(prompt):
     return generate_content(prompt)
 
+async def generate_story_async(prompt):
+    return await generate_content_async(prompt)
+
+def generate_story_stream(prompt):
+    return stream_content(prompt)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate children's stories with Google Gemini.")
+    parser.add_argument("--stream", action="store_true",
+                        help="Print the story as it is generated and report time-to-first-token.")
+    return parser.parse_args(argv)
+
 def main():
-    
+    args = parse_args()
     print("--- Welcome to your AI Magic Storybox!! ---")
     print("Please provide details for the story you want to create.")
     chracter, genre, place, idea, age = get_user_input()
     print("\nGenerating your story...please wait...")
     print("-" * 60)
     user_prompt = create_story_prompt(chracter, genre, place, idea, age)
-    result = generate_story(user_prompt)
-    print(result)
+    if args.stream:
+        result, stream_result = generate_story_stream(user_prompt)
+        if stream_result is None:
+            print(result)
+        else:
+            print(f"\n\n{stream_result.timing_summary()}")
+    else:
+        result = generate_story(user_prompt)
+        print(result)
     print("-" * 60)
 
 if __name__ == "__main__":
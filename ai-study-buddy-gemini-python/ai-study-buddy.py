@@ -15,10 +15,18 @@ Requirements:
     - GEMINI_API_KEY environment variable (or set in .env)
 """
 
+import argparse
 import os
+import sys
+from typing import Optional
 from dotenv import load_dotenv
 from google import genai
 
+# Make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from genai_common import get_genai_client
+from genai_common.streaming import StreamResult, stream_generate
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -28,13 +36,14 @@ TARGET_MODEL = "gemini-3-flash-preview"
 def create_genai_client() -> 'genai.Client':
     """Initialize and return an authenticated GenAI client.
 
-    The client uses the `GEMINI_API_KEY` from the environment (or `.env`).
+    The client uses the `GEMINI_API_KEY` from the environment (or `.env`)
+    and is the process-wide pooled client from `genai_common`.
 
     Returns:
         genai.Client: Authenticated GenAI client instance.
     """
     print("\nCreating Gen AI client...")
-    return genai.Client()
+    return get_genai_client()
 
 def create_prompt(topic: str, level: str) -> str:
     """Build a system-style prompt instructing the model how to teach a topic.
@@ -88,6 +97,48 @@ def explain_concept(client: 'genai.Client', prompt: str) -> str:
     except Exception as e:
         return f"An error occurred while calling the GenAI API: {e}"
 
+async def explain_concept_async(client: 'genai.Client', prompt: str) -> str:
+    """Async version of `explain_concept`, using the SDK's async client (`client.aio`).
+
+    Same request and error message as `explain_concept`, without blocking
+    the event loop; fan out many calls with `genai_common.gather_bounded`.
+
+    Args:
+        client: Authenticated GenAI client.
+        prompt: Prompt produced by `create_prompt` describing task and format.
+
+    Returns:
+        The model's textual response, or an error message on failure.
+    """
+    try:
+        response = await client.aio.models.generate_content(
+            model=TARGET_MODEL,
+            contents=prompt
+        )
+        return response.text
+    except Exception as e:
+        return f"An error occurred while calling the GenAI API: {e}"
+
+def explain_concept_stream(client: 'genai.Client', prompt: str) -> tuple[str, Optional[StreamResult]]:
+    """Stream an explanation to the console as the model generates it.
+
+    Same request as `explain_concept`, but text is printed chunk by chunk so
+    the learner sees the answer start immediately.
+
+    Args:
+        client: Authenticated GenAI client.
+        prompt: Prompt produced by `create_prompt` describing task and format.
+
+    Returns:
+        The full text and its timing (`StreamResult`), or the same error
+        message as `explain_concept` and None on failure.
+    """
+    try:
+        result = stream_generate(client, model=TARGET_MODEL, contents=prompt)
+        return result.text, result
+    except Exception as e:
+        return f"An error occurred while calling the GenAI API: {e}", None
+
 def get_user_input() -> tuple[str, str]:
     """Prompt the user for a topic and desired learning level.
 
@@ -97,7 +148,15 @@ def get_user_input() -> tuple[str, str]:
     level = input("What is your learning level? (Beginner/Intermediate/Advanced) ")
     return topic, level
 
+def parse_args(argv: Optional[list[str]] = None) -> 'argparse.Namespace':
+    """Parse command-line options (`--stream` prints the answer as it arrives)."""
+    parser = argparse.ArgumentParser(description="Learn a concept with Google Gemini.")
+    parser.add_argument("--stream", action="store_true",
+                        help="Print the explanation as it is generated and report time-to-first-token.")
+    return parser.parse_args(argv)
+
 def main() -> None:
+    args = parse_args()
     print("--- Welcome to your AI Study Buddy! ---")
     print("Please enter the details of the topic you want to learn about.")
     print("-" * 60)
@@ -109,6 +168,16 @@ def main() -> None:
 
     client = create_genai_client()
     print(f"\nAnalyzing '{topic}'... Please wait.\n")
+    if args.stream:
+        print("-" * 60)
+        explanation, stream_result = explain_concept_stream(client, user_prompt)
+        if stream_result is None:
+            print(explanation)
+        else:
+            print(f"\n\n{stream_result.timing_summary()}")
+        print("-" * 60)
+        return
+
     explanation = explain_concept(client, user_prompt)
 
     print("-" * 60)
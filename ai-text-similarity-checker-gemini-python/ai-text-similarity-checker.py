@@ -10,6 +10,19 @@ The application:
 2. Stores the embeddings in a ChromaDB collection
 3. Accepts user input and finds the top 3 most similar sentences
 
+Embeddings are cached on disk (see `EmbeddingCache`), so later runs only send
+new or changed sentences to the embedding API. With `--db-path` the ChromaDB
+index is persisted as well and kept in sync incrementally (see `sync_collection`),
+so a restart opens the existing index instead of rebuilding it.
+
+Usage:
+    python ai-text-similarity-checker.py                          # in-memory index
+    python ai-text-similarity-checker.py --db-path .chroma        # persistent index
+    python ai-text-similarity-checker.py --db-path .chroma reindex
+    python ai-text-similarity-checker.py --backend numpy          # exact NumPy search
+    python ai-text-similarity-checker.py batch --queries queries.txt --output similar.jsonl --top-k 5
+    python ai-text-similarity-checker.py benchmark --sizes 10000,100000
+
 Requirements:
     - GEMINI_API_KEY environment variable must be set (via .env file)
     - chromadb, python-dotenv, and google-genai packages installed
@@ -18,16 +31,42 @@ Author: Generated with AI assistance
 Date: February 2026
 """
 
+import argparse
+import hashlib
+import json
 import os
+import sys
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, Optional
 import chromadb
+import numpy as np
 from dotenv import load_dotenv
 from google import genai
 
+# Make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from genai_common import RateLimiter, backoff_delay, get_genai_client, is_retryable_error, retry_attempt
+
 # Load environment variables from .env file
 load_dotenv()
 
 # Constants
 TARGET_MODEL = "gemini-embedding-001"  # Gemini embedding model for semantic similarity
+TASK_TYPE = "SEMANTIC_SIMILARITY"  # Embedding task type sent with every request
+DEFAULT_CACHE_DIR = ".embedding_cache"  # On-disk embedding cache, relative to this script
+COLLECTION_NAME = "text_similarity_collection"  # ChromaDB collection holding the corpus
+CHROMA_BATCH_SIZE = 5000  # Max records per ChromaDB get/upsert/delete call
+
+# Bulk embedding pipeline settings (adjust the rate limits to your quota tier)
+EMBED_BATCH_MAX_ITEMS = 100  # Max texts per embed_content request
+EMBED_BATCH_MAX_TOKENS = 20000  # Max estimated tokens per embed_content request
+DEFAULT_EMBED_WORKERS = 4  # Concurrent embed_content requests
+DEFAULT_REQUESTS_PER_MINUTE = 1500  # Embedding requests allowed per minute
+DEFAULT_TOKENS_PER_MINUTE = 1_000_000  # Estimated embedding tokens allowed per minute
+EMBED_MAX_RETRIES = 5  # Retries per failed batch before it is skipped
+EMBED_RETRY_BASE_DELAY = 1.0  # Seconds before the first retry; doubles on each attempt
 SENTENCES = [
     "The cat sat on the mat.",
     "A quick brown fox jumps over the lazy dog.",
@@ -40,67 +79,323 @@ def create_genai_client() -> 'genai.Client':
     """Initialize and return an authenticated GenAI client.
 
     The client uses the `GEMINI_API_KEY` from the environment (or `.env`).
+    It is shared process-wide (see `genai_common`), so concurrent embedding
+    batches reuse the same connection pool.
 
     Returns:
         genai.Client: Authenticated GenAI client instance.
     """
-    return genai.Client()
+    return get_genai_client()
 
-def create_chromadb_client() -> 'chromadb.Client':
+def create_chromadb_client(path: Optional[str] = None) -> 'chromadb.Client':
     """Initialize and return a ChromaDB client.
 
+    Args:
+        path: Directory for a persistent database. When omitted, an in-memory
+            (ephemeral) client is returned and the index is lost on exit.
+
     Returns:
         chromadb.Client: An instance of the ChromaDB client.
     """
+    if path:
+        return chromadb.PersistentClient(path=path)
     return chromadb.Client()
 
 def create_collection(chromadb_client: 'chromadb.Client', name: str) -> 'chromadb.Collection':
-    """Create and return a ChromaDB collection with the specified name.
+    """Open the ChromaDB collection with the specified name, creating it if needed.
 
     Args:
         chromadb_client: An instance of the ChromaDB client.
-        name: The name of the collection to create.
+        name: The name of the collection to open or create.
 
     Returns:
-        chromadb.Collection: The created collection instance.
+        chromadb.Collection: The collection instance.
     """
-    return chromadb_client.create_collection(name=name, configuration={"hnsw": {"space": "cosine"}})
+    return chromadb_client.get_or_create_collection(name=name, configuration={"hnsw": {"space": "cosine"}})
 
-def add_documents_to_collection(collection: 'chromadb.Collection', documents: list[str], embeddings: list[list[float]], ids: list[str]) -> None:
-    """Add documents along with their embeddings and IDs to the specified ChromaDB collection.
+def add_documents_to_collection(collection: 'chromadb.Collection', documents: list[str], embeddings: list[list[float]], ids: list[str],
+                                metadatas: Optional[list[dict]] = None) -> None:
+    """Add or update documents along with their embeddings and IDs in the specified ChromaDB collection.
+
+    Records are upserted, so re-adding an existing ID replaces its document
+    and embedding instead of failing.
 
     Args:
         collection: The ChromaDB collection to which the documents will be added.
         documents: A list of text documents to be stored in the collection.
         embeddings: A list of lists of floats representing the embeddings for each document.
         ids: A list of unique identifiers corresponding to each document.
+        metadatas: Optional metadata dictionary for each document.
 
     Returns:
         None
     """
-    collection.add(documents=documents, embeddings=embeddings, ids=ids)
+    for start in range(0, len(ids), CHROMA_BATCH_SIZE):
+        end = start + CHROMA_BATCH_SIZE
+        collection.upsert(
+            documents=documents[start:end],
+            embeddings=embeddings[start:end],
+            ids=ids[start:end],
+            metadatas=metadatas[start:end] if metadatas else None,
+        )
+
+def create_ids(documents: Optional[list[str]] = None, id_prefix: str = "id"):
+    """Generate content-derived IDs for each document (by default, each sentence in SENTENCES).
+
+    Each ID is the prefix plus the first 16 hex digits of the document's
+    sha256, e.g. 'id3f0a9c...'. Repeated documents get an occurrence suffix
+    ('-1', '-2', ...), so IDs stay unique. Because an ID only depends on the
+    text (and not on its position), inserting or removing a document leaves
+    the IDs of all other documents unchanged, and `sync_collection` only
+    upserts what changed and deletes what was removed.
+
+    Args:
+        documents: Documents to create IDs for; defaults to SENTENCES.
+        id_prefix: Prefix of the generated IDs.
 
-def create_ids():
-    """Generate unique IDs for each sentence in the SENTENCES list.
-    
-    Creates sequential IDs in the format 'id0', 'id1', etc. to uniquely
-    identify each document in the ChromaDB collection.
-    
     Returns:
         list[str]: A list of unique string identifiers.
     """
-    return [f"id{i}" for i in range(len(SENTENCES))]
-    
-def get_embeddings(client: 'genai.Client', text: list[str]):
+    occurrences: dict[str, int] = {}
+    return [document_id(d, occurrences, id_prefix) for d in (SENTENCES if documents is None else documents)]
+
+def document_id(document: str, occurrences: dict[str, int], id_prefix: str = "id") -> str:
+    """Return the content-derived ID of one document (see `create_ids`).
+
+    Args:
+        document: The document text.
+        occurrences: How often each ID was handed out so far; updated in place.
+        id_prefix: Prefix of the ID.
+
+    Returns:
+        str: The document's ID.
+    """
+    base = id_prefix + content_hash(document)[:16]
+    seen = occurrences.get(base, 0)
+    occurrences[base] = seen + 1
+    return f"{base}-{seen}" if seen else base
+
+def content_hash(text: str) -> str:
+    """Return the sha256 hex digest of a document, stored as its `content_hash` metadata."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def get_stored_hashes(collection: 'chromadb.Collection') -> dict[str, Optional[str]]:
+    """Return the `content_hash` metadata of every record in the collection, keyed by ID.
+
+    Records are fetched page by page (without documents or embeddings) so
+    this stays cheap for large collections.
+
+    Args:
+        collection: The ChromaDB collection to read.
+
+    Returns:
+        dict[str, Optional[str]]: Stored hash per ID (None if a record has none).
+    """
+    hashes: dict[str, Optional[str]] = {}
+    offset = 0
+    while True:
+        page = collection.get(include=["metadatas"], limit=CHROMA_BATCH_SIZE, offset=offset)
+        for record_id, metadata in zip(page["ids"], page["metadatas"]):
+            hashes[record_id] = (metadata or {}).get("content_hash")
+        if len(page["ids"]) < CHROMA_BATCH_SIZE:
+            return hashes
+        offset += CHROMA_BATCH_SIZE
+
+def sync_collection(collection: 'chromadb.Collection', genai_client: 'genai.Client', records: Iterable[tuple[str, str]],
+                    cache: Optional['EmbeddingCache'] = None, workers: int = DEFAULT_EMBED_WORKERS,
+                    limiter: Optional['RateLimiter'] = None) -> dict[str, int]:
+    """Incrementally bring a collection in line with the given corpus.
+
+    Only documents whose content hash differs from the stored one (or that are
+    not stored yet) are embedded and upserted; records whose IDs are no longer
+    in the corpus are deleted. An up-to-date collection costs one metadata
+    scan and no embedding calls. Changed documents are streamed through
+    `embed_corpus`, so the corpus itself is never held in memory.
+
+    Args:
+        collection: The ChromaDB collection to update.
+        genai_client: Authenticated GenAI client instance.
+        records: The current corpus as (id, document) pairs.
+        cache: Optional embedding cache used for changed documents.
+        workers: Maximum number of concurrent embedding requests.
+        limiter: Optional rate limiter shared by all embedding requests.
+
+    Returns:
+        dict[str, int]: Counts of `upserted`, `failed`, `deleted` and `unchanged` records.
+    """
+    stored = get_stored_hashes(collection)
+    seen: set[str] = set()
+    unchanged = 0
+
+    def changed_records() -> Iterator[tuple[str, str]]:
+        nonlocal unchanged
+        for record_id, document in records:
+            seen.add(record_id)
+            if stored.get(record_id) == content_hash(document):
+                unchanged += 1
+                continue
+            yield record_id, document
+
+    stats = embed_corpus(collection, genai_client, changed_records(), cache=cache, workers=workers, limiter=limiter)
+    removed = list(stored.keys() - seen)
+    for start in range(0, len(removed), CHROMA_BATCH_SIZE):
+        collection.delete(ids=removed[start:start + CHROMA_BATCH_SIZE])
+
+    return {"upserted": stats["embedded"], "failed": stats["failed"], "deleted": len(removed), "unchanged": unchanged}
+
+def reindex_collection(chromadb_client: 'chromadb.Client', genai_client: 'genai.Client', name: str, records: Iterable[tuple[str, str]],
+                       cache: Optional['EmbeddingCache'] = None, workers: int = DEFAULT_EMBED_WORKERS,
+                       limiter: Optional['RateLimiter'] = None) -> 'chromadb.Collection':
+    """Drop the collection and rebuild it from scratch.
+
+    Args:
+        chromadb_client: An instance of the ChromaDB client.
+        genai_client: Authenticated GenAI client instance.
+        name: The name of the collection to rebuild.
+        records: The corpus to index as (id, document) pairs.
+        cache: Optional embedding cache (cached vectors are still reused).
+        workers: Maximum number of concurrent embedding requests.
+        limiter: Optional rate limiter shared by all embedding requests.
+
+    Returns:
+        chromadb.Collection: The rebuilt collection.
+    """
+    if name in [c if isinstance(c, str) else c.name for c in chromadb_client.list_collections()]:
+        chromadb_client.delete_collection(name)
+    collection = create_collection(chromadb_client, name)
+    sync_collection(collection, genai_client, records, cache, workers, limiter)
+    return collection
+
+class EmbeddingCache:
+    """On-disk embedding cache keyed by (model, task_type, sha256 of the text).
+
+    Each (model, task_type) pair gets its own set of files in `cache_dir`:
+    - `<name>.f32`: raw float32 vectors, one row per text, memory-mapped on open
+    - `<name>.keys`: the 32-byte sha256 digest of each row's text, in row order
+    - `<name>.json`: metadata (model, task type and vector dimension)
+
+    Both data files are append-only, so opening the cache costs one read of the
+    key file plus a memory map; vectors are only paged in when they are used.
+    A write interrupted half-way can leave one file longer than the other; on
+    open both are truncated back to the rows they have in common, so later
+    appends stay aligned. The cache is meant for use by one process at a time.
+    """
+
+    DIGEST_SIZE = 32
+
+    def __init__(self, cache_dir: str, model: str = TARGET_MODEL, task_type: str = TASK_TYPE):
+        """Open (or prepare to create) the cache for one model and task type.
+
+        Args:
+            cache_dir: Directory holding the cache files. Relative paths are
+                resolved against this script's directory.
+            model: Embedding model name.
+            task_type: Embedding task type.
+        """
+        if not os.path.isabs(cache_dir):
+            cache_dir = os.path.join(os.path.dirname(__file__), cache_dir)
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{model}__{task_type}")
+        self.model = model
+        self.task_type = task_type
+        self.vectors_path = os.path.join(cache_dir, f"{name}.f32")
+        self.keys_path = os.path.join(cache_dir, f"{name}.keys")
+        self.meta_path = os.path.join(cache_dir, f"{name}.json")
+        self.dim: Optional[int] = None
+        self._index: dict[bytes, int] = {}
+        self._vectors: Optional[np.ndarray] = None
+        self._load()
+
+    def _load(self) -> None:
+        """Read the key index, repair a torn write and memory-map the vector file."""
+        if not os.path.exists(self.meta_path):
+            return
+        with open(self.meta_path, "r", encoding="utf-8") as meta_file:
+            self.dim = json.load(meta_file)["dim"]
+        for path in (self.keys_path, self.vectors_path):
+            open(path, "ab").close()
+        with open(self.keys_path, "rb") as keys_file:
+            raw_keys = keys_file.read()
+        size = self.DIGEST_SIZE
+        row_bytes = 4 * self.dim
+        rows = min(len(raw_keys) // size, os.path.getsize(self.vectors_path) // row_bytes)
+        # Drop the tail of whichever file got ahead, so the next append starts at row `rows` in both
+        for path, length in ((self.keys_path, rows * size), (self.vectors_path, rows * row_bytes)):
+            if os.path.getsize(path) != length:
+                os.truncate(path, length)
+        self._index = {raw_keys[i * size:(i + 1) * size]: i for i in range(rows)}
+        self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim)) if rows else None
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @staticmethod
+    def digest(text: str) -> bytes:
+        """Return the sha256 digest used as the cache key for `text`."""
+        return hashlib.sha256(text.encode("utf-8")).digest()
+
+    def lookup(self, texts: list[str]) -> list[Optional[np.ndarray]]:
+        """Return the cached vector for each text, or None where it is not cached.
+
+        Args:
+            texts: Texts to look up.
+
+        Returns:
+            list[Optional[np.ndarray]]: One float32 vector (or None) per text.
+        """
+        rows = [self._index.get(self.digest(t)) for t in texts]
+        return [None if row is None else self._vectors[row] for row in rows]
+
+    def add(self, texts: list[str], embeddings: list[list[float]]) -> None:
+        """Append embeddings for texts that are not cached yet.
+
+        Args:
+            texts: Texts that were embedded.
+            embeddings: One vector per text, in the same order.
+        """
+        new_keys: dict[bytes, None] = {}
+        new_rows: list[list[float]] = []
+        for text, embedding in zip(texts, embeddings):
+            key = self.digest(text)
+            if key in self._index or key in new_keys:
+                continue
+            new_keys[key] = None
+            new_rows.append(embedding)
+        if not new_keys:
+            return
+
+        matrix = np.asarray(new_rows, dtype=np.float32)
+        if self.dim is None:
+            os.makedirs(os.path.dirname(self.meta_path), exist_ok=True)
+            self.dim = int(matrix.shape[1])
+            with open(self.meta_path, "w", encoding="utf-8") as meta_file:
+                json.dump({"model": self.model, "task_type": self.task_type, "dim": self.dim}, meta_file)
+        if matrix.shape[1] != self.dim:
+            raise ValueError(f"Embedding dimension {matrix.shape[1]} does not match cache dimension {self.dim}")
+
+        with open(self.vectors_path, "ab") as vectors_file:
+            vectors_file.write(matrix.tobytes())
+        with open(self.keys_path, "ab") as keys_file:
+            keys_file.write(b"".join(new_keys))
+
+        # Extend the in-memory index and re-map the grown vector file
+        first_row = len(self._index)
+        self._index.update((key, first_row + i) for i, key in enumerate(new_keys))
+        self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(len(self._index), self.dim))
+
+def get_embeddings(client: 'genai.Client', text: list[str], cache: Optional[EmbeddingCache] = None):
     """Generate and return embeddings for the given text using the GenAI API.
     
     Uses the Gemini embedding model to convert text into numerical vector
     representations that capture semantic meaning. These embeddings can be
     used for similarity comparison.
 
+    When a cache is given, cached vectors are reused and only texts missing
+    from the cache are sent to the API; their embeddings are then stored.
+
     Args:
         client (genai.Client): Authenticated GenAI client instance.
         text (list[str]): List of input text strings to be converted into embeddings.
+        cache (Optional[EmbeddingCache]): Embedding cache to read from and write to.
         
     Returns:
         list[list[float]]: A list of embedding vectors, where each vector is a list
@@ -109,18 +404,417 @@ def get_embeddings(client: 'genai.Client', text: list[str]):
     Raises:
         Prints error message if embedding generation fails.
     """
+    if cache is not None:
+        cached = cache.lookup(text)
+        missing = list(dict.fromkeys(t for t, vector in zip(text, cached) if vector is None))
+        if missing:
+            fresh = get_embeddings(client, missing)
+            if not fresh:
+                return []
+            cache.add(missing, fresh)
+            cached = cache.lookup(text)
+        return [vector.tolist() for vector in cached]
+
     try:
         response = client.models.embed_content(
             model=TARGET_MODEL,
             contents=text,
-            config=genai.types.EmbedContentConfig(task_type="SEMANTIC_SIMILARITY")
+            config=genai.types.EmbedContentConfig(task_type=TASK_TYPE)
         )
-        return [e.values for e in response.embeddings]
+        embeddings = [e.values for e in response.embeddings or []]
+        # A short response would leave texts without a vector (and the cache half-filled)
+        if len(embeddings) != len(text):
+            raise ValueError(f"Expected {len(text)} embeddings, got {len(embeddings)}")
+        return embeddings
     except Exception as e:
         print(f"An error occurred while generating embeddings: {e}")
         return []
 
-def find_similar_sentences(collection: 'chromadb.Collection', query_embedding: list[float], n_results: int = 2) -> list[str]:
+async def get_embeddings_async(client: 'genai.Client', text: list[str], cache: Optional[EmbeddingCache] = None):
+    """Async version of `get_embeddings`, using the SDK's async client (`client.aio`).
+
+    Same request, cache handling and error behavior as `get_embeddings`,
+    without blocking the event loop; fan out many calls with
+    `genai_common.gather_bounded`.
+
+    Args:
+        client (genai.Client): Authenticated GenAI client instance.
+        text (list[str]): List of input text strings to be converted into embeddings.
+        cache (Optional[EmbeddingCache]): Embedding cache to read from and write to.
+
+    Returns:
+        list[list[float]]: A list of embedding vectors, or an empty list if an error occurs.
+    """
+    if cache is not None:
+        cached = cache.lookup(text)
+        missing = list(dict.fromkeys(t for t, vector in zip(text, cached) if vector is None))
+        if missing:
+            fresh = await get_embeddings_async(client, missing)
+            if not fresh:
+                return []
+            cache.add(missing, fresh)
+            cached = cache.lookup(text)
+        return [vector.tolist() for vector in cached]
+
+    try:
+        response = await client.aio.models.embed_content(
+            model=TARGET_MODEL,
+            contents=text,
+            config=genai.types.EmbedContentConfig(task_type=TASK_TYPE)
+        )
+        embeddings = [e.values for e in response.embeddings or []]
+        # A short response would leave texts without a vector (and the cache half-filled)
+        if len(embeddings) != len(text):
+            raise ValueError(f"Expected {len(text)} embeddings, got {len(embeddings)}")
+        return embeddings
+    except Exception as e:
+        print(f"An error occurred while generating embeddings: {e}")
+        return []
+
+def iter_documents(file_path: str, id_prefix: str = "id") -> Iterator[tuple[str, str]]:
+    """Stream a corpus file as (id, document) pairs, one document per non-empty line.
+
+    IDs follow the `create_ids` scheme (a prefix plus a hash of the text),
+    so editing, inserting or deleting a line leaves the IDs of the other
+    lines as they were. Relative paths are resolved against this script's
+    directory.
+
+    Args:
+        file_path: Path to a UTF-8 text file.
+        id_prefix: Prefix of the generated IDs.
+
+    Yields:
+        tuple[str, str]: The ID and text of each document.
+    """
+    if not os.path.isabs(file_path):
+        file_path = os.path.join(os.path.dirname(__file__), file_path)
+    occurrences: dict[str, int] = {}
+    with open(file_path, "r", encoding="utf-8") as corpus:
+        for line in corpus:
+            document = line.strip()
+            if document:
+                yield document_id(document, occurrences, id_prefix), document
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of a text (about 4 characters per token)."""
+    return len(text) // 4 + 1
+
+def iter_batches(records: Iterable[tuple[str, str]], max_items: int = EMBED_BATCH_MAX_ITEMS,
+                 max_tokens: int = EMBED_BATCH_MAX_TOKENS) -> Iterator[list[tuple[str, str]]]:
+    """Pack (id, document) pairs into batches bounded by item count and estimated tokens.
+
+    A single document larger than `max_tokens` still gets a batch of its own.
+
+    Args:
+        records: (id, document) pairs to pack.
+        max_items: Maximum documents per batch.
+        max_tokens: Maximum estimated tokens per batch.
+
+    Yields:
+        list[tuple[str, str]]: The next batch.
+    """
+    batch: list[tuple[str, str]] = []
+    batch_tokens = 0
+    for record in records:
+        tokens = estimate_tokens(record[1])
+        if batch and (len(batch) >= max_items or batch_tokens + tokens > max_tokens):
+            yield batch
+            batch, batch_tokens = [], 0
+        batch.append(record)
+        batch_tokens += tokens
+    if batch:
+        yield batch
+
+def embed_batch(client: 'genai.Client', texts: list[str]) -> list[list[float]]:
+    """Embed one batch of texts, raising on any failure.
+
+    Unlike `get_embeddings`, errors propagate so that callers can retry.
+
+    Args:
+        client: Authenticated GenAI client instance.
+        texts: Texts to embed in a single request.
+
+    Returns:
+        list[list[float]]: One embedding per text.
+
+    Raises:
+        ValueError: If the API returns a different number of embeddings.
+    """
+    response = client.models.embed_content(
+        model=TARGET_MODEL,
+        contents=texts,
+        config=genai.types.EmbedContentConfig(task_type=TASK_TYPE)
+    )
+    embeddings = [e.values for e in response.embeddings]
+    if len(embeddings) != len(texts):
+        raise ValueError(f"Expected {len(texts)} embeddings, got {len(embeddings)}")
+    return embeddings
+
+def embed_batch_with_retry(client: 'genai.Client', texts: list[str], limiter: Optional[RateLimiter] = None,
+                           max_retries: int = EMBED_MAX_RETRIES) -> list[list[float]]:
+    """Embed one batch under the rate limiter, retrying transient failures with exponential backoff.
+
+    Only rate limits (429), server errors (5xx), timeouts and transport errors
+    are retried. Other errors, such as an invalid request (400) or a bad API
+    key (401/403), fail the same way on every attempt and are raised at once.
+
+    Args:
+        client: Authenticated GenAI client instance.
+        texts: Texts to embed in a single request.
+        limiter: Optional rate limiter to acquire before every attempt.
+        max_retries: Retries after the first attempt before giving up.
+
+    Returns:
+        list[list[float]]: One embedding per text.
+
+    Raises:
+        Exception: A non-retryable error, or the last error once all retries are exhausted.
+    """
+    tokens = sum(estimate_tokens(t) for t in texts)
+    for attempt in range(max_retries + 1):
+        if limiter is not None:
+            limiter.acquire(tokens)
+        try:
+            with retry_attempt(attempt):
+                return embed_batch(client, texts)
+        except Exception as e:
+            if attempt == max_retries or not is_retryable_error(e):
+                raise
+            time.sleep(backoff_delay(attempt, EMBED_RETRY_BASE_DELAY))
+    raise AssertionError("unreachable")
+
+def iter_embedded_batches(client: 'genai.Client', records: Iterable[tuple[str, str]], cache: Optional[EmbeddingCache] = None,
+                          workers: int = DEFAULT_EMBED_WORKERS, limiter: Optional[RateLimiter] = None,
+                          max_items: int = EMBED_BATCH_MAX_ITEMS, max_tokens: int = EMBED_BATCH_MAX_TOKENS,
+                          max_retries: int = EMBED_MAX_RETRIES) -> Iterator[tuple[list[tuple[str, str]], Optional[list[list[float]]], Optional[Exception]]]:
+    """Embed (id, document) pairs in bounded, concurrent, rate-limited batches.
+
+    Records are packed into batches by `iter_batches` and at most `workers`
+    batches are in flight at once, so memory stays flat whatever the input
+    size. Cached documents skip the API; fresh embeddings are added to the
+    cache. Batches are yielded in completion order.
+
+    Args:
+        client: Authenticated GenAI client instance.
+        records: (id, document) pairs, e.g. from `iter_documents`.
+        cache: Optional embedding cache.
+        workers: Maximum number of concurrent embedding requests.
+        limiter: Optional rate limiter shared by all requests.
+        max_items: Maximum documents per batch.
+        max_tokens: Maximum estimated tokens per batch.
+        max_retries: Retries per batch before it is given up.
+
+    Yields:
+        tuple: The batch, its embeddings (None on failure) and the error that
+        made it fail after any retries (None on success).
+    """
+    def finish(future: Future):
+        batch, vectors, missing = pending.pop(future)
+        try:
+            fresh = future.result()
+        except Exception as e:
+            return batch, None, e
+        if cache is not None:
+            cache.add([batch[i][1] for i in missing], fresh)
+        for i, vector in zip(missing, fresh):
+            vectors[i] = vector
+        return batch, vectors, None
+
+    pending: dict[Future, tuple[list[tuple[str, str]], list, list[int]]] = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch in iter_batches(records, max_items, max_tokens):
+            texts = [document for _, document in batch]
+            vectors = [None if v is None else v.tolist() for v in cache.lookup(texts)] if cache is not None else [None] * len(batch)
+            missing = [i for i, vector in enumerate(vectors) if vector is None]
+            if not missing:
+                yield batch, vectors, None
+                continue
+            if len(pending) >= workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield finish(future)
+            future = executor.submit(embed_batch_with_retry, client, [texts[i] for i in missing], limiter, max_retries)
+            pending[future] = (batch, vectors, missing)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield finish(future)
+
+def embed_corpus(collection: 'chromadb.Collection', client: 'genai.Client', records: Iterable[tuple[str, str]],
+                 cache: Optional[EmbeddingCache] = None, workers: int = DEFAULT_EMBED_WORKERS,
+                 limiter: Optional[RateLimiter] = None, max_items: int = EMBED_BATCH_MAX_ITEMS,
+                 max_tokens: int = EMBED_BATCH_MAX_TOKENS, max_retries: int = EMBED_MAX_RETRIES) -> dict[str, int]:
+    """Stream a corpus through batched, concurrent, rate-limited embedding into a collection.
+
+    Batches come from `iter_embedded_batches`, and each one is upserted (with
+    its `content_hash` metadata) as soon as it completes. A batch that still
+    fails (after any retries) is reported and skipped; the rest of the corpus
+    is still indexed.
+
+    Args:
+        collection: The ChromaDB collection to upsert into.
+        client: Authenticated GenAI client instance.
+        records: (id, document) pairs, e.g. from `iter_documents`.
+        cache: Optional embedding cache; cached documents skip the API.
+        workers: Maximum number of concurrent embedding requests.
+        limiter: Optional rate limiter shared by all requests.
+        max_items: Maximum documents per batch.
+        max_tokens: Maximum estimated tokens per batch.
+        max_retries: Retries per batch before it is given up.
+
+    Returns:
+        dict[str, int]: Counts of `embedded` and `failed` documents and `batches` processed.
+    """
+    stats = {"embedded": 0, "failed": 0, "batches": 0}
+    for batch, embeddings, error in iter_embedded_batches(client, records, cache, workers, limiter,
+                                                          max_items, max_tokens, max_retries):
+        stats["batches"] += 1
+        if error is not None:
+            print(f"Embedding batch starting at '{batch[0][0]}' failed: {error}")
+            stats["failed"] += len(batch)
+            continue
+        documents = [document for _, document in batch]
+        add_documents_to_collection(collection, documents, embeddings, [record_id for record_id, _ in batch],
+                                    [{"content_hash": content_hash(doc)} for doc in documents])
+        stats["embedded"] += len(batch)
+    return stats
+
+class ChromaSearchBackend:
+    """Search backend that delegates to a ChromaDB collection's HNSW index."""
+
+    def __init__(self, collection: 'chromadb.Collection'):
+        """Wrap a ChromaDB collection.
+
+        Args:
+            collection: The ChromaDB collection to search.
+        """
+        self.collection = collection
+
+    def search(self, query_embeddings: list[list[float]], n_results: int) -> dict:
+        """Return the nearest documents for each query embedding.
+
+        Args:
+            query_embeddings: One or more query vectors.
+            n_results: Number of neighbours per query.
+
+        Returns:
+            dict: Chroma-style results with `ids`, `documents` and `distances`,
+            each holding one list per query.
+        """
+        return self.collection.query(query_embeddings=query_embeddings, n_results=n_results,
+                                     include=["documents", "distances"])
+
+class NumpySearchBackend:
+    """Exact brute-force cosine search over an in-memory float32 matrix.
+
+    Vectors are L2-normalized once, so scoring a block of queries is a single
+    matrix multiply, and the top-k is selected with `argpartition` before
+    only those k candidates are sorted. Results use the same shape and
+    cosine distance (1 - similarity) as ChromaDB, so the two backends are
+    interchangeable.
+    """
+
+    MAX_SCORE_CELLS = 16_000_000  # Upper bound on queries x corpus scores held at once
+
+    def __init__(self, ids: list[str], documents: list[str], embeddings):
+        """Build the normalized corpus matrix.
+
+        Args:
+            ids: One ID per document.
+            documents: The corpus documents.
+            embeddings: One vector per document (list of lists or 2-D array).
+        """
+        self.ids = list(ids)
+        self.documents = list(documents)
+        self.matrix = self._normalize(np.asarray(embeddings, dtype=np.float32))
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.atleast_2d(vectors)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    @classmethod
+    def from_collection(cls, collection: 'chromadb.Collection') -> 'NumpySearchBackend':
+        """Load every record of a ChromaDB collection into a NumPy backend.
+
+        Args:
+            collection: The ChromaDB collection to copy.
+
+        Returns:
+            NumpySearchBackend: A backend over the same documents and embeddings.
+        """
+        ids: list[str] = []
+        documents: list[str] = []
+        blocks: list[np.ndarray] = []
+        offset = 0
+        while True:
+            page = collection.get(include=["documents", "embeddings"], limit=CHROMA_BATCH_SIZE, offset=offset)
+            ids.extend(page["ids"])
+            documents.extend(page["documents"])
+            if len(page["ids"]):
+                blocks.append(np.asarray(page["embeddings"], dtype=np.float32))
+            if len(page["ids"]) < CHROMA_BATCH_SIZE:
+                break
+            offset += CHROMA_BATCH_SIZE
+        return cls(ids, documents, np.concatenate(blocks) if blocks else np.zeros((0, 0), dtype=np.float32))
+
+    def search(self, query_embeddings: list[list[float]], n_results: int) -> dict:
+        """Return the exact nearest documents for each query embedding.
+
+        Queries are scored in blocks so the score matrix stays below
+        `MAX_SCORE_CELLS` entries however many queries are passed.
+
+        Args:
+            query_embeddings: One or more query vectors.
+            n_results: Number of neighbours per query.
+
+        Returns:
+            dict: Chroma-style results with `ids`, `documents` and `distances`,
+            each holding one list per query.
+        """
+        queries = self._normalize(np.asarray(query_embeddings, dtype=np.float32))
+        results: dict = {"ids": [], "documents": [], "distances": []}
+        corpus_size = len(self.ids)
+        k = min(n_results, corpus_size)
+        if k == 0:
+            for key in results:
+                results[key] = [[] for _ in range(len(queries))]
+            return results
+
+        block_size = max(1, self.MAX_SCORE_CELLS // corpus_size)
+        for start in range(0, len(queries), block_size):
+            scores = queries[start:start + block_size] @ self.matrix.T
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+            for rows, row_scores in zip(top, top_scores):
+                results["ids"].append([self.ids[i] for i in rows])
+                results["documents"].append([self.documents[i] for i in rows])
+                results["distances"].append((1.0 - row_scores).tolist())
+        return results
+
+def create_search_backend(name: str, collection: 'chromadb.Collection'):
+    """Create the named search backend over a collection.
+
+    Args:
+        name: 'chroma' for the collection's HNSW index, 'numpy' for exact
+            brute-force search over a copy of its embeddings.
+        collection: The ChromaDB collection holding the corpus.
+
+    Returns:
+        ChromaSearchBackend | NumpySearchBackend: The search backend.
+    """
+    if name == "numpy":
+        return NumpySearchBackend.from_collection(collection)
+    if name == "chroma":
+        return ChromaSearchBackend(collection)
+    raise ValueError(f"Unknown search backend: {name}")
+
+def find_similar_sentences(collection, query_embedding: list[float], n_results: int = 2) -> list[str]:
     """Find and return the most similar sentences from the ChromaDB collection based on the query embedding.
     
     This function performs a similarity search using the provided query embedding against the
@@ -128,16 +822,177 @@ def find_similar_sentences(collection: 'chromadb.Collection', query_embedding: l
     sentences based on cosine similarity.
 
     Args:
-        collection (chromadb.Collection): The ChromaDB collection to search within.
+        collection: The ChromaDB collection to search within, or any search
+            backend (`ChromaSearchBackend`, `NumpySearchBackend`).
         query_embedding (list[float]): The embedding vector for the user's query sentence.
         n_results (int): The number of top similar sentences to retrieve (default is 3).
         
     Returns:
         list[str]: A list of the most similar sentences retrieved from the collection.
     """
-    results = collection.query(query_embeddings=query_embedding, n_results=n_results)
+    backend = collection if isinstance(collection, (ChromaSearchBackend, NumpySearchBackend)) else ChromaSearchBackend(collection)
+    results = backend.search(query_embedding, n_results)
     return results['documents'][0]
 
+def run_batch_queries(genai_client: 'genai.Client', backend, queries_path: str, output_path: str, top_k: int = 2,
+                      cache: Optional[EmbeddingCache] = None, workers: int = DEFAULT_EMBED_WORKERS,
+                      limiter: Optional[RateLimiter] = None) -> dict[str, float]:
+    """Answer a file of queries non-interactively and write the top-k matches as JSONL.
+
+    Queries (one per line) are embedded in large batches through
+    `iter_embedded_batches`, and every embedded batch is searched with a
+    single backend call carrying all of its query embeddings. One JSON line
+    per query holds its top-k ids, documents and distances; queries whose
+    batch could not be embedded get an `error` field instead.
+
+    Args:
+        genai_client: Authenticated GenAI client instance.
+        backend: Search backend (or ChromaDB collection) to query.
+        queries_path: Text file with one query per line.
+        output_path: Destination JSONL file.
+        top_k: Matches returned per query.
+        cache: Optional embedding cache for the queries.
+        workers: Maximum number of concurrent embedding requests.
+        limiter: Optional rate limiter shared by all embedding requests.
+
+    Returns:
+        dict[str, float]: Counts of `queries` answered and `failed`, total `seconds`
+        and throughput in `queries_per_second`.
+    """
+    if not isinstance(backend, (ChromaSearchBackend, NumpySearchBackend)):
+        backend = ChromaSearchBackend(backend)
+    stats = {"queries": 0, "failed": 0}
+    started = time.perf_counter()
+    with open(output_path, "w", encoding="utf-8") as output:
+        records = iter_documents(os.path.abspath(queries_path), id_prefix="q")
+        for batch, embeddings, error in iter_embedded_batches(genai_client, records, cache, workers, limiter):
+            if error is not None:
+                for query_id, query in batch:
+                    output.write(json.dumps({"query_id": query_id, "query": query, "error": str(error)}, ensure_ascii=False) + "\n")
+                stats["failed"] += len(batch)
+                continue
+            results = backend.search(embeddings, top_k)
+            for i, (query_id, query) in enumerate(batch):
+                output.write(json.dumps({
+                    "query_id": query_id,
+                    "query": query,
+                    "ids": results["ids"][i],
+                    "documents": results["documents"][i],
+                    "distances": [float(d) for d in results["distances"][i]],
+                }, ensure_ascii=False) + "\n")
+            stats["queries"] += len(batch)
+    elapsed = time.perf_counter() - started
+    stats["seconds"] = elapsed
+    stats["queries_per_second"] = stats["queries"] / elapsed if elapsed > 0 else 0.0
+    return stats
+
+def run_search_benchmark(sizes: list[int], dim: int = 256, n_queries: int = 100, top_k: int = 10, seed: int = 0) -> list[dict]:
+    """Compare recall and latency of the Chroma and NumPy backends on random vectors.
+
+    For each corpus size a random float32 corpus is indexed by both backends.
+    The exact NumPy results serve as ground truth for Chroma's recall@k.
+    No API calls are made.
+
+    Args:
+        sizes: Corpus sizes to test, e.g. [10_000, 100_000, 1_000_000].
+        dim: Vector dimension.
+        n_queries: Number of random queries per size.
+        top_k: Neighbours retrieved per query.
+        seed: Seed for the random vectors.
+
+    Returns:
+        list[dict]: One row of timings (seconds) and recall per size.
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for size in sizes:
+        corpus = rng.standard_normal((size, dim), dtype=np.float32)
+        queries = rng.standard_normal((n_queries, dim), dtype=np.float32)
+        ids = [str(i) for i in range(size)]
+        documents = [""] * size
+
+        started = time.perf_counter()
+        numpy_backend = NumpySearchBackend(ids, documents, corpus)
+        numpy_build = time.perf_counter() - started
+
+        collection = chromadb.Client().get_or_create_collection(
+            name=f"benchmark_{size}", configuration={"hnsw": {"space": "cosine"}})
+        started = time.perf_counter()
+        for start in range(0, size, CHROMA_BATCH_SIZE):
+            collection.add(ids=ids[start:start + CHROMA_BATCH_SIZE], embeddings=corpus[start:start + CHROMA_BATCH_SIZE])
+        chroma_build = time.perf_counter() - started
+
+        started = time.perf_counter()
+        exact = numpy_backend.search(queries, top_k)
+        numpy_batched = time.perf_counter() - started
+        started = time.perf_counter()
+        for query in queries:
+            numpy_backend.search(query, top_k)
+        numpy_single = (time.perf_counter() - started) / n_queries
+
+        started = time.perf_counter()
+        approximate = ChromaSearchBackend(collection).search(queries, top_k)
+        chroma_batched = time.perf_counter() - started
+        started = time.perf_counter()
+        for query in queries:
+            ChromaSearchBackend(collection).search(query.reshape(1, -1), top_k)
+        chroma_single = (time.perf_counter() - started) / n_queries
+
+        hits = sum(len(set(truth) & set(found)) for truth, found in zip(exact["ids"], approximate["ids"]))
+        rows.append({
+            "size": size,
+            "numpy_build_s": numpy_build,
+            "chroma_build_s": chroma_build,
+            "numpy_batched_s": numpy_batched,
+            "chroma_batched_s": chroma_batched,
+            "numpy_query_ms": numpy_single * 1000,
+            "chroma_query_ms": chroma_single * 1000,
+            "chroma_recall": hits / (n_queries * top_k),
+        })
+        print(f"{size:>10,} | build numpy {numpy_build:7.2f}s chroma {chroma_build:8.2f}s | "
+              f"{n_queries} queries batched numpy {numpy_batched:7.3f}s chroma {chroma_batched:7.3f}s | "
+              f"per query numpy {numpy_single * 1000:7.2f}ms chroma {chroma_single * 1000:7.2f}ms | "
+              f"chroma recall@{top_k} {rows[-1]['chroma_recall']:.3f}")
+    return rows
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Parse command-line options.
+
+    Args:
+        argv: Arguments to parse; defaults to `sys.argv`.
+
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Find similar sentences with Gemini embeddings and ChromaDB.")
+    parser.add_argument("command", nargs="?", default="query", choices=["query", "batch", "reindex", "benchmark"],
+                        help="'query' (default) searches interactively; 'batch' answers a file of queries; "
+                             "'reindex' rebuilds the collection and exits; "
+                             "'benchmark' compares the search backends on random vectors.")
+    parser.add_argument("--db-path",
+                        help="Directory of a persistent ChromaDB database (default: in-memory, rebuilt on every run).")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"Directory of the on-disk embedding cache (default: {DEFAULT_CACHE_DIR}).")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the embedding API.")
+    parser.add_argument("--corpus",
+                        help="Text file with one document per line to index (default: the built-in SENTENCES).")
+    parser.add_argument("--workers", type=int, default=DEFAULT_EMBED_WORKERS,
+                        help=f"Concurrent embedding requests (default: {DEFAULT_EMBED_WORKERS}).")
+    parser.add_argument("--rpm", type=float, default=DEFAULT_REQUESTS_PER_MINUTE,
+                        help=f"Embedding requests per minute (default: {DEFAULT_REQUESTS_PER_MINUTE}).")
+    parser.add_argument("--tpm", type=float, default=DEFAULT_TOKENS_PER_MINUTE,
+                        help=f"Estimated embedding tokens per minute (default: {DEFAULT_TOKENS_PER_MINUTE}).")
+    parser.add_argument("--backend", choices=["chroma", "numpy"], default="chroma",
+                        help="Search backend: ChromaDB's HNSW index or exact NumPy search (default: chroma).")
+    parser.add_argument("--queries", help="Text file with one query per line for the batch command.")
+    parser.add_argument("--output", default="similar.jsonl",
+                        help="JSONL file written by the batch command (default: similar.jsonl).")
+    parser.add_argument("--top-k", type=int, default=2, help="Matches returned per query (default: 2).")
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="Comma-separated corpus sizes for the benchmark command.")
+    parser.add_argument("--dim", type=int, default=256, help="Vector dimension for the benchmark command.")
+    return parser.parse_args(argv)
+
 def main() -> None:
     """Main function to run the AI Text Similarity Checker application.
     
@@ -146,36 +1001,63 @@ def main() -> None:
     2. Sets up ChromaDB and stores the embeddings
     3. Prompts the user for input and finds similar sentences
     4. Displays the top 3 most similar results
+
+    `--backend numpy` searches with exact NumPy cosine similarity instead of
+    ChromaDB's index; the `benchmark` command compares the two backends.
+    With `--db-path` an existing collection is reused and only changed
+    sentences are re-embedded; the `reindex` command rebuilds it and exits.
     
     Returns:
         None
     """
+    args = parse_args()
+    if args.command == "benchmark":
+        print("--- Search backend benchmark (random vectors, no API calls) ---")
+        run_search_benchmark([int(size) for size in args.sizes.split(",")], args.dim)
+        return
+
     print("--- Welcome to AI Text Similarity Checker! ---")
-    print("Generating embeddings for sample sentences...\n")
-    
-    # Initialize GenAI client and generate embeddings for sample sentences
     genai_client = create_genai_client()
-    embeddings = get_embeddings(genai_client, SENTENCES)
-    print(f"Embeddings generated for {len(SENTENCES)} sentences.\n")
+    cache = None if args.no_cache else EmbeddingCache(args.cache_dir)
+    chromadb_client = create_chromadb_client(args.db_path)
+    limiter = RateLimiter(args.rpm, args.tpm)
+    records = iter_documents(os.path.abspath(args.corpus)) if args.corpus else zip(create_ids(), SENTENCES)
+
+    if args.command == "reindex":
+        print("Rebuilding ChromaDB collection from scratch...\n")
+        collection = reindex_collection(chromadb_client, genai_client, COLLECTION_NAME, records, cache, args.workers, limiter)
+        print(f"Reindexed {collection.count()} documents.")
+        return
+
+    # Open (or create) the collection and embed only new or changed sentences,
+    # reusing cached vectors where possible
+    print("Syncing corpus with ChromaDB collection...\n")
+    collection = create_collection(chromadb_client, COLLECTION_NAME)
+    stats = sync_collection(collection, genai_client, records, cache, args.workers, limiter)
+    print(f"Collection ready: {stats['upserted']} embedded, {stats['failed']} failed, "
+          f"{stats['deleted']} removed, {stats['unchanged']} unchanged.\n")
     print("-" * 60)
-    
-    # Set up ChromaDB collection and add documents with their embeddings
-    print("Setting up ChromaDB collection and adding documents...\n")
-    chromadb_client = create_chromadb_client()
-    collection = create_collection(chromadb_client, "text_similarity_collection")
-    add_documents_to_collection(collection, SENTENCES, embeddings, create_ids())
-    print("Documents added to ChromaDB collection.\n")
+
+    if args.command == "batch":
+        if not args.queries:
+            raise SystemExit("The batch command needs --queries FILE.")
+        print(f"Answering queries from {args.queries}...\n")
+        stats = run_batch_queries(genai_client, create_search_backend(args.backend, collection), args.queries,
+                                  args.output, args.top_k, cache, args.workers, limiter)
+        print(f"Wrote {stats['queries']} results ({stats['failed']} failed) to {args.output} "
+              f"in {stats['seconds']:.1f}s: {stats['queries_per_second']:.1f} queries/s.")
+        return
     
     # Get user input and perform similarity search
     user_query = input("Enter a sentence to check for similarity: ")
-    query_embedding = get_embeddings(genai_client, [user_query])
+    query_embedding = get_embeddings(genai_client, [user_query], cache)
     
     # Display results if embeddings were successfully generated
     if query_embedding:
         # Perform cosine similarity search (ChromaDB's default distance metric)
         # to find the 3 most similar documents to the query embedding
         #results = collection.query(query_embeddings=query_embedding, n_results=3)
-        results = find_similar_sentences(collection, query_embedding)
+        results = find_similar_sentences(create_search_backend(args.backend, collection), query_embedding)
         print("\nTop 2 similar sentences:")
         for idx, doc in enumerate(results):
             print(f"{idx + 1}. {doc}")
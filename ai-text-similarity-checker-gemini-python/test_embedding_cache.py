@@ -0,0 +1,65 @@
+"""Tests for the similarity checker's on-disk EmbeddingCache.
+
+Run from the repository root with `python -m pytest ai-text-similarity-checker-gemini-python`.
+"""
+
+import importlib.util
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ai-text-similarity-checker.py")
+spec = importlib.util.spec_from_file_location("ai_text_similarity_checker", SCRIPT)
+checker = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(checker)
+
+
+def vector(value, dim=4):
+    return [float(value)] * dim
+
+
+def test_vectors_written_without_keys_are_dropped(tmp_path):
+    cache = checker.EmbeddingCache(str(tmp_path))
+    cache.add(["a", "b"], [vector(1), vector(2)])
+    # Torn write: the vectors of the next batch landed, their keys did not
+    with open(cache.vectors_path, "ab") as vectors_file:
+        vectors_file.write(np.asarray([vector(9), vector(9)], dtype=np.float32).tobytes())
+
+    reopened = checker.EmbeddingCache(str(tmp_path))
+    reopened.add(["c"], [vector(3)])
+
+    assert len(reopened) == 3
+    assert [v.tolist() for v in reopened.lookup(["a", "b", "c"])] == [vector(1), vector(2), vector(3)]
+    assert os.path.getsize(reopened.vectors_path) == 3 * 4 * 4
+    assert [v.tolist() for v in checker.EmbeddingCache(str(tmp_path)).lookup(["c"])] == [vector(3)]
+
+
+def test_keys_without_vectors_are_dropped(tmp_path):
+    cache = checker.EmbeddingCache(str(tmp_path))
+    cache.add(["a"], [vector(1)])
+    with open(cache.keys_path, "ab") as keys_file:
+        keys_file.write(cache.digest("lost"))
+
+    reopened = checker.EmbeddingCache(str(tmp_path))
+    assert reopened.lookup(["lost"]) == [None]
+    reopened.add(["b"], [vector(2)])
+
+    assert [v.tolist() for v in checker.EmbeddingCache(str(tmp_path)).lookup(["a", "b"])] == [vector(1), vector(2)]
+
+
+class ShortEmbeddingModels:
+    """Stands in for `client.models` and returns one vector fewer than requested."""
+
+    def embed_content(self, model, contents, config):
+        embeddings = [SimpleNamespace(values=vector(index)) for index, _ in enumerate(contents[:-1])]
+        return SimpleNamespace(embeddings=embeddings)
+
+
+def test_short_embedding_response_returns_empty_list(tmp_path, capsys):
+    cache = checker.EmbeddingCache(str(tmp_path))
+    client = SimpleNamespace(models=ShortEmbeddingModels())
+
+    assert checker.get_embeddings(client, ["a", "b", "c"], cache) == []
+    assert "Expected 3 embeddings, got 2" in capsys.readouterr().out
+    assert len(cache) == 0
@@ -13,13 +13,28 @@ Requirements:
     - Input text file in the project directory
 
 Example:
-    python gemini-text-summarizer.py
+    python ai-text-summarizer.py
+    python ai-text-summarizer.py --batch articles/ --output summaries.jsonl --workers 8
+    python ai-text-summarizer.py --map-reduce --chunk-tokens 4000 --fan-out 4
 """
 
+import argparse
+import glob
+import json
 import os
+import sys
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Iterator, Optional
 from dotenv import load_dotenv
 from google import genai
 
+# Make the shared helpers in the repository root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from genai_common import (generate_content_cached, generate_content_cached_async, get_genai_client,
+                          response_finish_reason)
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -39,18 +54,43 @@ ONE_LINE_PROMPT: str = """
 Summarize the article in one single impactful sentence:
 """
 
+# Summary styles produced for every article, keyed by the name used in batch output
+SUMMARY_STYLES: dict[str, str] = {
+    "bullet": BULLET_PROMPT,
+    "executive": EXECUTIVE_PROMPT,
+    "one_line": ONE_LINE_PROMPT,
+}
+
+DEFAULT_BATCH_WORKERS: int = 8  # Concurrent Gemini requests in batch mode
+DEFAULT_BATCH_OUTPUT: str = "summaries.jsonl"  # JSONL file written by batch mode
+
+# Map-reduce settings for documents that are too long for a single prompt
+CHARS_PER_TOKEN: int = 4  # Rough characters-per-token ratio used for budgeting
+DEFAULT_CHUNK_TOKENS: int = 4000  # Token budget for each chunk sent in the map stage
+DEFAULT_FAN_OUT: int = 4  # Concurrent chunk requests per stage
+
+CHUNK_PROMPT: str = """
+Summarize the following section of a longer article. Keep every key fact, figure and conclusion:
+"""
+
+COMBINE_PROMPT: str = """
+Combine the following partial summaries of one article into a single summary. Keep every key fact, figure and conclusion:
+"""
+
 
 def create_genai_client() -> genai.Client:
     """
     Initializes and returns a Google GenAI client.
     
     The client automatically uses the GEMINI_API_KEY from the environment
-    to authenticate with Google's API.
+    to authenticate with Google's API. The process-wide client from
+    ``genai_common`` is returned, so batch and map-reduce requests share
+    one keep-alive connection pool.
     
     Returns:
         genai.Client: An authenticated GenAI client instance.
     """
-    return genai.Client()
+    return get_genai_client()
 
 def create_summary(client: genai.Client, text: str, prompt_template: str) -> str:
     """
@@ -60,6 +100,10 @@ def create_summary(client: genai.Client, text: str, prompt_template: str) -> str
     the Gemini API for processing. The type of summary depends on the prompt_template
     provided (bullet points, executive summary, or one-line summary).
     
+    Requests go through the response cache from ``genai_common``, so repeated
+    summaries of the same text are returned without a model call when caching
+    is enabled (``GENAI_CACHE`` / ``GENAI_CACHE_DB``).
+    
     Args:
         client (genai.Client): Authenticated Gemini API client.
         text (str): The text content to be summarized.
@@ -76,33 +120,105 @@ def create_summary(client: genai.Client, text: str, prompt_template: str) -> str
         TimeoutError: API request exceeds timeout.
         Exception: Any other unexpected errors during API communication.
     """
+    try:
+        return generate_summary(client, text, prompt_template)
+    except Exception as e:
+        return report_api_error(e)
+
+def generate_summary(client: genai.Client, text: str, prompt_template: str) -> str:
+    """
+    Generates a summary like ``create_summary``, but raises on failure instead of returning an error message.
+    
+    Batch and map-reduce mode use it so that a failed request can never be
+    mistaken for (or summarized as) a real summary.
+    
+    Args:
+        client (genai.Client): Authenticated Gemini API client.
+        text (str): The text content to be summarized.
+        prompt_template (str): The prompt instruction that defines the summary style.
+    
+    Returns:
+        str: The generated summary text.
+    
+    Raises:
+        ValueError: If the model returned no text.
+        Exception: Any error raised by the request.
+    """
+    user_prompt: str = create_user_prompt(text, prompt_template)
+    response = generate_content_cached(
+        client,
+        model=TARGET_MODEL,
+        contents=f"{user_prompt}",
+        cacheable=True
+    )
+    if not response.text:
+        raise ValueError(f"The model returned no text (finish reason: {response_finish_reason(response)})")
+    return response.text
+
+async def create_summary_async(client: genai.Client, text: str, prompt_template: str) -> str:
+    """
+    Async version of ``create_summary`` using the SDK's async client (``client.aio``).
+    
+    Takes the same inputs, shares the response cache and returns the same
+    error strings, without blocking the event loop while the request runs.
+    Use ``genai_common.gather_bounded`` to summarize many texts concurrently.
+    
+    Args:
+        client (genai.Client): Authenticated Gemini API client.
+        text (str): The text content to be summarized.
+        prompt_template (str): The prompt instruction that defines the summary style.
+    
+    Returns:
+        str: The generated summary text from the API, or an error message if the
+             request fails.
+    """
     user_prompt: str = create_user_prompt(text, prompt_template)
     try:
-        response = client.models.generate_content(
+        response = await generate_content_cached_async(
+            client,
             model=TARGET_MODEL,
-            contents=f"{user_prompt}"
+            contents=f"{user_prompt}",
+            cacheable=True
         )
         return response.text
-    except ValueError as ve:
-        error_msg: str = f"Invalid input or API configuration error: {ve}"
-        print(f"Error: {error_msg}")
-        return error_msg
-    except AttributeError as ae:
-        error_msg: str = f"API response format error: {ae}"
-        print(f"Error: {error_msg}")
-        return error_msg
-    except ConnectionError as ce:
-        error_msg: str = f"Connection error while calling Gemini API: {ce}"
-        print(f"Error: {error_msg}")
-        return error_msg
-    except TimeoutError as te:
-        error_msg: str = f"API request timed out: {te}"
-        print(f"Error: {error_msg}")
-        return error_msg
     except Exception as e:
-        error_msg: str = f"An unexpected error occurred while calling Gemini API: {e}"
-        print(f"Error: {error_msg}")
-        return error_msg
+        return report_api_error(e)
+
+def report_api_error(e: Exception) -> str:
+    """
+    Turns an exception raised while calling the Gemini API into an error message and prints it.
+    
+    Args:
+        e (Exception): The exception raised by the request.
+    
+    Returns:
+        str: The error message returned in place of a summary.
+    """
+    error_msg: str = describe_api_error(e)
+    print(f"Error: {error_msg}")
+    return error_msg
+
+def describe_api_error(e: Exception) -> str:
+    """
+    Turns an exception raised while calling the Gemini API into an error message.
+    
+    Args:
+        e (Exception): The exception raised by the request.
+    
+    Returns:
+        str: The error message.
+    """
+    if isinstance(e, ValueError):
+        error_msg: str = f"Invalid input or API configuration error: {e}"
+    elif isinstance(e, AttributeError):
+        error_msg = f"API response format error: {e}"
+    elif isinstance(e, ConnectionError):
+        error_msg = f"Connection error while calling Gemini API: {e}"
+    elif isinstance(e, TimeoutError):
+        error_msg = f"API request timed out: {e}"
+    else:
+        error_msg = f"An unexpected error occurred while calling Gemini API: {e}"
+    return error_msg
 
 def read_text_from_file(file_path: str) -> str:
     """
@@ -149,6 +265,296 @@ def create_user_prompt(text: str, prompt_template: str) -> str:
     user_prompt: str = f"{prompt_template}\n{text}" 
     return user_prompt
 
+def collect_article_paths(source: str) -> list[str]:
+    """
+    Resolves a directory or glob pattern into a sorted list of article files.
+    
+    A directory selects every ``.txt`` file directly inside it; anything else is
+    treated as a glob pattern (``**`` is supported for recursive matches).
+    
+    Args:
+        source (str): A directory path or a glob pattern such as ``articles/*.txt``.
+    
+    Returns:
+        list[str]: Sorted absolute paths of the matching files. Absolute paths are
+                   returned so that ``read_text_from_file`` does not resolve them
+                   against the script directory.
+    """
+    if os.path.isdir(source):
+        source = os.path.join(source, "*.txt")
+    return sorted(os.path.abspath(path) for path in glob.glob(source, recursive=True) if os.path.isfile(path))
+
+def summarize_article_style(client: genai.Client, file_path: str, style: str) -> dict:
+    """
+    Summarizes one article in one style and records how long the request took.
+    
+    The article is read inside the worker so that only in-flight articles are
+    held in memory, no matter how many files the batch contains.
+    
+    Args:
+        client (genai.Client): Authenticated Gemini API client.
+        file_path (str): Path of the article to summarize.
+        style (str): Key of the prompt in ``SUMMARY_STYLES``.
+    
+    Returns:
+        dict: A JSON-serializable record with the file, style, summary and
+              latency in seconds. Read and API errors are reported in an
+              ``error`` field instead of the summary.
+    """
+    started: float = time.perf_counter()
+    record: dict = {"file": file_path, "style": style}
+    try:
+        text: str = read_text_from_file(file_path)
+    except (OSError, UnicodeDecodeError) as e:
+        record["error"] = f"Could not read article: {e}"
+    else:
+        try:
+            record["summary"] = generate_summary(client, text, SUMMARY_STYLES[style])
+        except Exception as e:
+            record["error"] = describe_api_error(e)
+    record["latency_s"] = round(time.perf_counter() - started, 4)
+    return record
+
+def iter_batch_summaries(client: genai.Client, file_paths: list[str], max_workers: int = DEFAULT_BATCH_WORKERS) -> Iterator[dict]:
+    """
+    Summarizes every (article, style) pair concurrently and yields results as they finish.
+    
+    At most ``max_workers`` requests are in flight at any time. New pairs are only
+    submitted when a running one completes, so memory stays bounded for very
+    large batches.
+    
+    Args:
+        client (genai.Client): Authenticated Gemini API client.
+        file_paths (list[str]): Articles to summarize.
+        max_workers (int): Maximum number of concurrent Gemini requests.
+    
+    Yields:
+        dict: One record per (article, style) pair, in completion order.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    pairs = ((path, style) for path in file_paths for style in SUMMARY_STYLES)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: set[Future] = set()
+        for path, style in pairs:
+            if len(pending) >= max_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(executor.submit(summarize_article_style, client, path, style))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+def run_batch(client: genai.Client, source: str, output_path: str, max_workers: int = DEFAULT_BATCH_WORKERS) -> int:
+    """
+    Runs batch summarization and streams every finished result to a JSONL file.
+    
+    Each line is flushed as soon as its request completes, so partial results
+    survive an interrupted run.
+    
+    Args:
+        client (genai.Client): Authenticated Gemini API client.
+        source (str): Directory or glob pattern selecting the articles.
+        output_path (str): Destination JSONL file.
+        max_workers (int): Maximum number of concurrent Gemini requests.
+    
+    Returns:
+        int: The number of records written.
+    """
+    file_paths: list[str] = collect_article_paths(source)
+    print(f"Found {len(file_paths)} article(s); running {len(file_paths) * len(SUMMARY_STYLES)} requests "
+          f"with {max_workers} worker(s)...")
+    started: float = time.perf_counter()
+    written: int = 0
+    with open(output_path, "w", encoding="utf-8") as output:
+        for record in iter_batch_summaries(client, file_paths, max_workers):
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+            written += 1
+    elapsed: float = time.perf_counter() - started
+    print(f"Wrote {written} summaries to {output_path} in {elapsed:.1f}s.")
+    return written
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the number of tokens in a text without calling the API.
+    
+    Uses the ``CHARS_PER_TOKEN`` ratio, which is close enough for budgeting
+    chunks and reporting how much text each stage sends.
+    
+    Args:
+        text (str): The text to measure.
+    
+    Returns:
+        int: The estimated token count (at least 1 for non-empty text).
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def split_into_chunks(text: str, max_tokens: int = DEFAULT_CHUNK_TOKENS) -> list[str]:
+    """
+    Splits text into chunks that fit a token budget, breaking on paragraph boundaries.
+    
+    Paragraphs (separated by blank lines) are packed greedily into chunks. A
+    paragraph that is larger than the budget on its own is split on line breaks
+    and, as a last resort, into fixed-size character windows.
+    
+    Args:
+        text (str): The document text.
+        max_tokens (int): Maximum estimated tokens per chunk.
+    
+    Returns:
+        list[str]: The chunks, in document order.
+    """
+    if max_tokens < 1:
+        raise ValueError("max_tokens must be at least 1")
+    max_chars: int = max_tokens * CHARS_PER_TOKEN
+
+    pieces: list[str] = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for line in paragraph.splitlines():
+            pieces.extend(line[start:start + max_chars] for start in range(0, len(line), max_chars))
+
+    chunks: list[str] = []
+    current: list[str] = []
+    current_chars: int = 0
+    for piece in pieces:
+        # Account for the blank line that joins paragraphs inside a chunk
+        if current and current_chars + 2 + len(piece) > max_chars:
+            chunks.append("\n\n".join(current))
+            current, current_chars = [], 0
+        current_chars += len(piece) + (2 if current else 0)
+        current.append(piece)
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+def summarize_many(client: genai.Client, texts: list[str], prompt_template: str, fan_out: int = DEFAULT_FAN_OUT) -> list[str]:
+    """
+    Summarizes several texts with the same prompt concurrently.
+    
+    Args:
+        client (genai.Client): Authenticated Gemini API client.
+        texts (list[str]): Texts to summarize.
+        prompt_template (str): The prompt instruction applied to every text.
+        fan_out (int): Maximum number of concurrent requests.
+    
+    Returns:
+        list[str]: One summary per input text, in the same order.
+    
+    Raises:
+        Exception: The error of the first failed request; requests not yet
+                   started are cancelled.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(fan_out, len(texts)))) as executor:
+        futures: list[Future] = [executor.submit(generate_summary, client, text, prompt_template) for text in texts]
+        try:
+            return [future.result() for future in futures]
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+
+def map_reduce_summaries(client: genai.Client, text: str, chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+                         fan_out: int = DEFAULT_FAN_OUT) -> tuple[dict[str, str], list[dict]]:
+    """
+    Summarizes a long document hierarchically in every style in ``SUMMARY_STYLES``.
+    
+    The workflow is:
+    1. Map: split the text into chunks and summarize every chunk in parallel
+    2. Combine: while the partial summaries still exceed one chunk, re-chunk
+       and merge them in parallel (one extra level per pass)
+    3. Reduce: produce the bullet, executive and one-line summaries from the
+       final partial summaries in parallel
+    
+    Documents that already fit in one chunk skip straight to the reduce stage.
+    A failed request fails the whole document, so an error message is never
+    merged into the partial summaries or returned as a summary.
+    
+    Args:
+        client (genai.Client): Authenticated Gemini API client.
+        text (str): The full document text.
+        chunk_tokens (int): Token budget per chunk.
+        fan_out (int): Maximum number of concurrent requests per stage.
+    
+    Returns:
+        tuple[dict[str, str], list[dict]]: The summaries keyed by style, and one
+        record per stage with its request count and estimated tokens sent.
+    
+    Raises:
+        Exception: The error of the first failed request in any stage.
+    """
+    stages: list[dict] = []
+
+    def run_stage(name: str, inputs: list[str], prompt_template: str) -> list[str]:
+        tokens_sent: int = sum(estimate_tokens(create_user_prompt(item, prompt_template)) for item in inputs)
+        stages.append({"stage": name, "requests": len(inputs), "tokens_sent": tokens_sent})
+        return summarize_many(client, inputs, prompt_template, fan_out)
+
+    chunks: list[str] = split_into_chunks(text, chunk_tokens)
+    if len(chunks) > 1:
+        partials: list[str] = run_stage("map", chunks, CHUNK_PROMPT)
+        level: int = 1
+        while len(partials) > 1 and estimate_tokens("\n\n".join(partials)) > chunk_tokens:
+            groups: list[str] = split_into_chunks("\n\n".join(partials), chunk_tokens)
+            if len(groups) >= len(partials):
+                # Partial summaries are individually too large to merge further
+                break
+            partials = run_stage(f"combine-{level}", groups, COMBINE_PROMPT)
+            level += 1
+        reduced_text: str = "\n\n".join(partials)
+    else:
+        reduced_text = text
+
+    tokens_sent: int = sum(estimate_tokens(create_user_prompt(reduced_text, prompt)) for prompt in SUMMARY_STYLES.values())
+    stages.append({"stage": "reduce", "requests": len(SUMMARY_STYLES), "tokens_sent": tokens_sent})
+    with ThreadPoolExecutor(max_workers=max(1, min(fan_out, len(SUMMARY_STYLES)))) as executor:
+        futures: dict[str, Future] = {
+            style: executor.submit(generate_summary, client, reduced_text, prompt)
+            for style, prompt in SUMMARY_STYLES.items()
+        }
+        try:
+            summaries: dict[str, str] = {style: future.result() for style, future in futures.items()}
+        except Exception:
+            for future in futures.values():
+                future.cancel()
+            raise
+    return summaries, stages
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """
+    Parses command-line options.
+    
+    Without options the tool summarizes ``TARGET_FILE`` interactively, as before.
+    
+    Args:
+        argv (Optional[list[str]]): Arguments to parse; defaults to ``sys.argv``.
+    
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Summarize articles with Google Gemini.")
+    parser.add_argument("--batch", metavar="SOURCE",
+                        help="Directory or glob of articles to summarize in every style.")
+    parser.add_argument("--output", default=DEFAULT_BATCH_OUTPUT,
+                        help=f"JSONL file for batch results (default: {DEFAULT_BATCH_OUTPUT}).")
+    parser.add_argument("--workers", type=int, default=DEFAULT_BATCH_WORKERS,
+                        help=f"Maximum concurrent requests in batch mode (default: {DEFAULT_BATCH_WORKERS}).")
+    parser.add_argument("--map-reduce", action="store_true",
+                        help="Summarize TARGET_FILE hierarchically in chunks (for long documents).")
+    parser.add_argument("--chunk-tokens", type=int, default=DEFAULT_CHUNK_TOKENS,
+                        help=f"Token budget per chunk in map-reduce mode (default: {DEFAULT_CHUNK_TOKENS}).")
+    parser.add_argument("--fan-out", type=int, default=DEFAULT_FAN_OUT,
+                        help=f"Concurrent chunk requests per stage in map-reduce mode (default: {DEFAULT_FAN_OUT}).")
+    return parser.parse_args(argv)
+
 def main() -> None:
     """
     Main entry point for the AI Text Summarizer application.
@@ -161,7 +567,37 @@ def main() -> None:
        - Executive summary (professional concise summary)
        - One-line summary (single impactful sentence)
     4. Displays results to the user
+    
+    With ``--batch`` it instead summarizes every matching article in every
+    style concurrently and writes the results to a JSONL file. With
+    ``--map-reduce`` it summarizes ``TARGET_FILE`` chunk by chunk and reports
+    the tokens sent per stage.
     """
+    args: argparse.Namespace = parse_args()
+    if args.batch:
+        print("--- AI Text Summarizer: batch mode ---")
+        run_batch(create_genai_client(), args.batch, args.output, args.workers)
+        return
+    if args.map_reduce:
+        print("--- AI Text Summarizer: map-reduce mode ---")
+        user_text: str = read_text_from_file(TARGET_FILE)
+        print(f"Summarizing ~{estimate_tokens(user_text)} tokens in chunks of {args.chunk_tokens}...Please wait...")
+        try:
+            summaries, stages = map_reduce_summaries(create_genai_client(), user_text, args.chunk_tokens, args.fan_out)
+        except Exception as e:
+            report_api_error(e)
+            return
+        print("\n--- Bullet Point Summary ---")
+        print(summaries["bullet"])
+        print("\n--- Executive Summary ---")
+        print(summaries["executive"])
+        print("\n--- One Line Summary ---")
+        print(summaries["one_line"])
+        print("\n--- Tokens Sent Per Stage (estimated) ---")
+        for stage in stages:
+            print(f"{stage['stage']:<12} {stage['requests']:>5} request(s) {stage['tokens_sent']:>10} tokens")
+        return
+
     print("--- Welcome to your AI Text Summarizer! ---")
     print("Reading input text from file...")
     user_text: str = read_text_from_file(TARGET_FILE)
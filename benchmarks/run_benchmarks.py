@@ -0,0 +1,324 @@
+"""End-to-end benchmarks of every tool against the local fake Gemini server.
+
+Each tool's real functions (`map_reduce_summaries`, `extract_meeting_notes_chunked`,
+`analyze_resume`, `iter_repo_explanations`, `get_embeddings` and
+`find_similar_sentences`, the async generators, `run_chain`, ...) are driven
+over synthetic inputs of growing size (see `workloads.py`). The model is
+`genai_common.fake_server`, started in its own process, so runs need no
+network or API key and the server's CPU is not counted.
+
+Every case (one tool at one size) runs in a fresh process and reports:
+    - Throughput: input units per second (bytes, pages, sentences, ...) and items per second
+    - Latency: p50/p95/p99 of each item (an article, a resume, a query, a request, ...)
+    - Model calls: count, errors, retries and p50/p95/p99 per operation, from the shared client's telemetry
+    - CPU time (user + system, worker processes included) and peak RSS of the case's process
+
+Results are written to `baselines/<scale>.json` with stable formatting, so
+committing the file and re-running shows regressions as a diff. `--check`
+compares against the saved file instead and exits with status 1 when a
+metric got worse by more than `--threshold` or a case failed.
+
+Usage:
+    python run_benchmarks.py
+    python run_benchmarks.py --scale quick --tools summarizer,similarity_checker
+    python run_benchmarks.py --scale full --latency lognormal:0.3,0.5 --rate-limit-rate 0.02
+    python run_benchmarks.py --check --threshold 0.2
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Make the shared helpers in the repository root importable
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+from genai_common import Telemetry, get_genai_client, instrument_client, percentile
+
+from workloads import WORKLOADS, format_size
+
+SCALES = ("quick", "default", "full")
+DEFAULT_BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+DEFAULT_LATENCY = "lognormal:0.05,0.3"  # Simulated model latency (median 50 ms)
+DEFAULT_EMBEDDING_DIM = 256  # Smaller than the real model's, so million-sentence corpora fit in memory
+DEFAULT_CONCURRENCY = 16  # In-flight requests for the async tools
+DEFAULT_THRESHOLD = 0.25  # Relative change that counts as a regression in --check
+# Environment that would change what a case measures (response/context caches, extra telemetry)
+ISOLATED_ENV_PREFIXES = ("GENAI_CACHE", "GENAI_CONTEXT_CACHE", "GENAI_TELEMETRY")
+# Metrics compared against the baseline, and whether higher values are better
+COMPARED_METRICS = {
+    "throughput": True,
+    "latency_p50": False,
+    "latency_p95": False,
+    "latency_p99": False,
+    "cpu_seconds": False,
+    "peak_rss_mb": False,
+}
+
+
+def start_fake_server(args):
+    """Start `genai_common.fake_server` in a child process and return it with its URL.
+
+    Args:
+        args (argparse.Namespace): Options with the server settings.
+
+    Returns:
+        tuple[subprocess.Popen, str]: The server process and its base URL.
+
+    Raises:
+        RuntimeError: If the server does not report its address.
+    """
+    command = [sys.executable, "-m", "genai_common.fake_server", "--port", "0", "--latency", args.latency,
+               "--error-rate", str(args.error_rate), "--rate-limit-rate", str(args.rate_limit_rate),
+               "--embedding-dim", str(args.embedding_dim), "--seed", str(args.seed)]
+    server = subprocess.Popen(command, cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True)
+    match = re.search(r"http://\S+", server.stdout.readline())
+    if not match:
+        server.kill()
+        raise RuntimeError("The fake Gemini server did not start")
+    return server, match.group(0).rstrip(")")
+
+
+def _rounded(value):
+    return round(value, 4) if isinstance(value, float) else value
+
+
+def run_case(workload_name, size, base_url, concurrency):
+    """Run one case in the current (fresh) process and measure it.
+
+    Inputs are generated first and not timed. Tool output is discarded.
+
+    Args:
+        workload_name (str): Name of the workload in `WORKLOADS`.
+        size (int): Input size, in the workload's unit.
+        base_url (str): URL of the fake server.
+        concurrency (int): In-flight requests for the async tools.
+
+    Returns:
+        dict: The case's metrics.
+    """
+    for name in list(os.environ):
+        if name.startswith(ISOLATED_ENV_PREFIXES):
+            del os.environ[name]
+    os.environ["GENAI_BASE_URL"] = base_url
+    # A spawned process inherits the spawn start method; give the tools' own process pools the
+    # platform default again, as when they run from the command line
+    multiprocessing.set_start_method(None, force=True)
+    os.environ.setdefault("GEMINI_API_KEY", "fake")
+    workload = WORKLOADS[workload_name]
+    telemetry = Telemetry()
+    client = instrument_client(get_genai_client(), telemetry)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        inputs, input_bytes = workload.prepare(size, workdir)
+        usage = [resource.getrusage(who) for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+        started = time.perf_counter()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            latencies, extra = workload.run(client, inputs, concurrency)
+        wall_seconds = time.perf_counter() - started
+        after = [resource.getrusage(who) for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+
+    cpu_seconds = sum(end.ru_utime + end.ru_stime - start.ru_utime - start.ru_stime
+                      for start, end in zip(usage, after))
+    calls = telemetry.summary()
+    result = {
+        "workload": workload_name,
+        "unit": workload.unit,
+        "size": size,
+        "items": len(latencies),
+        "input_bytes": input_bytes,
+        "wall_seconds": wall_seconds,
+        "throughput": workload.units(size) / wall_seconds if wall_seconds > 0 else 0.0,
+        "items_per_second": len(latencies) / wall_seconds if wall_seconds > 0 else 0.0,
+        "latency_p50": percentile(latencies, 50),
+        "latency_p95": percentile(latencies, 95),
+        "latency_p99": percentile(latencies, 99),
+        "model_calls": sum(row["calls"] for row in calls),
+        "model_errors": sum(row["errors"] for row in calls),
+        "operations": {
+            row["operation"]: {key: _rounded(row[key]) for key in ("calls", "errors", "retries", "p50", "p95", "p99")}
+            for row in calls
+        },
+        "cpu_seconds": cpu_seconds,
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": max(after[0].ru_maxrss, after[1].ru_maxrss) / 1024,
+    }
+    result.update(extra)
+    return {key: _rounded(value) for key, value in result.items()}
+
+
+def run_isolated(workload_name, size, base_url, concurrency):
+    """Run a case in a freshly spawned process, so its CPU time and peak RSS are its own."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(run_case, workload_name, size, base_url, concurrency).result()
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Compare the cases of two runs.
+
+    Args:
+        baseline (dict): Cases of the earlier run, keyed by case name.
+        current (dict): Cases of the new run, keyed by case name.
+        threshold (float): Relative change in the worse direction that counts as a regression.
+
+    Returns:
+        list[dict]: One row per case and metric present in both runs, with
+        the `baseline` and `current` values, the relative `change` and whether
+        it is a `regression`.
+    """
+    rows = []
+    for case, metrics in current.items():
+        if case not in baseline:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = baseline[case].get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            rows.append({"case": case, "metric": metric, "baseline": old, "current": new,
+                         "change": change, "regression": worse > threshold})
+    return rows
+
+
+def print_results(cases):
+    """Print one line per case with its throughput, latencies and resource use."""
+    print(f"\n{'case':<32} {'throughput':>25} {'items/s':>9} {'p50':>8} {'p95':>8} {'p99':>8} "
+          f"{'calls':>7} {'errors':>6} {'cpu s':>8} {'rss MB':>8}")
+    for case, result in cases.items():
+        if "error" in result:
+            print(f"{case:<32} failed: {result['error']}")
+            continue
+        print(f"{case:<32} {result['throughput']:>12,.1f} {result['unit'] + '/s':<12} {result['items_per_second']:>9.2f} "
+              f"{result['latency_p50']:>7.3f}s {result['latency_p95']:>7.3f}s {result['latency_p99']:>7.3f}s "
+              f"{result['model_calls']:>7} {result['model_errors']:>6} {result['cpu_seconds']:>8.2f} "
+              f"{result['peak_rss_mb']:>8.1f}")
+
+
+def print_comparison(rows):
+    """Print the metrics that changed against the baseline, marking regressions."""
+    changed = [row for row in rows if abs(row["change"]) >= 0.05]
+    if not changed:
+        print("\nNo metric changed by 5% or more against the baseline.")
+        return
+    print(f"\n{'case':<32} {'metric':<12} {'baseline':>12} {'current':>12} {'change':>8}")
+    for row in changed:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['case']:<32} {row['metric']:<12} {row['baseline']:>12,.4g} {row['current']:>12,.4g} "
+              f"{row['change']:>+7.0%}{flag}")
+
+
+def load_baseline(path):
+    """Return the saved run at `path`, or an empty run when there is none."""
+    if not os.path.exists(path):
+        return {"cases": {}}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_baseline(path, run):
+    """Write a run with sorted keys and one value per line, so changes diff cleanly."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(run, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def parse_args(argv=None):
+    """Parse command-line options.
+
+    Args:
+        argv (list[str]): Arguments to parse; defaults to `sys.argv`.
+
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark every tool against a local fake Gemini server.")
+    parser.add_argument("--scale", choices=SCALES, default="default",
+                        help="Input sizes to run: quick, default or full (up to 10 MB articles, 200-page PDFs "
+                             "and 1M sentences).")
+    parser.add_argument("--tools", help=f"Comma-separated workloads to run (default: all of {', '.join(WORKLOADS)}).")
+    parser.add_argument("--baseline-dir", default=DEFAULT_BASELINE_DIR,
+                        help="Directory of the saved <scale>.json results (default: benchmarks/baselines).")
+    parser.add_argument("--check", action="store_true",
+                        help="Compare with the saved results without overwriting them; exit 1 on regressions or failures.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Relative change counted as a regression (default: {DEFAULT_THRESHOLD}).")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"In-flight requests for the async tools (default: {DEFAULT_CONCURRENCY}).")
+    parser.add_argument("--latency", default=DEFAULT_LATENCY,
+                        help=f"Fake model latency distribution (default: {DEFAULT_LATENCY}).")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of model calls failing with 500.")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of model calls failing with 429.")
+    parser.add_argument("--embedding-dim", type=int, default=DEFAULT_EMBEDDING_DIM,
+                        help=f"Dimension of the fake embeddings (default: {DEFAULT_EMBEDDING_DIM}).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the fake server (default: 0).")
+    args = parser.parse_args(argv)
+    args.tools = args.tools.split(",") if args.tools else list(WORKLOADS)
+    unknown = set(args.tools) - WORKLOADS.keys()
+    if unknown:
+        parser.error(f"unknown workload(s): {', '.join(sorted(unknown))}")
+    return args
+
+
+def main():
+    """Run the selected cases, print them, and save or check them against the baseline."""
+    args = parse_args()
+    baseline_path = os.path.join(args.baseline_dir, f"{args.scale}.json")
+    baseline = load_baseline(baseline_path)
+    server, base_url = start_fake_server(args)
+    cases = {}
+    try:
+        for name in args.tools:
+            workload = WORKLOADS[name]
+            for size in workload.sizes[args.scale]:
+                case = f"{name}/{format_size(size, workload.unit)}"
+                print(f"Running {case}...", flush=True)
+                try:
+                    cases[case] = run_isolated(name, size, base_url, args.concurrency)
+                except Exception as e:
+                    print(f"{case} failed: {e}")
+                    cases[case] = {"error": f"{type(e).__name__}: {e}"}
+    finally:
+        server.terminate()
+        server.wait()
+
+    print_results(cases)
+    server_settings = {"latency": args.latency, "error_rate": args.error_rate, "rate_limit_rate": args.rate_limit_rate,
+                       "embedding_dim": args.embedding_dim, "seed": args.seed}
+    same_settings = (baseline.get("server", server_settings) == server_settings
+                     and baseline.get("concurrency", args.concurrency) == args.concurrency)
+    if not same_settings:
+        print(f"\nNote: the baseline was recorded with different settings ({baseline['server']}, "
+              f"concurrency {baseline['concurrency']}); the comparison is not like for like.")
+    rows = compare_results(baseline["cases"], cases, args.threshold)
+    if rows:
+        print_comparison(rows)
+    if args.check:
+        failed = any("error" in result for result in cases.values())
+        sys.exit(1 if failed or any(row["regression"] for row in rows) else 0)
+
+    # Keep the cases of workloads that were not run this time, if they are comparable
+    run = {
+        "scale": args.scale,
+        "server": server_settings,
+        "concurrency": args.concurrency,
+        "environment": {"python": platform.python_version(), "machine": platform.machine(),
+                        "cpus": os.cpu_count()},
+        "cases": {**(baseline["cases"] if same_settings else {}), **cases},
+    }
+    save_baseline(baseline_path, run)
+    print(f"\nResults saved to {baseline_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Deterministic synthetic inputs for the benchmarks.
+
+Every generator takes a size and a seed and always returns the same
+content for them, so two benchmark runs send byte-identical requests and
+their numbers can be compared.
+"""
+
+import random
+
+WORDS = (
+    "the a of and to in for on with as by at from that this it is was are be has have will can "
+    "market growth company revenue customer product team data model system report quarter year "
+    "plan project budget risk review design feature release service platform network security "
+    "research study result analysis policy energy climate health city school student price cost "
+    "increase decrease improve launch deliver support measure expand reduce manage build test "
+    "strong new early late global local major minor final key public private digital open"
+).split()
+SPEAKERS = ("Alice", "Bob", "Carol", "David", "Erin", "Frank", "Grace", "Heidi")
+SKILLS = ("Python", "SQL", "Kubernetes", "React", "Go", "Terraform", "Spark", "Kafka", "AWS", "Docker")
+
+# Layout of the generated PDF pages
+PDF_LINES_PER_PAGE = 50
+PDF_LINE_CHARS = 80
+
+
+def make_sentence(rng, min_words=8, max_words=18):
+    """Return one capitalized sentence of random words."""
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    return " ".join(words).capitalize() + "."
+
+
+def make_article(size_bytes, seed=0):
+    """Generate an article of about `size_bytes` characters, in paragraphs.
+
+    Args:
+        size_bytes (int): Target length.
+        seed (int): Seed of the content.
+
+    Returns:
+        str: The article text.
+    """
+    rng = random.Random(f"article:{seed}")
+    paragraphs, length = [], 0
+    while length < size_bytes:
+        paragraph = " ".join(make_sentence(rng) for _ in range(rng.randint(3, 7)))
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+    return "\n\n".join(paragraphs)[:size_bytes]
+
+
+def make_transcript(size_bytes, seed=0):
+    """Generate a meeting transcript of about `size_bytes` characters, one speaker turn per line.
+
+    Args:
+        size_bytes (int): Target length.
+        seed (int): Seed of the content.
+
+    Returns:
+        str: The transcript text.
+    """
+    rng = random.Random(f"transcript:{seed}")
+    speakers = rng.sample(SPEAKERS, 4)
+    turns, length = [f"Meeting: Weekly sync {seed}", "Date: 2026-01-15"], 0
+    while length < size_bytes:
+        turn = f"{rng.choice(speakers)}: " + " ".join(make_sentence(rng) for _ in range(rng.randint(1, 3)))
+        turns.append(turn)
+        length += len(turn) + 1
+    return "\n".join(turns)
+
+
+def make_sentences(count, seed=0):
+    """Generate `count` short sentences (a corpus for the similarity checker).
+
+    Args:
+        count (int): Number of sentences.
+        seed (int): Seed of the content.
+
+    Returns:
+        list[str]: The sentences.
+    """
+    rng = random.Random(f"sentences:{seed}")
+    return [make_sentence(rng, 6, 14) for _ in range(count)]
+
+
+def make_python_module(symbols, seed=0):
+    """Generate Python source with `symbols` top-level functions and classes.
+
+    Roughly one symbol in five is a class with a few methods; the rest are
+    functions. Every symbol uses some of the module's imports.
+
+    Args:
+        symbols (int): Number of top-level symbols.
+        seed (int): Seed of the content.
+
+    Returns:
+        str: The module source.
+    """
+    rng = random.Random(f"module:{seed}")
+    lines = ["import json", "import math", "import os", "from collections import defaultdict", ""]
+    for index in range(symbols):
+        name = f"{rng.choice(WORDS[20:])}_{rng.choice(WORDS[20:])}_{index}"
+        if index % 5 == 4:
+            lines.append(f"class {name.title().replace('_', '')}:")
+            lines.append(f'    """Handle {" ".join(rng.choice(WORDS) for _ in range(6))}."""')
+            for method in range(rng.randint(2, 4)):
+                lines.append(f"    def step_{method}(self, value):")
+                lines.append(f"        return math.floor(value * {rng.randint(2, 9)}) + len(os.sep)")
+            lines.append("")
+            continue
+        lines.append(f"def {name}(items, limit={rng.randint(1, 100)}):")
+        lines.append(f'    """Compute {" ".join(rng.choice(WORDS) for _ in range(6))}."""')
+        lines.append("    totals = defaultdict(int)")
+        lines.append("    for item in items[:limit]:")
+        lines.append(f"        totals[item] += math.ceil(len(str(item)) / {rng.randint(2, 9)})")
+        lines.append("    return json.dumps(totals)")
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def _pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_resume_pdf(path, pages, seed=0):
+    """Write a text-only PDF resume with `pages` pages that pypdf can extract.
+
+    The file is assembled by hand (one Helvetica content stream per page and
+    a cross-reference table), so no PDF library is needed to create it.
+
+    Args:
+        path (str): Destination file.
+        pages (int): Number of pages.
+        seed (int): Seed of the content.
+
+    Returns:
+        int: Size of the written file in bytes.
+    """
+    rng = random.Random(f"resume:{seed}")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # The page tree, filled in once the page objects are numbered
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for page in range(pages):
+        lines = [f"Jordan Example - Senior Engineer - page {page + 1}"]
+        while len(lines) < PDF_LINES_PER_PAGE:
+            if len(lines) % 10 == 1:
+                lines.append("Experience: " + ", ".join(rng.sample(SKILLS, 3)))
+            else:
+                lines.append(make_sentence(rng)[:PDF_LINE_CHARS])
+        text = " T* ".join(f"({_pdf_escape(line)}) Tj" for line in lines)
+        stream = f"BT /F1 10 Tf 12 TL 40 800 Td {text} ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>".encode("ascii")
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref_offset = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    with open(path, "wb") as file:
+        file.write(data)
+    return len(data)
@@ -0,0 +1,287 @@
+"""Benchmark workloads, one per tool.
+
+A workload has a `prepare` step that builds its synthetic inputs (not timed)
+and a `run` step that drives the tool's own functions over them against the
+shared client and returns the latency of every item it processed. Sizes are
+given per scale in the workload's unit: article bytes, PDF pages, corpus
+sentences, module symbols, chain steps or concurrent requests.
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+# Make the shared helpers in the repository root importable
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+from genai_common import ResponseCache, gather_bounded
+
+import synthetic_inputs
+
+KB = 1024
+MB = 1024 * KB
+# Total input volume spread over the items of one size (fewer, larger items as sizes grow)
+ITEM_BUDGET = {"bytes": 2 * MB, "pages": 200}
+MAX_ITEMS = 20
+# Queries sent after indexing a similarity corpus
+SIMILARITY_QUERIES = 50
+
+
+@dataclass
+class Workload:
+    """One tool's benchmark.
+
+    Attributes:
+        name (str): Workload name, used in case names (`<name>/<size>`).
+        unit (str): What the sizes count.
+        sizes (dict[str, tuple[int, ...]]): Sizes to run for each scale.
+        prepare (callable): `prepare(size, workdir)` -> (inputs, input_bytes).
+        run (callable): `run(client, inputs, concurrency)` -> (per-item latencies, extra metrics).
+    """
+
+    name: str
+    unit: str
+    sizes: dict
+    prepare: Callable
+    run: Callable
+
+    def units(self, size):
+        """Total input processed for one size, in `unit` (the throughput numerator)."""
+        return size * item_count(size, self.unit) if self.unit in ITEM_BUDGET else size
+
+
+def load_tool(folder, script):
+    """Import a tool script by path (its file name is not a valid module name).
+
+    The tool's folder is put on `sys.path` first, so the modules it imports
+    from its own folder (e.g. `code_symbols`, `evaluation`) resolve.
+
+    Args:
+        folder (str): Project folder in the repository root.
+        script (str): Script file name.
+
+    Returns:
+        module: The loaded script module.
+    """
+    name = os.path.splitext(script)[0].replace("-", "_")
+    if name in sys.modules:
+        return sys.modules[name]
+    directory = os.path.join(REPO_ROOT, folder)
+    sys.path.insert(0, directory)
+    spec = importlib.util.spec_from_file_location(name, os.path.join(directory, script))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def format_size(size, unit):
+    """Return a size as used in case names, e.g. `100KB`, `50p` or `1000`."""
+    if unit == "bytes":
+        return f"{size // MB}MB" if size >= MB else f"{size // KB}KB"
+    return f"{size}p" if unit == "pages" else str(size)
+
+
+def item_count(size, unit):
+    """Number of items of one size, so small sizes still give enough latency samples."""
+    return max(1, min(MAX_ITEMS, ITEM_BUDGET[unit] // size))
+
+
+def timed(function, *args):
+    """Call `function(*args)` and return its wall time in seconds."""
+    started = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started
+
+
+async def _timed_async(awaitable):
+    started = time.perf_counter()
+    await awaitable
+    return time.perf_counter() - started
+
+
+def run_concurrently(awaitables, concurrency):
+    """Run coroutines with `gather_bounded` and return the wall time of each."""
+    async def main():
+        return await gather_bounded((_timed_async(a) for a in awaitables), limit=concurrency)
+    return asyncio.run(main())
+
+
+# Text summarizer: map-reduce summaries of articles
+
+def prepare_articles(size, workdir):
+    articles = [synthetic_inputs.make_article(size, seed) for seed in range(item_count(size, "bytes"))]
+    return articles, sum(len(article) for article in articles)
+
+
+def run_summarizer(client, articles, concurrency):
+    tool = load_tool("ai-text-summarizer-gemini-python", "ai-text-summarizer.py")
+    return [timed(tool.map_reduce_summaries, client, article) for article in articles], {}
+
+
+# Meeting notes: chunked structured extraction of transcripts
+
+def prepare_transcripts(size, workdir):
+    transcripts = [synthetic_inputs.make_transcript(size, seed) for seed in range(item_count(size, "bytes"))]
+    return transcripts, sum(len(transcript) for transcript in transcripts)
+
+
+def run_meeting_notes(client, transcripts, concurrency):
+    tool = load_tool("ai-meeting-notes-generator-gemini-python", "ai-meeting-notes-generator.py")
+    return [timed(tool.extract_meeting_notes_chunked, client, transcript) for transcript in transcripts], {}
+
+
+# Resume analyzer: PDF text extraction and analysis
+
+def prepare_resumes(pages, workdir):
+    paths = [os.path.join(workdir, f"resume_{pages}p_{seed}.pdf") for seed in range(item_count(pages, "pages"))]
+    input_bytes = sum(synthetic_inputs.write_resume_pdf(path, pages, seed) for seed, path in enumerate(paths))
+    return paths, input_bytes
+
+
+def run_resume(client, paths, concurrency):
+    tool = load_tool("ai-resume-analyzer-gemini-python", "ai-resume-analyzer.py")
+    extract_seconds = []
+
+    def analyze(path):
+        started = time.perf_counter()
+        text = tool.read_resume_from_file(path)
+        extract_seconds.append(time.perf_counter() - started)
+        tool.analyze_resume(client, tool.create_user_prompt(text))
+
+    latencies = [timed(analyze, path) for path in paths]
+    return latencies, {"extract_seconds": sum(extract_seconds)}
+
+
+# Code explainer: repository mode over one generated module
+
+def prepare_module(symbols, workdir):
+    source = synthetic_inputs.make_python_module(symbols)
+    return source, len(source)
+
+
+def run_code_explainer(client, source, concurrency):
+    tool = load_tool("ai-code-explainer-gemini-python", "ai-code-explainer.py")
+    code_symbols = sys.modules["code_symbols"]
+    started = time.perf_counter()
+    symbols = code_symbols.extract_symbols(source, "generated.py")
+    extract_seconds = time.perf_counter() - started
+    results = tool.iter_repo_explanations(client, iter([("generated.py", symbols, None)]))
+    latencies = [record["seconds"] for result in results for record in result["symbols"]]
+    return latencies, {"extract_seconds": extract_seconds, "symbols": len(symbols)}
+
+
+# Similarity checker: embed a corpus, then answer queries
+
+def prepare_corpus(count, workdir):
+    sentences = synthetic_inputs.make_sentences(count)
+    queries = synthetic_inputs.make_sentences(min(SIMILARITY_QUERIES, count), seed=1)
+    return (sentences, queries), sum(len(sentence) for sentence in sentences)
+
+
+def run_similarity(client, corpus, concurrency):
+    tool = load_tool("ai-text-similarity-checker-gemini-python", "ai-text-similarity-checker.py")
+    sentences, queries = corpus
+    started = time.perf_counter()
+    ids, documents, blocks = [], [], []
+    records = ((f"id{index}", sentence) for index, sentence in enumerate(sentences))
+    for batch, embeddings, error in tool.iter_embedded_batches(client, records):
+        if error is None:
+            ids.extend(record_id for record_id, _ in batch)
+            documents.extend(document for _, document in batch)
+            blocks.append(np.asarray(embeddings, dtype=np.float32))
+    backend = tool.NumpySearchBackend(ids, documents, np.concatenate(blocks) if blocks else np.zeros((0, 0)))
+    index_seconds = time.perf_counter() - started
+
+    def query(text):
+        embedding = tool.get_embeddings(client, [text])
+        if embedding:  # Empty when the embedding request failed
+            tool.find_similar_sentences(backend, embedding)
+
+    latencies = [timed(query, text) for text in queries]
+    return latencies, {"index_seconds": index_seconds, "indexed": len(ids)}
+
+
+# Email writer, story generator, study buddy: many concurrent short requests
+
+def prepare_requests(count, workdir):
+    return count, 0
+
+
+def run_email_writer(client, count, concurrency):
+    tool = load_tool("ai-email-writer-gemini-python", "ai-email-writer.py")
+    prompts = [tool.create_email_prompt(f"Follow up on proposal {index}", "professional", "Dana",
+                                        "timeline, budget, next steps") for index in range(count)]
+    return run_concurrently([tool.generate_email_async(client, prompt) for prompt in prompts], concurrency), {}
+
+
+def run_story_generator(client, count, concurrency):
+    tool = load_tool("ai-story-generator-gemini-python", "ai-story-generator.py")
+    prompts = [tool.create_story_prompt(f"Hero {index}", "adventure", "a floating city", "a lost map", "kids")
+               for index in range(count)]
+    return run_concurrently([tool.generate_story_async(prompt) for prompt in prompts], concurrency), {}
+
+
+def run_study_buddy(client, count, concurrency):
+    tool = load_tool("ai-study-buddy-gemini-python", "ai-study-buddy.py")
+    prompts = [tool.create_prompt(f"Concept number {index}", "beginner") for index in range(count)]
+    return run_concurrently([tool.explain_concept_async(client, prompt) for prompt in prompts], concurrency), {}
+
+
+# Prompt playground: generate a batch of outputs and evaluate it
+
+def run_playground(client, count, concurrency):
+    tool = load_tool("ai-prompt-playground-gemini-python", "ai-prompt-playground.py")
+    evaluation = sys.modules["evaluation"]
+    outputs = []
+
+    async def generate(index):
+        outputs.append(await tool.generate_output_async(client, f"Write a tagline for product {index}",
+                                                        tool.DEFAULT_SYSTEM_PROMPT, 0.7, 0.9))
+
+    latencies = run_concurrently([generate(index) for index in range(count)], concurrency)
+    started = time.perf_counter()
+    evaluation.evaluate_batch(outputs)
+    return latencies, {"evaluate_seconds": time.perf_counter() - started}
+
+
+# Prompt chain: a fan-out of independent steps merged by a final step
+
+def run_prompt_chain(client, steps, concurrency):
+    load_tool("ai-prompt-playground-gemini-python", "ai-prompt-playground.py")
+    prompt_chain = sys.modules["prompt_chain"]
+    chain = [prompt_chain.ChainStep(f"part{index}", f"Write section {index} about {{topic}}.") for index in range(steps - 1)]
+    merge = "\n".join(f"{{{step.name}}}" for step in chain)
+    chain.append(prompt_chain.ChainStep("merge", f"Merge these sections into one report:\n{merge}"))
+    results = prompt_chain.run_chain(client, chain, {"topic": "benchmarks"}, memo=ResponseCache(max_temperature=None))
+    return [result.latency_seconds for result in results.values()], {}
+
+
+BYTE_SIZES = {"quick": (1 * KB, 100 * KB), "default": (1 * KB, 100 * KB, 1 * MB),
+              "full": (1 * KB, 100 * KB, 1 * MB, 10 * MB)}
+REQUEST_COUNTS = {"quick": (10, 100), "default": (10, 100, 1000), "full": (10, 100, 1000, 10000)}
+
+WORKLOADS = {workload.name: workload for workload in (
+    Workload("summarizer", "bytes", BYTE_SIZES, prepare_articles, run_summarizer),
+    Workload("meeting_notes", "bytes", BYTE_SIZES, prepare_transcripts, run_meeting_notes),
+    Workload("resume_analyzer", "pages",
+             {"quick": (1, 10), "default": (1, 10, 50), "full": (1, 10, 50, 200)}, prepare_resumes, run_resume),
+    Workload("code_explainer", "symbols",
+             {"quick": (10, 100), "default": (10, 100, 1000), "full": (10, 100, 1000, 10000)},
+             prepare_module, run_code_explainer),
+    Workload("similarity_checker", "sentences",
+             {"quick": (10, 1000), "default": (10, 1000, 10000), "full": (10, 1000, 10000, 100000, 1000000)},
+             prepare_corpus, run_similarity),
+    Workload("email_writer", "requests", REQUEST_COUNTS, prepare_requests, run_email_writer),
+    Workload("story_generator", "requests", REQUEST_COUNTS, prepare_requests, run_story_generator),
+    Workload("study_buddy", "requests", REQUEST_COUNTS, prepare_requests, run_study_buddy),
+    Workload("prompt_playground", "requests", REQUEST_COUNTS, prepare_requests, run_playground),
+    Workload("prompt_chain", "steps",
+             {"quick": (3, 10), "default": (3, 10, 50), "full": (3, 10, 50, 200)}, prepare_requests, run_prompt_chain),
+)}
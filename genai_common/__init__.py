@@ -0,0 +1,47 @@
+"""
+Shared helpers used by every Gemini tool in this repository.
+
+Each tool lives in its own folder and runs as a standalone script; scripts make
+this package importable by adding the repository root to ``sys.path``.
+"""
+
+from genai_common.client import get_genai_client, reset_genai_client
+from genai_common.concurrency import gather_bounded
+from genai_common.context_cache import (ContextCache, LocalCacheStore, RequestUsage, get_context_cache,
+                                         usage_from_response)
+from genai_common.rate_limit import RateLimiter
+from genai_common.response_cache import (CachedResponse, ResponseCache, generate_content_cached,
+                                         generate_content_cached_async, get_response_cache, response_finish_reason)
+from genai_common.retry import (backoff_delay, call_with_retry, call_with_retry_async, is_retryable_error,
+                                 retry_attempt)
+from genai_common.stats import latency_summary, percentile
+from genai_common.telemetry import CallRecord, Telemetry, get_telemetry, instrument_client
+
+__all__ = [
+    "CachedResponse",
+    "CallRecord",
+    "ContextCache",
+    "LocalCacheStore",
+    "RateLimiter",
+    "RequestUsage",
+    "ResponseCache",
+    "Telemetry",
+    "backoff_delay",
+    "call_with_retry",
+    "call_with_retry_async",
+    "gather_bounded",
+    "generate_content_cached",
+    "generate_content_cached_async",
+    "get_context_cache",
+    "get_genai_client",
+    "get_response_cache",
+    "get_telemetry",
+    "instrument_client",
+    "is_retryable_error",
+    "latency_summary",
+    "percentile",
+    "reset_genai_client",
+    "response_finish_reason",
+    "retry_attempt",
+    "usage_from_response",
+]
@@ -0,0 +1,99 @@
+"""
+Process-wide Google GenAI client shared by all tools.
+
+Creating a ``genai.Client`` per request throws away its HTTP connection pool,
+so every call pays a fresh TCP + TLS handshake. ``get_genai_client`` builds
+one client lazily on first use and hands the same instance to every caller
+(and every thread) afterwards, with keep-alive connection pooling and HTTP
+timeouts configured from the environment:
+
+    GENAI_HTTP_TIMEOUT            Request timeout in seconds (default: 60)
+    GENAI_MAX_CONNECTIONS         Maximum open connections (default: 32)
+    GENAI_MAX_KEEPALIVE           Idle connections kept alive for reuse (default: 16)
+    GENAI_KEEPALIVE_EXPIRY        Seconds an idle connection is kept (default: 30)
+    GENAI_BASE_URL                API endpoint override, e.g. a local ``genai_common.fake_server``
+
+The API key is read by the SDK from ``GEMINI_API_KEY`` as before. When
+telemetry is enabled (see ``genai_common.telemetry``) every model call made
+through the shared client is recorded.
+"""
+
+import os
+import threading
+from typing import Optional
+
+import httpx
+from google import genai
+
+from genai_common.settings import env_number
+from genai_common.telemetry import get_telemetry, instrument_client
+
+# Defaults for the shared HTTP connection pool
+DEFAULT_TIMEOUT_SECONDS: float = 60.0
+DEFAULT_MAX_CONNECTIONS: int = 32
+DEFAULT_MAX_KEEPALIVE: int = 16
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+
+_client: Optional[genai.Client] = None
+_client_lock = threading.Lock()
+
+
+def build_http_options() -> genai.types.HttpOptions:
+    """
+    Builds the HTTP options (timeout, connection pool and endpoint) for the shared client.
+
+    The same pool limits are applied to the synchronous and asynchronous
+    transports so that ``client.aio`` reuses connections too.
+
+    Returns:
+        genai.types.HttpOptions: HTTP options configured from the environment.
+    """
+    timeout_seconds = env_number("GENAI_HTTP_TIMEOUT", DEFAULT_TIMEOUT_SECONDS)
+    limits = httpx.Limits(
+        max_connections=int(env_number("GENAI_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+        max_keepalive_connections=int(env_number("GENAI_MAX_KEEPALIVE", DEFAULT_MAX_KEEPALIVE)),
+        keepalive_expiry=env_number("GENAI_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY_SECONDS),
+    )
+    return genai.types.HttpOptions(
+        timeout=int(timeout_seconds * 1000),  # The SDK expects milliseconds
+        client_args={"limits": limits},
+        async_client_args={"limits": limits},
+        base_url=os.getenv("GENAI_BASE_URL") or None,
+    )
+
+
+def get_genai_client() -> genai.Client:
+    """
+    Returns the process-wide Google GenAI client, creating it on first use.
+
+    Construction is lazy and thread-safe: concurrent first calls still build
+    exactly one client. Every later call returns the same instance, so all
+    requests share its keep-alive connection pool.
+
+    Returns:
+        genai.Client: The shared, authenticated GenAI client.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                client = genai.Client(http_options=build_http_options())
+                telemetry = get_telemetry()
+                if telemetry is not None:
+                    instrument_client(client, telemetry)
+                _client = client
+    return _client
+
+
+def reset_genai_client() -> None:
+    """
+    Closes and forgets the shared client so the next call builds a new one.
+
+    Useful after changing the environment-based settings, or in a child
+    process that must not share connections with its parent.
+    """
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
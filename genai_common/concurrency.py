@@ -0,0 +1,95 @@
+"""
+Fan-out helper for the async versions of the tools' functions.
+
+``gather_bounded`` runs many coroutines from one event loop with at most
+``limit`` of them in flight, so hundreds of model calls can be issued
+without a thread per call and without opening hundreds of connections at
+once. Combine it with ``RateLimiter.acquire_async`` to stay under the quota:
+
+    results = await gather_bounded((create_summary_async(client, text, BULLET_PROMPT) for text in texts),
+                                   limit=16)
+
+Configured from the environment:
+
+    GENAI_ASYNC_CONCURRENCY       Default in-flight limit of ``gather_bounded`` (default: 16)
+"""
+
+import asyncio
+from typing import Any, Awaitable, Iterable, Optional
+
+from genai_common.settings import env_number
+
+# Default number of coroutines awaited at the same time
+DEFAULT_CONCURRENCY: int = 16
+
+
+async def gather_bounded(awaitables: Iterable[Awaitable[Any]], limit: Optional[int] = None,
+                         return_exceptions: bool = False) -> list[Any]:
+    """
+    Awaits every awaitable with at most ``limit`` running at once.
+
+    Awaitables are consumed lazily from the iterable, so a generator of
+    coroutines is only materialized ``limit`` items at a time.
+
+    Args:
+        awaitables (Iterable[Awaitable[Any]]): Coroutines (or other awaitables) to run.
+        limit (Optional[int]): Maximum awaitables in flight; defaults to
+            ``GENAI_ASYNC_CONCURRENCY`` or ``DEFAULT_CONCURRENCY``.
+        return_exceptions (bool): Return exceptions in place of results instead
+            of raising the first one, as ``asyncio.gather`` does. Without it, the
+            first error cancels the remaining awaitables and waits for them to
+            stop before it is raised; a cancelled awaitable counts as raising
+            ``asyncio.CancelledError``.
+
+    Returns:
+        list[Any]: The results in the order of ``awaitables``.
+
+    Raises:
+        ValueError: If ``limit`` is below 1.
+    """
+    limit = int(limit if limit is not None else env_number("GENAI_ASYNC_CONCURRENCY", DEFAULT_CONCURRENCY))
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    results: list[Any] = []
+    pending: dict[asyncio.Future, int] = {}
+
+    def collect(done: set) -> None:
+        # Retrieve every finished task's outcome before raising, so no exception goes unobserved
+        first_error = None
+        for task in done:
+            index = pending.pop(task)
+            error = asyncio.CancelledError() if task.cancelled() else task.exception()
+            results[index] = error if error is not None else task.result()
+            if first_error is None:
+                first_error = error
+        if first_error is not None and not return_exceptions:
+            raise first_error
+
+    items = enumerate(awaitables)
+    try:
+        while True:
+            # Make room before taking the next awaitable, so none is created and then left unawaited
+            if len(pending) >= limit:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                collect(done)
+            item = next(items, None)
+            if item is None:
+                break
+            results.append(None)
+            pending[asyncio.ensure_future(item[1])] = item[0]
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            collect(done)
+    except BaseException:
+        # The awaitables not started yet will never run; close them so they are not reported as never awaited
+        for _, awaitable in items:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+        raise
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            # Let the cancelled tasks finish and retrieve their exceptions before the error propagates
+            await asyncio.gather(*pending, return_exceptions=True)
+    return results
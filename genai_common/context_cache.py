@@ -0,0 +1,403 @@
+"""
+Context caching for prompts that share a long, fixed prefix.
+
+Tools such as the resume analyzer and the code explainer send the same system
+instruction and the same rubric with every request; only the resume or the
+code changes. ``ContextCache`` uploads that shared prefix once with
+``client.caches.create`` and references it from later requests through
+``cached_content``, so the prefix is not sent (or billed at the full input
+rate) again.
+
+``ContextCache.generate`` returns the response together with a
+``RequestUsage`` holding the input, cached and output token counts of the
+request, so the savings can be measured. When the model rejects the prefix
+(for example because it is shorter than the minimum cacheable size) the
+request falls back to sending the full prompt.
+
+For tests and offline runs, ``emulate=True`` keeps the cache in a local
+``LocalCacheStore`` instead: prefixes are expanded back into each request and
+the cached token counts are estimated.
+
+Configured from the environment:
+
+    GENAI_CONTEXT_CACHE           "1" to use context caching in the tools
+    GENAI_CONTEXT_CACHE_TTL       Lifetime of uploaded prefixes in seconds (default: 3600)
+    GENAI_CONTEXT_CACHE_EMULATE   "1" to emulate the cache locally instead of calling the API
+"""
+
+import hashlib
+import itertools
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from google import genai
+from google.genai import errors
+
+from genai_common.response_cache import generate_content_cached
+from genai_common.settings import env_flag, env_number
+
+# Default lifetime of an uploaded prefix
+DEFAULT_TTL_SECONDS: float = 3600.0
+# Rough token estimate used when the API does not report counts
+CHARS_PER_TOKEN: int = 4
+# Upload errors that reject a prefix for good: INVALID_ARGUMENT (e.g. below the
+# minimum cacheable token count) and NOT_FOUND (a model without context caching)
+REJECTION_STATUS_CODES: frozenset[int] = frozenset({400, 404})
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the token count of a text without calling the API.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: The estimated token count.
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+@dataclass
+class RequestUsage:
+    """
+    Token counts of one request.
+
+    Attributes:
+        input_tokens (int): Prompt tokens, including the cached prefix.
+        cached_tokens (int): Prompt tokens served from the context cache.
+        output_tokens (int): Generated tokens.
+    """
+
+    input_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def uncached_input_tokens(self) -> int:
+        """Prompt tokens sent and billed at the full input rate."""
+        return self.input_tokens - self.cached_tokens
+
+    def summary(self) -> str:
+        """
+        Formats the counts for display.
+
+        Returns:
+            str: A one-line summary such as "Input tokens: 1200 (cached: 1000) | Output tokens: 350".
+        """
+        return (f"Input tokens: {self.input_tokens} (cached: {self.cached_tokens}) | "
+                f"Output tokens: {self.output_tokens}")
+
+
+def usage_from_response(response: Any, estimated_input: int = 0, estimated_cached: int = 0) -> RequestUsage:
+    """
+    Reads the token counts from a response's ``usage_metadata``.
+
+    Args:
+        response (Any): An SDK response, or a response served from the response cache.
+        estimated_input (int): Input tokens to report when the response has no counts.
+        estimated_cached (int): Cached tokens to report when the response has no cached count.
+
+    Returns:
+        RequestUsage: The counts of the request; zeros for a response-cache hit.
+    """
+    if getattr(response, "cached", False):
+        return RequestUsage()
+    metadata = getattr(response, "usage_metadata", None)
+    input_tokens = getattr(metadata, "prompt_token_count", None) or estimated_input
+    cached_tokens = getattr(metadata, "cached_content_token_count", None) or estimated_cached
+    output_tokens = getattr(metadata, "candidates_token_count", None)
+    if output_tokens is None:
+        output_tokens = estimate_tokens(getattr(response, "text", None) or "")
+    return RequestUsage(input_tokens=input_tokens, cached_tokens=min(cached_tokens, input_tokens),
+                        output_tokens=output_tokens)
+
+
+class LocalCacheStore:
+    """
+    In-process stand-in for ``client.caches`` used when the cache is emulated.
+
+    Supports the ``create``, ``get`` and ``delete`` calls ``ContextCache``
+    makes, and keeps the uploaded prefixes so they can be expanded back into
+    each request.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, genai.types.CachedContent] = {}
+        self._prefixes: dict[str, tuple[Optional[str], list[str]]] = {}
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def create(self, *, model: str, config: genai.types.CreateCachedContentConfig) -> genai.types.CachedContent:
+        """Stores a prefix and returns its cache entry, with an estimated token count."""
+        contents = [content if isinstance(content, str) else "".join(part.text or "" for part in content.parts)
+                    for content in (config.contents or [])]
+        system_instruction = config.system_instruction if isinstance(config.system_instruction, str) else None
+        tokens = estimate_tokens((system_instruction or "") + "".join(contents))
+        with self._lock:
+            name = f"cachedContents/local-{next(self._counter)}"
+            self._prefixes[name] = (system_instruction, contents)
+            self._entries[name] = genai.types.CachedContent(
+                name=name, model=model, display_name=config.display_name,
+                usage_metadata=genai.types.CachedContentUsageMetadata(total_token_count=tokens),
+            )
+        return self._entries[name]
+
+    def get(self, *, name: str) -> genai.types.CachedContent:
+        """Returns a stored cache entry."""
+        with self._lock:
+            return self._entries[name]
+
+    def delete(self, *, name: str) -> None:
+        """Removes a stored cache entry."""
+        with self._lock:
+            self._entries.pop(name, None)
+            self._prefixes.pop(name, None)
+
+    def prefix(self, name: str) -> tuple[Optional[str], list[str]]:
+        """Returns the system instruction and contents stored under ``name``."""
+        with self._lock:
+            return self._prefixes[name]
+
+
+@dataclass
+class _Entry:
+    name: str
+    expires_at: float
+    token_count: int
+
+
+class ContextCache:
+    """
+    Uploads shared prompt prefixes once and reuses them across requests.
+
+    Thread-safe. Prefixes are keyed by model, system instruction and prefix
+    text; ``stats()`` reports requests, token counts and cache uploads since
+    the cache was created.
+    """
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS, emulate: bool = False):
+        """
+        Creates the cache.
+
+        Args:
+            ttl_seconds (float): Lifetime of each uploaded prefix.
+            emulate (bool): Keep prefixes in a ``LocalCacheStore`` instead of calling the API.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.local_store: Optional[LocalCacheStore] = LocalCacheStore() if emulate else None
+        self._entries: dict[str, _Entry] = {}
+        self._rejected: set[str] = set()
+        self._uploading: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.cached_requests = 0
+        self.uploads = 0
+        self.input_tokens = 0
+        self.cached_tokens = 0
+
+    @staticmethod
+    def make_key(model: str, system_instruction: Optional[str], prefix: str) -> str:
+        """
+        Builds the key identifying a prefix.
+
+        Args:
+            model (str): Model name.
+            system_instruction (Optional[str]): System instruction shared by the requests.
+            prefix (str): Fixed prompt text shared by the requests.
+
+        Returns:
+            str: A sha256 hex digest.
+        """
+        payload = json.dumps([model, system_instruction, prefix], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _caches(self, client: genai.Client) -> Any:
+        return self.local_store if self.local_store is not None else client.caches
+
+    def lookup(self, client: genai.Client, model: str, system_instruction: Optional[str],
+               prefix: str) -> Optional[_Entry]:
+        """
+        Returns the cache entry for a prefix, uploading it on first use or after it expired.
+
+        The upload runs outside the cache lock, so requests for other prefixes
+        are not held up by it. Concurrent requests for the same prefix wait for
+        the one upload instead of starting their own. A prefix the model
+        rejects (too short to cache, or a model without context caching) is
+        never uploaded again; after any other upload error (rate limit, server
+        error, timeout) the waiting requests fall back to the full prompt and
+        a later request tries the upload again.
+
+        Args:
+            client (genai.Client): Authenticated GenAI client.
+            model (str): Model name.
+            system_instruction (Optional[str]): System instruction shared by the requests.
+            prefix (str): Fixed prompt text shared by the requests.
+
+        Returns:
+            Optional[_Entry]: The entry, or None when the prompt must be sent in full.
+        """
+        key = self.make_key(model, system_instruction, prefix)
+        with self._lock:
+            entry = self._usable_entry(key)
+            if entry is not None or key in self._rejected:
+                return entry
+            upload = self._uploading.get(key)
+            if upload is None:
+                upload = self._uploading[key] = threading.Event()
+                uploader = True
+            else:
+                uploader = False
+        if not uploader:
+            upload.wait()
+            with self._lock:
+                return self._usable_entry(key)
+
+        entry, rejected = None, False
+        try:
+            cached = self._caches(client).create(
+                model=model,
+                config=genai.types.CreateCachedContentConfig(
+                    system_instruction=system_instruction,
+                    contents=[prefix],
+                    ttl=f"{int(self.ttl_seconds)}s",
+                    display_name=f"prefix-{key[:12]}",
+                ),
+            )
+            usage = getattr(cached, "usage_metadata", None)
+            token_count = getattr(usage, "total_token_count", None) or estimate_tokens((system_instruction or "") + prefix)
+            entry = _Entry(name=cached.name, expires_at=time.time() + self.ttl_seconds, token_count=token_count)
+        except Exception as e:
+            # Transient errors only make this request (and those waiting on it) send the full prompt
+            rejected = isinstance(e, errors.APIError) and e.code in REJECTION_STATUS_CODES
+        finally:
+            with self._lock:
+                if entry is not None:
+                    self._entries[key] = entry
+                    self.uploads += 1
+                if rejected:
+                    self._rejected.add(key)
+                del self._uploading[key]
+            upload.set()
+        return entry
+
+    def _usable_entry(self, key: str) -> Optional[_Entry]:
+        """Returns the entry for ``key`` unless it is missing or about to expire. Call with the lock held."""
+        entry = self._entries.get(key)
+        # Re-upload slightly before expiry so no request references an expired cache
+        if entry is not None and entry.expires_at - time.time() > 30:
+            return entry
+        return None
+
+    def generate(self, client: genai.Client, *, model: str, system_instruction: Optional[str], prefix: str,
+                 contents: str, config: Optional[genai.types.GenerateContentConfig] = None,
+                 cacheable: Optional[bool] = None) -> tuple[Any, RequestUsage]:
+        """
+        Generates content for ``prefix`` + ``contents``, sending the prefix through the context cache.
+
+        Requests go through ``generate_content_cached``, so the response cache
+        still applies when it is enabled. SDK errors propagate unchanged.
+
+        Args:
+            client (genai.Client): Authenticated GenAI client.
+            model (str): Model name.
+            system_instruction (Optional[str]): System instruction shared by the requests.
+            prefix (str): Fixed prompt text shared by the requests.
+            contents (str): The part of the prompt that changes per request.
+            config (Optional[genai.types.GenerateContentConfig]): Other generation
+                settings (temperature, ...); its system instruction is ignored.
+            cacheable (Optional[bool]): Passed to ``generate_content_cached``.
+
+        Returns:
+            tuple[Any, RequestUsage]: The response and the token counts of the request.
+        """
+        config = config or genai.types.GenerateContentConfig()
+        entry = self.lookup(client, model, system_instruction, prefix)
+        full_input = estimate_tokens((system_instruction or "") + prefix + contents)
+        if entry is None:
+            request_config = config.model_copy(update={"system_instruction": system_instruction})
+            response = generate_content_cached(client, model=model, contents=[prefix, contents], config=request_config,
+                                               cacheable=cacheable)
+            usage = usage_from_response(response, estimated_input=full_input)
+        elif self.local_store is not None:
+            # Emulation: expand the stored prefix and report it as cached
+            stored_instruction, stored_contents = self.local_store.prefix(entry.name)
+            request_config = config.model_copy(update={"system_instruction": stored_instruction})
+            response = generate_content_cached(client, model=model, contents=[*stored_contents, contents],
+                                               config=request_config, cacheable=cacheable)
+            usage = usage_from_response(response, estimated_input=full_input, estimated_cached=entry.token_count)
+            if usage.input_tokens:
+                usage.cached_tokens = min(entry.token_count, usage.input_tokens)
+        else:
+            request_config = config.model_copy(update={"system_instruction": None, "cached_content": entry.name})
+            response = generate_content_cached(client, model=model, contents=contents, config=request_config,
+                                               cacheable=cacheable)
+            usage = usage_from_response(response, estimated_input=full_input, estimated_cached=entry.token_count)
+        with self._lock:
+            self.requests += 1
+            self.cached_requests += entry is not None
+            self.input_tokens += usage.input_tokens
+            self.cached_tokens += usage.cached_tokens
+        return response, usage
+
+    def stats(self) -> dict:
+        """
+        Returns the request and token counters.
+
+        Returns:
+            dict: ``requests``, ``cached_requests``, ``uploads``, ``input_tokens``,
+            ``cached_tokens`` and the ``cached_ratio`` of input tokens.
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "cached_requests": self.cached_requests,
+                "uploads": self.uploads,
+                "input_tokens": self.input_tokens,
+                "cached_tokens": self.cached_tokens,
+                "cached_ratio": self.cached_tokens / self.input_tokens if self.input_tokens else 0.0,
+            }
+
+    def release(self, client: genai.Client) -> None:
+        """
+        Deletes every uploaded prefix so it stops accruing storage charges.
+
+        Args:
+            client (genai.Client): Authenticated GenAI client.
+        """
+        with self._lock:
+            entries, self._entries = list(self._entries.values()), {}
+        for entry in entries:
+            try:
+                self._caches(client).delete(name=entry.name)
+            except Exception:
+                # The entry may already have expired
+                pass
+
+
+_context_cache: Optional[ContextCache] = None
+_context_cache_lock = threading.Lock()
+
+
+def get_context_cache() -> Optional[ContextCache]:
+    """
+    Returns the process-wide context cache configured from the environment.
+
+    Returns:
+        Optional[ContextCache]: The shared cache, or None when context caching
+        is not enabled (``GENAI_CONTEXT_CACHE`` is not set).
+    """
+    global _context_cache
+    if not env_flag("GENAI_CONTEXT_CACHE"):
+        return None
+    if _context_cache is None:
+        with _context_cache_lock:
+            if _context_cache is None:
+                _context_cache = ContextCache(
+                    ttl_seconds=env_number("GENAI_CONTEXT_CACHE_TTL", DEFAULT_TTL_SECONDS),
+                    emulate=env_flag("GENAI_CONTEXT_CACHE_EMULATE"),
+                )
+    return _context_cache
@@ -0,0 +1,503 @@
+"""
+Deterministic local stand-in for the Gemini API, for offline runs and benchmarks.
+
+``FakeGeminiServer`` serves the REST endpoints the tools use, so the shared
+``genai.Client`` (sync and ``client.aio``) can be pointed at it with
+``GENAI_BASE_URL`` and every pipeline runs without network access or an API
+key:
+
+    POST /v1beta/models/{model}:generateContent
+    POST /v1beta/models/{model}:streamGenerateContent?alt=sse
+    POST /v1beta/models/{model}:batchEmbedContents  (and :embedContent)
+    POST /v1beta/cachedContents, GET/DELETE /v1beta/cachedContents/{id}
+
+Responses are derived from a hash of the request, so the same request always
+gets the same text, token counts and embedding:
+
+- Text responses are pseudo-random words; when the request asks for JSON
+  with a ``responseSchema``, a JSON document matching the schema is returned.
+- Embeddings are hashed bag-of-words vectors (unit length), so texts sharing
+  words get similar vectors and identical texts identical ones.
+- Latency is sampled from a configurable distribution (``LatencyModel``);
+  streamed responses spread it over their chunks.
+- A share of requests can fail with 429 (RESOURCE_EXHAUSTED) or 500, and a
+  requests-per-minute quota can be enforced with real 429s.
+
+Latency draws and injected failures come from a generator seeded with the
+server seed, the request body and how often that body was seen before, so a
+run with the same requests is repeatable while retries of a failed request
+can still succeed.
+
+Usage:
+
+    with FakeGeminiServer(latency=LatencyModel.parse("lognormal:0.2,0.5"), rate_limit_rate=0.05) as server:
+        os.environ["GENAI_BASE_URL"] = server.url
+        ...
+
+    python -m genai_common.fake_server --port 8765 --latency normal:0.3,0.1 --error-rate 0.01
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+# Defaults of the generated responses
+DEFAULT_RESPONSE_WORDS: int = 120
+DEFAULT_EMBEDDING_DIM: int = 768
+DEFAULT_STREAM_CHUNKS: int = 8
+# Rough characters-per-token ratio used for the reported token counts
+CHARS_PER_TOKEN: int = 4
+
+# Words the generated text is made of
+_VOCABULARY = (
+    "the model result data value system user team project plan review update report change code test "
+    "quality release design feature issue budget meeting action decision summary customer service "
+    "performance latency memory cache request response process batch stream token input output "
+    "analysis risk timeline owner priority goal metric improve reduce increase measure deliver"
+).split()
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+@dataclass
+class LatencyModel:
+    """
+    Distribution of the simulated response time of a request, in seconds.
+
+    Attributes:
+        kind (str): "constant", "uniform", "normal", "lognormal" or "exponential".
+        a (float): Constant value, uniform low bound, normal/lognormal median, or exponential mean.
+        b (float): Uniform high bound, normal standard deviation, or lognormal sigma.
+    """
+
+    kind: str = "constant"
+    a: float = 0.0
+    b: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyModel":
+        """
+        Parses a spec such as ``constant:0.1``, ``uniform:0.05,0.3``, ``normal:0.3,0.1``,
+        ``lognormal:0.2,0.5`` or ``exponential:0.25``.
+
+        Args:
+            spec (str): The distribution and its parameters.
+
+        Returns:
+            LatencyModel: The parsed model.
+
+        Raises:
+            ValueError: If the spec is malformed.
+        """
+        kind, _, params = spec.partition(":")
+        try:
+            values = [float(value) for value in params.split(",") if value.strip()]
+        except ValueError:
+            raise ValueError(f"Invalid latency spec: {spec!r}")
+        if kind not in {"constant", "uniform", "normal", "lognormal", "exponential"} or len(values) > 2:
+            raise ValueError(f"Invalid latency spec: {spec!r}")
+        return cls(kind, *values)
+
+    def sample(self, rng: random.Random) -> float:
+        """
+        Draws one latency.
+
+        Args:
+            rng (random.Random): Source of randomness.
+
+        Returns:
+            float: Seconds, never negative.
+        """
+        if self.kind == "uniform":
+            value = rng.uniform(self.a, self.b)
+        elif self.kind == "normal":
+            value = rng.gauss(self.a, self.b)
+        elif self.kind == "lognormal":
+            value = self.a * math.exp(rng.gauss(0.0, self.b)) if self.a > 0 else 0.0
+        elif self.kind == "exponential":
+            value = rng.expovariate(1.0 / self.a) if self.a > 0 else 0.0
+        else:
+            value = self.a
+        return max(0.0, value)
+
+
+def hashed_embedding(text: str, dim: int = DEFAULT_EMBEDDING_DIM) -> list[float]:
+    """
+    Builds a deterministic unit-length embedding from the words of a text.
+
+    Every lowercased word adds +1 or -1 to a bucket chosen by its hash, so
+    texts that share words have a positive cosine similarity.
+
+    Args:
+        text (str): The text to embed.
+        dim (int): Vector dimension.
+
+    Returns:
+        list[float]: The embedding.
+    """
+    vector = [0.0] * dim
+    for word in _TOKEN_PATTERN.findall(text.lower()) or [text]:
+        digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+        bucket = int.from_bytes(digest[:4], "little") % dim
+        vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+def _estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _request_text(body: dict) -> str:
+    """Joins the text parts of the system instruction and contents of a request."""
+    texts = []
+    for content in [body.get("systemInstruction") or {}] + list(body.get("contents") or []):
+        texts.extend(part.get("text", "") for part in content.get("parts") or [] if isinstance(part, dict))
+    return "\n".join(texts)
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(_VOCABULARY) for _ in range(count))
+
+
+def _value_for_schema(schema: dict, rng: random.Random) -> Any:
+    """Generates a value matching a (Gemini / OpenAPI subset) response schema."""
+    kind = str(schema.get("type", "STRING")).upper()
+    if kind == "OBJECT":
+        properties = schema.get("properties") or {}
+        order = schema.get("propertyOrdering") or list(properties)
+        return {name: _value_for_schema(properties[name], rng) for name in order if name in properties}
+    if kind == "ARRAY":
+        return [_value_for_schema(schema.get("items") or {}, rng) for _ in range(rng.randint(2, 4))]
+    if kind == "INTEGER":
+        return rng.randint(0, 100)
+    if kind == "NUMBER":
+        return round(rng.uniform(0, 100), 2)
+    if kind == "BOOLEAN":
+        return rng.random() < 0.5
+    if schema.get("enum"):
+        return rng.choice(schema["enum"])
+    return _words(rng, rng.randint(3, 8)).capitalize()
+
+
+class _FakeHTTPServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops connections when many clients connect at once
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+class FakeGeminiServer:
+    """
+    Threaded local HTTP server emulating the Gemini endpoints used by the tools.
+
+    ``stats()`` returns the number of requests per endpoint and status.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: Optional[LatencyModel] = None,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, requests_per_minute: Optional[float] = None,
+                 response_words: int = DEFAULT_RESPONSE_WORDS, embedding_dim: int = DEFAULT_EMBEDDING_DIM,
+                 stream_chunks: int = DEFAULT_STREAM_CHUNKS, seed: int = 0):
+        """
+        Creates the server (call ``start`` or use it as a context manager).
+
+        Args:
+            host (str): Interface to bind.
+            port (int): Port to bind; 0 picks a free one.
+            latency (Optional[LatencyModel]): Response time distribution; no delay by default.
+            error_rate (float): Share of requests answered with a 500 error.
+            rate_limit_rate (float): Share of requests answered with a 429 error.
+            requests_per_minute (Optional[float]): Quota over a sliding minute; requests above it get a 429.
+            response_words (int): Approximate length of generated texts.
+            embedding_dim (int): Dimension of the returned embeddings.
+            stream_chunks (int): Chunks a streamed response is split into.
+            seed (int): Seed of every generated response, latency and failure.
+        """
+        self.latency = latency or LatencyModel()
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.requests_per_minute = requests_per_minute
+        self.response_words = response_words
+        self.embedding_dim = embedding_dim
+        self.stream_chunks = max(1, stream_chunks)
+        self.seed = seed
+        self._lock = threading.Lock()
+        self._seen: Counter = Counter()
+        self._counts: Counter = Counter()
+        self._recent: deque = deque()
+        self._cached_contents: dict[str, dict] = {}
+        # Names are never reused, so deleting an entry cannot make a later one overwrite a live entry
+        self._cached_content_ids = itertools.count(1)
+        self._thread: Optional[threading.Thread] = None
+        self._httpd = _FakeHTTPServer((host, port), self._handler_class())
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as ``GENAI_BASE_URL``."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGeminiServer":
+        """Serves requests on a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-gemini", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops serving and closes the socket."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeGeminiServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def stats(self) -> dict:
+        """
+        Returns the request counters.
+
+        Returns:
+            dict: Counts keyed by ``"<endpoint> <status>"``.
+        """
+        with self._lock:
+            return dict(self._counts)
+
+    def _rng(self, raw_body: bytes) -> random.Random:
+        """Generator for one request: seeded by the body and how often it was seen before."""
+        with self._lock:
+            digest = hashlib.sha256(raw_body).hexdigest()
+            occurrence = self._seen[digest]
+            self._seen[digest] += 1
+        return random.Random(f"{self.seed}:{digest}:{occurrence}")
+
+    def _content_rng(self, raw_body: bytes) -> random.Random:
+        """Generator for the response content, the same for every occurrence of the body."""
+        return random.Random(f"{self.seed}:{hashlib.sha256(raw_body).hexdigest()}")
+
+    def _over_quota(self) -> bool:
+        if not self.requests_per_minute:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            while self._recent and now - self._recent[0] > 60.0:
+                self._recent.popleft()
+            if len(self._recent) >= self.requests_per_minute:
+                return True
+            self._recent.append(now)
+            return False
+
+    def _injected_error(self, rng: random.Random) -> Optional[tuple[int, str, str]]:
+        """Returns the (status, reason, message) of an injected failure, if this request gets one."""
+        draw = rng.random()
+        if self._over_quota() or draw < self.rate_limit_rate:
+            return 429, "RESOURCE_EXHAUSTED", "Resource has been exhausted (e.g. check quota)."
+        if draw < self.rate_limit_rate + self.error_rate:
+            return 500, "INTERNAL", "An internal error has occurred."
+        return None
+
+    def _generate(self, model: str, body: dict, raw_body: bytes) -> tuple[str, dict]:
+        """Builds the response text and usage metadata of a generation request."""
+        rng = self._content_rng(raw_body)
+        config = body.get("generationConfig") or {}
+        schema = config.get("responseSchema") or config.get("responseJsonSchema")
+        if schema:
+            text = json.dumps(_value_for_schema(schema, rng), ensure_ascii=False)
+        elif config.get("responseMimeType") == "application/json":
+            text = json.dumps({"text": _words(rng, self.response_words // 4)})
+        else:
+            count = max(1, int(rng.uniform(0.5, 1.5) * self.response_words))
+            text = ". ".join(_words(rng, 12).capitalize() for _ in range(max(1, count // 12))) + "."
+        prompt_tokens = _estimate_tokens(_request_text(body))
+        usage = {"promptTokenCount": prompt_tokens, "candidatesTokenCount": _estimate_tokens(text)}
+        with self._lock:
+            cached = self._cached_contents.get(body.get("cachedContent") or "")
+        if cached is not None:
+            usage["cachedContentTokenCount"] = cached["usageMetadata"]["totalTokenCount"]
+            usage["promptTokenCount"] += usage["cachedContentTokenCount"]
+        usage["totalTokenCount"] = usage["promptTokenCount"] + usage["candidatesTokenCount"]
+        return text, usage
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; without this each response waits for a delayed ACK
+            disable_nagle_algorithm = True
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _send_json(self, status: int, payload: dict) -> None:
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=UTF-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_error(self, status: int, reason: str, message: str) -> None:
+                self._send_json(status, {"error": {"code": status, "message": message, "status": reason}})
+
+            def _count(self, endpoint: str, status: int) -> None:
+                with server._lock:
+                    server._counts[f"{endpoint} {status}"] += 1
+
+            def do_GET(self) -> None:
+                name = urlparse(self.path).path.split("/v1beta/", 1)[-1]
+                with server._lock:
+                    cached = server._cached_contents.get(name)
+                self._count("cachedContents.get", 200 if cached else 404)
+                if cached is None:
+                    self._send_error(404, "NOT_FOUND", f"{name} not found")
+                else:
+                    self._send_json(200, cached)
+
+            def do_DELETE(self) -> None:
+                name = urlparse(self.path).path.split("/v1beta/", 1)[-1]
+                with server._lock:
+                    server._cached_contents.pop(name, None)
+                self._count("cachedContents.delete", 200)
+                self._send_json(200, {})
+
+            def do_POST(self) -> None:
+                raw_body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                try:
+                    body = json.loads(raw_body or b"{}")
+                except ValueError:
+                    self._send_error(400, "INVALID_ARGUMENT", "Request body is not valid JSON.")
+                    return
+                path = urlparse(self.path).path
+                if path.endswith("/cachedContents"):
+                    self._create_cached_content(body)
+                    return
+                match = re.search(r"/models/([^/:]+):(\w+)$", path)
+                if not match:
+                    self._send_error(404, "NOT_FOUND", f"Unknown endpoint: {path}")
+                    return
+                model, method = match.groups()
+                rng = server._rng(raw_body)
+                delay = server.latency.sample(rng)
+                error = server._injected_error(rng)
+                if error is not None:
+                    time.sleep(delay)
+                    self._count(method, error[0])
+                    self._send_error(*error)
+                elif method == "generateContent":
+                    time.sleep(delay)
+                    text, usage = server._generate(model, body, raw_body)
+                    self._count(method, 200)
+                    self._send_json(200, {
+                        "candidates": [{"content": {"parts": [{"text": text}], "role": "model"},
+                                        "finishReason": "STOP", "index": 0}],
+                        "usageMetadata": usage,
+                        "modelVersion": model,
+                    })
+                elif method == "streamGenerateContent":
+                    self._stream(model, body, raw_body, delay)
+                elif method in ("batchEmbedContents", "embedContent"):
+                    time.sleep(delay)
+                    requests = body.get("requests") or [body]
+                    embeddings = [{"values": hashed_embedding(_request_text({"contents": [request.get("content")]}),
+                                                              server.embedding_dim)}
+                                  for request in requests]
+                    self._count(method, 200)
+                    self._send_json(200, {"embeddings": embeddings} if method == "batchEmbedContents"
+                                    else {"embedding": embeddings[0]})
+                else:
+                    self._count(method, 404)
+                    self._send_error(404, "NOT_FOUND", f"Method {method} is not emulated.")
+
+            def _stream(self, model: str, body: dict, raw_body: bytes, delay: float) -> None:
+                """Sends the response as server-sent events, spreading the latency over the chunks."""
+                text, usage = server._generate(model, body, raw_body)
+                words = text.split(" ")
+                size = max(1, math.ceil(len(words) / server.stream_chunks))
+                chunks = [" ".join(words[i:i + size]) + (" " if i + size < len(words) else "")
+                          for i in range(0, len(words), size)]
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for index, chunk in enumerate(chunks):
+                    time.sleep(delay / len(chunks))
+                    payload = {"candidates": [{"content": {"parts": [{"text": chunk}], "role": "model"}, "index": 0}],
+                               "modelVersion": model}
+                    if index == len(chunks) - 1:
+                        payload["candidates"][0]["finishReason"] = "STOP"
+                        payload["usageMetadata"] = usage
+                    event = f"data: {json.dumps(payload)}\r\n\r\n".encode("utf-8")
+                    self.wfile.write(f"{len(event):X}\r\n".encode("ascii") + event + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+                self._count("streamGenerateContent", 200)
+
+            def _create_cached_content(self, body: dict) -> None:
+                tokens = _estimate_tokens(_request_text(body))
+                with server._lock:
+                    name = f"cachedContents/{next(server._cached_content_ids)}"
+                    cached = {"name": name, "model": body.get("model", ""),
+                              "usageMetadata": {"totalTokenCount": tokens}}
+                    server._cached_contents[name] = cached
+                self._count("cachedContents.create", 200)
+                self._send_json(200, cached)
+
+        return Handler
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """
+    Parses the command-line options of the standalone server.
+
+    Args:
+        argv (Optional[list[str]]): Arguments to parse; defaults to ``sys.argv``.
+
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(description="Run a local fake Gemini API server.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8765, help="Port to bind (default: 8765).")
+    parser.add_argument("--latency", type=LatencyModel.parse, default=LatencyModel(),
+                        help="Latency distribution, e.g. constant:0.1, uniform:0.05,0.3, normal:0.3,0.1, "
+                             "lognormal:0.2,0.5 or exponential:0.25 (default: no delay).")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with 500.")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests failing with 429.")
+    parser.add_argument("--rpm", type=float, help="Requests-per-minute quota enforced with 429s.")
+    parser.add_argument("--response-words", type=int, default=DEFAULT_RESPONSE_WORDS,
+                        help=f"Approximate words per generated text (default: {DEFAULT_RESPONSE_WORDS}).")
+    parser.add_argument("--embedding-dim", type=int, default=DEFAULT_EMBEDDING_DIM,
+                        help=f"Embedding dimension (default: {DEFAULT_EMBEDDING_DIM}).")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of all generated responses (default: 0).")
+    return parser.parse_args(argv)
+
+
+def main() -> None:
+    """Runs the server in the foreground until interrupted."""
+    args = parse_args()
+    server = FakeGeminiServer(args.host, args.port, args.latency, args.error_rate, args.rate_limit_rate,
+                              args.rpm, args.response_words, args.embedding_dim, seed=args.seed)
+    print(f"Fake Gemini API listening on {server.url} (set GENAI_BASE_URL={server.url})", flush=True)
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Client-side rate limiting for concurrent Gemini requests.
+
+``RateLimiter`` is a thread-safe token bucket over two budgets, requests per
+minute and (estimated) tokens per minute, shared by every worker of a batch
+job so the job stays under the API quota instead of running into 429 errors.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Thread-safe token-bucket limiter for requests per minute and tokens per minute.
+
+    Both budgets refill continuously. ``acquire`` blocks until a request of the
+    given size fits in both buckets; a request larger than the whole
+    tokens-per-minute budget is clamped so it can still go through.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None):
+        """
+        Creates a limiter; a limit of None disables that budget.
+
+        Args:
+            requests_per_minute (Optional[float]): Maximum requests started per minute.
+            tokens_per_minute (Optional[float]): Maximum estimated tokens sent per minute.
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = requests_per_minute or 0.0
+        self._tokens = tokens_per_minute or 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed_minutes = (now - self._updated) / 60.0
+        self._updated = now
+        if self.requests_per_minute:
+            self._requests = min(self.requests_per_minute, self._requests + elapsed_minutes * self.requests_per_minute)
+        if self.tokens_per_minute:
+            self._tokens = min(self.tokens_per_minute, self._tokens + elapsed_minutes * self.tokens_per_minute)
+
+    def _try_acquire(self, tokens: int) -> float:
+        """
+        Takes one request carrying ``tokens`` tokens from the buckets if both allow it.
+
+        Returns:
+            float: 0.0 when acquired, otherwise the seconds to wait before trying again.
+        """
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+        with self._lock:
+            self._refill(time.monotonic())
+            wait_minutes = 0.0
+            if self.requests_per_minute and self._requests < 1:
+                wait_minutes = max(wait_minutes, (1 - self._requests) / self.requests_per_minute)
+            if self.tokens_per_minute and self._tokens < tokens:
+                wait_minutes = max(wait_minutes, (tokens - self._tokens) / self.tokens_per_minute)
+            if wait_minutes == 0.0:
+                if self.requests_per_minute:
+                    self._requests -= 1
+                if self.tokens_per_minute:
+                    self._tokens -= tokens
+            return wait_minutes * 60.0
+
+    def acquire(self, tokens: int = 0) -> None:
+        """
+        Blocks until one request carrying ``tokens`` tokens may be sent.
+
+        Args:
+            tokens (int): Estimated tokens the request will send.
+        """
+        while True:
+            wait_seconds = self._try_acquire(tokens)
+            if wait_seconds == 0.0:
+                return
+            time.sleep(wait_seconds)
+
+    async def acquire_async(self, tokens: int = 0) -> None:
+        """
+        Waits without blocking the event loop until one request carrying ``tokens`` tokens may be sent.
+
+        Shares the buckets with ``acquire``, so threads and coroutines can use the same limiter.
+
+        Args:
+            tokens (int): Estimated tokens the request will send.
+        """
+        while True:
+            wait_seconds = self._try_acquire(tokens)
+            if wait_seconds == 0.0:
+                return
+            await asyncio.sleep(wait_seconds)
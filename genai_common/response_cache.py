@@ -0,0 +1,457 @@
+"""
+Response cache for ``generate_content`` calls.
+
+Regression and CI jobs send the same prompts over and over. ``ResponseCache``
+stores the text, finish reason and token usage of each response under a key
+built from the model, the generation config (system instruction, temperature,
+top_p, ...) and the contents, in two tiers:
+
+- an in-memory LRU tier, bounded by entry count
+- an optional on-disk SQLite tier, bounded by entry count, shared across runs
+
+Both tiers honour a TTL. Requests whose temperature is above
+``max_temperature`` bypass the cache entirely, so that sampled outputs are
+not silently replayed. By default only greedy (temperature 0) requests are
+cached; a cache that should replay sampled outputs is created with a higher
+``max_temperature`` (or None for no limit). A single call site decides for
+itself with ``cacheable=``: tools whose output is meant to be the same for
+the same input (summaries, extractions, explanations) pass True and are
+cached at any temperature.
+
+The cache is off unless enabled through the environment:
+
+    GENAI_CACHE                   "1" to cache responses in memory
+    GENAI_CACHE_DB                SQLite file for the on-disk tier (enables caching)
+    GENAI_CACHE_TTL               Entry lifetime in seconds (default: no expiry)
+    GENAI_CACHE_MAX_ENTRIES       In-memory LRU size (default: 1024)
+    GENAI_CACHE_MAX_DISK_ENTRIES  SQLite tier size (default: 100000)
+    GENAI_CACHE_MAX_TEMPERATURE   Bypass the cache above this temperature unless the call passes
+                                  ``cacheable`` (default: 0; an unset temperature counts as the
+                                  model default of 1)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from google import genai
+
+from genai_common.retry import call_with_retry, call_with_retry_async
+from genai_common.settings import env_flag, env_number, env_optional_number
+
+# Defaults for the cache tiers
+DEFAULT_MAX_ENTRIES: int = 1024
+DEFAULT_MAX_DISK_ENTRIES: int = 100_000
+# Requests above this temperature bypass the cache unless the caller opts in
+DEFAULT_MAX_TEMPERATURE: float = 0.0
+# Temperature the model uses when a request does not set one
+MODEL_DEFAULT_TEMPERATURE: float = 1.0
+
+
+@dataclass
+class CachedResponse:
+    """
+    Stand-in for a ``GenerateContentResponse`` served from the cache.
+
+    Attributes:
+        text (str): The response text.
+        cached (bool): Always True; tells cache hits apart from SDK responses.
+        usage_metadata (Optional[genai.types.GenerateContentResponseUsageMetadata]):
+            Token counts of the original request (no tokens are billed for the hit).
+        finish_reason (Optional[str]): Finish reason of the original response, e.g. "STOP".
+    """
+
+    text: str
+    cached: bool = True
+    usage_metadata: Optional[genai.types.GenerateContentResponseUsageMetadata] = None
+    finish_reason: Optional[str] = None
+
+
+def response_finish_reason(response: Any) -> Optional[str]:
+    """
+    Returns the finish reason of a response, e.g. "STOP" or "MAX_TOKENS".
+
+    Args:
+        response (Any): An SDK response or a ``CachedResponse``.
+
+    Returns:
+        Optional[str]: The finish reason of the first candidate, or None when it is not reported.
+    """
+    if isinstance(response, CachedResponse):
+        return response.finish_reason
+    candidates = getattr(response, "candidates", None) or []
+    reason = getattr(candidates[0], "finish_reason", None) if candidates else None
+    return None if reason is None else getattr(reason, "value", str(reason))
+
+
+def _response_metadata(response: Any) -> dict:
+    """Collects the finish reason and token usage of a response for storage."""
+    metadata = {"finish_reason": response_finish_reason(response)}
+    usage = getattr(response, "usage_metadata", None)
+    if hasattr(usage, "model_dump"):
+        metadata["usage_metadata"] = usage.model_dump(mode="json", exclude_none=True)
+    return metadata
+
+
+def _is_storable(response: Any, should_cache: Optional[Callable[[Any], bool]]) -> bool:
+    """Tells whether a fresh response may be cached: non-empty, finished normally and accepted by ``should_cache``."""
+    if not (isinstance(getattr(response, "text", None), str) and response.text):
+        return False
+    # A response cut off by the output limit (or stopped for safety, ...) must not be replayed
+    if response_finish_reason(response) not in (None, "STOP"):
+        return False
+    return should_cache is None or should_cache(response)
+
+
+def _to_jsonable(value: Any) -> Any:
+    """
+    Converts prompt contents or a config into plain JSON-compatible data.
+
+    Args:
+        value (Any): A string, SDK model, or nested list/dict of those.
+
+    Returns:
+        Any: An equivalent structure of JSON types.
+    """
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json", exclude_none=True)
+    if isinstance(value, dict):
+        return {key: _to_jsonable(item) for key, item in value.items() if item is not None}
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(item) for item in value]
+    return value
+
+
+class ResponseCache:
+    """
+    Two-tier (memory LRU + optional SQLite) cache of responses with TTL.
+
+    Thread-safe; ``hits``, ``misses`` and ``bypassed`` count lookups since the
+    cache was created.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: Optional[float] = None,
+                 sqlite_path: Optional[str] = None, max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES,
+                 max_temperature: Optional[float] = DEFAULT_MAX_TEMPERATURE):
+        """
+        Creates the cache.
+
+        Args:
+            max_entries (int): Entries kept in the in-memory LRU tier.
+            ttl_seconds (Optional[float]): Entry lifetime; None keeps entries until evicted.
+            sqlite_path (Optional[str]): SQLite file for the on-disk tier; None disables it.
+            max_disk_entries (int): Entries kept in the SQLite tier (least recently used are evicted).
+            max_temperature (Optional[float]): Requests with a higher temperature bypass the
+                cache; None caches every temperature.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+        self.max_temperature = max_temperature
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self._memory: "OrderedDict[str, tuple[str, float, Optional[dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if sqlite_path:
+            directory = os.path.dirname(os.path.abspath(sqlite_path))
+            os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, text TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL, "
+                "metadata TEXT)"
+            )
+            # Files written before finish reasons and usage were stored lack the column
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(responses)")}
+            if "metadata" not in columns:
+                self._db.execute("ALTER TABLE responses ADD COLUMN metadata TEXT")
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            self._db.commit()
+
+    @staticmethod
+    def make_key(model: str, contents: Any, config: Any = None) -> str:
+        """
+        Builds the cache key for a request.
+
+        The key covers the model, every set field of the generation config
+        (system instruction, temperature, top_p, ...) and the contents.
+
+        Args:
+            model (str): Model name.
+            contents (Any): Prompt contents as passed to ``generate_content``.
+            config (Any): Optional ``GenerateContentConfig`` or equivalent dict.
+
+        Returns:
+            str: A sha256 hex digest identifying the request.
+        """
+        payload = json.dumps(
+            {"model": model, "config": _to_jsonable(config), "contents": _to_jsonable(contents)},
+            sort_keys=True, ensure_ascii=False, default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def is_cacheable(self, config: Any = None) -> bool:
+        """
+        Tells whether a request with this config may use the cache.
+
+        Args:
+            config (Any): Optional ``GenerateContentConfig`` or equivalent dict.
+
+        Returns:
+            bool: False when the temperature (the model default when unset) is above ``max_temperature``.
+        """
+        if self.max_temperature is None:
+            return True
+        temperature = config.get("temperature") if isinstance(config, dict) else getattr(config, "temperature", None)
+        if temperature is None:
+            temperature = MODEL_DEFAULT_TEMPERATURE
+        return temperature <= self.max_temperature
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Looks up a response text, promoting disk hits into the memory tier.
+
+        Args:
+            key (str): Key from ``make_key``.
+
+        Returns:
+            Optional[str]: The cached text, or None on a miss.
+        """
+        response = self.get_response(key)
+        return None if response is None else response.text
+
+    def get_response(self, key: str) -> Optional[CachedResponse]:
+        """
+        Looks up a response with its finish reason and token usage, promoting disk hits into the memory tier.
+
+        Args:
+            key (str): Key from ``make_key``.
+
+        Returns:
+            Optional[CachedResponse]: The cached response, or None on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[1], now):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return self._as_response(entry[0], entry[2])
+                del self._memory[key]
+            if self._db is not None:
+                row = self._db.execute("SELECT text, created, metadata FROM responses WHERE key = ?",
+                                       (key,)).fetchone()
+                if row is not None and not self._expired(row[1], now):
+                    self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    metadata = json.loads(row[2]) if row[2] else None
+                    self._remember(key, row[0], row[1], metadata)
+                    self.hits += 1
+                    return self._as_response(row[0], metadata)
+            self.misses += 1
+            return None
+
+    @staticmethod
+    def _as_response(text: str, metadata: Optional[dict]) -> CachedResponse:
+        metadata = metadata or {}
+        usage = metadata.get("usage_metadata")
+        return CachedResponse(
+            text=text,
+            usage_metadata=None if usage is None else genai.types.GenerateContentResponseUsageMetadata.model_validate(usage),
+            finish_reason=metadata.get("finish_reason"),
+        )
+
+    def _remember(self, key: str, text: str, created: float, metadata: Optional[dict]) -> None:
+        """Stores an entry in the memory tier and evicts the least recently used ones."""
+        self._memory[key] = (text, created, metadata)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def put(self, key: str, text: str, metadata: Optional[dict] = None) -> None:
+        """
+        Stores a response text in both tiers.
+
+        Args:
+            key (str): Key from ``make_key``.
+            text (str): The response text.
+            metadata (Optional[dict]): JSON-compatible ``finish_reason`` and ``usage_metadata``
+                of the response, returned with it by ``get_response``.
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, text, now, metadata)
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, text, created, accessed, metadata) VALUES (?, ?, ?, ?, ?)",
+                (key, text, now, now, None if metadata is None else json.dumps(metadata)),
+            )
+            if self.ttl_seconds is not None:
+                self._db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,),
+            )
+            self._db.commit()
+
+    def record_bypass(self) -> None:
+        """Counts a request that skipped the cache because of its temperature."""
+        with self._lock:
+            self.bypassed += 1
+
+    def stats(self) -> dict:
+        """
+        Returns the lookup counters.
+
+        Returns:
+            dict: ``hits``, ``misses``, ``bypassed`` and the ``hit_rate`` of cacheable lookups.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        """Removes every entry from both tiers (counters are kept)."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Returns the process-wide response cache configured from the environment.
+
+    Returns:
+        Optional[ResponseCache]: The shared cache, or None when caching is not
+        enabled (neither ``GENAI_CACHE`` nor ``GENAI_CACHE_DB`` is set).
+    """
+    global _response_cache
+    sqlite_path = os.getenv("GENAI_CACHE_DB")
+    if not (env_flag("GENAI_CACHE") or sqlite_path):
+        return None
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(
+                    max_entries=int(env_number("GENAI_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+                    ttl_seconds=env_optional_number("GENAI_CACHE_TTL"),
+                    sqlite_path=sqlite_path,
+                    max_disk_entries=int(env_number("GENAI_CACHE_MAX_DISK_ENTRIES", DEFAULT_MAX_DISK_ENTRIES)),
+                    max_temperature=env_number("GENAI_CACHE_MAX_TEMPERATURE", DEFAULT_MAX_TEMPERATURE),
+                )
+    return _response_cache
+
+
+def generate_content_cached(client: genai.Client, *, model: str, contents: Any, config: Any = None,
+                            cache: Optional[ResponseCache] = None,
+                            should_cache: Optional[Callable[[Any], bool]] = None, cacheable: Optional[bool] = None):
+    """
+    Calls ``client.models.generate_content`` through the response cache.
+
+    On a hit no request is made and a ``CachedResponse`` is returned, with
+    the finish reason and token usage of the original response; on a miss the
+    real response is returned and stored. Empty responses, responses that did
+    not finish normally (finish reason other than STOP, e.g. MAX_TOKENS) and
+    errors are never cached, nor are responses ``should_cache`` rejects.
+    Without a cache (the default when caching is not enabled in the
+    environment) this is a plain call.
+
+    The request itself goes through ``call_with_retry``, so rate limits,
+    server errors and timeouts are retried with backoff and every attempt is
+    recorded by telemetry.
+
+    Args:
+        client (genai.Client): Authenticated GenAI client.
+        model (str): Model name.
+        contents (Any): Prompt contents.
+        config (Any): Optional generation config.
+        cache (Optional[ResponseCache]): Cache to use; defaults to ``get_response_cache()``.
+        should_cache (Optional[Callable[[Any], bool]]): Extra check of a fresh response
+            before it is stored, e.g. that its JSON is valid.
+        cacheable (Optional[bool]): True uses the cache whatever the temperature, False
+            bypasses it; None (the default) leaves it to the cache's ``max_temperature``.
+
+    Returns:
+        The SDK response, or a ``CachedResponse`` with the same ``text``, ``usage_metadata`` and finish reason.
+    """
+    cache = cache if cache is not None else get_response_cache()
+    if cache is None or not (cache.is_cacheable(config) if cacheable is None else cacheable):
+        if cache is not None:
+            cache.record_bypass()
+        return call_with_retry(client.models.generate_content, model=model, contents=contents, config=config)
+
+    key = cache.make_key(model, contents, config)
+    cached = cache.get_response(key)
+    if cached is not None:
+        return cached
+    response = call_with_retry(client.models.generate_content, model=model, contents=contents, config=config)
+    if _is_storable(response, should_cache):
+        cache.put(key, response.text, _response_metadata(response))
+    return response
+
+
+async def generate_content_cached_async(client: genai.Client, *, model: str, contents: Any, config: Any = None,
+                                        cache: Optional[ResponseCache] = None,
+                                        should_cache: Optional[Callable[[Any], bool]] = None,
+                                        cacheable: Optional[bool] = None):
+    """
+    Async version of ``generate_content_cached``, calling ``client.aio.models.generate_content``.
+
+    Cache lookups, stores and retries are the same as in the synchronous
+    version (and share its cache), so a response cached by either is served
+    to both.
+
+    Args:
+        client (genai.Client): Authenticated GenAI client.
+        model (str): Model name.
+        contents (Any): Prompt contents.
+        config (Any): Optional generation config.
+        cache (Optional[ResponseCache]): Cache to use; defaults to ``get_response_cache()``.
+        should_cache (Optional[Callable[[Any], bool]]): Extra check of a fresh response
+            before it is stored, e.g. that its JSON is valid.
+        cacheable (Optional[bool]): True uses the cache whatever the temperature, False
+            bypasses it; None (the default) leaves it to the cache's ``max_temperature``.
+
+    Returns:
+        The SDK response, or a ``CachedResponse`` with the same ``text``, ``usage_metadata`` and finish reason.
+    """
+    cache = cache if cache is not None else get_response_cache()
+    if cache is None or not (cache.is_cacheable(config) if cacheable is None else cacheable):
+        if cache is not None:
+            cache.record_bypass()
+        return await call_with_retry_async(client.aio.models.generate_content, model=model, contents=contents,
+                                           config=config)
+
+    key = cache.make_key(model, contents, config)
+    cached = cache.get_response(key)
+    if cached is not None:
+        return cached
+    response = await call_with_retry_async(client.aio.models.generate_content, model=model, contents=contents,
+                                           config=config)
+    if _is_storable(response, should_cache):
+        cache.put(key, response.text, _response_metadata(response))
+    return response
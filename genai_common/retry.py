@@ -0,0 +1,165 @@
+"""
+Retrying model calls that failed for a transient reason.
+
+Rate limits (429), server errors (5xx), request timeouts and transport errors
+usually succeed when the request is sent again a little later. Other client
+errors (400, 401, 403, 404, ...) fail the same way every time, so retrying
+them only burns quota and delays the error. ``is_retryable_error`` tells the
+two apart, and ``backoff_delay`` spaces the retries out.
+
+``call_with_retry`` and ``call_with_retry_async`` wrap one call in such a
+retry loop; ``generate_content_cached`` sends every request through them.
+Every retry loop marks its attempts with ``retry_attempt``, so telemetry
+records which calls were retries (see ``genai_common.telemetry``).
+
+Configured from the environment:
+
+    GENAI_MAX_RETRIES             Retries after the first attempt (default: 3)
+    GENAI_RETRY_BASE_DELAY        Seconds before the first retry; doubles on each attempt (default: 1)
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import random
+import time
+from typing import Any, Awaitable, Callable, Iterator, Optional
+
+import httpx
+from google.genai import errors
+
+from genai_common.settings import env_number
+
+# HTTP status codes worth sending again (5xx codes are always retried)
+RETRYABLE_STATUS_CODES: frozenset[int] = frozenset({408, 429})
+# Defaults of the shared retry loop
+DEFAULT_MAX_RETRIES: int = 3
+DEFAULT_RETRY_BASE_DELAY: float = 1.0
+
+# Attempt number of the calls made by the current retry loop (0 = first try)
+_retry_attempt: contextvars.ContextVar[int] = contextvars.ContextVar("genai_retry_attempt", default=0)
+
+
+@contextlib.contextmanager
+def retry_attempt(attempt: int) -> Iterator[None]:
+    """
+    Marks the model calls made inside the block as retry ``attempt``.
+
+    Args:
+        attempt (int): Zero for the first try, then 1, 2, ... for each retry.
+    """
+    token = _retry_attempt.set(attempt)
+    try:
+        yield
+    finally:
+        _retry_attempt.reset(token)
+
+
+def current_retry_attempt() -> int:
+    """
+    Returns the attempt number set by the enclosing ``retry_attempt`` block.
+
+    Returns:
+        int: Zero outside a retry loop or on a first try.
+    """
+    return _retry_attempt.get()
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Tells whether a failed model call may succeed if it is sent again.
+
+    Args:
+        error (BaseException): The exception raised by the call.
+
+    Returns:
+        bool: True for rate limits, server errors, timeouts and transport
+        errors; False for every other error.
+    """
+    if isinstance(error, errors.APIError):
+        return error.code in RETRYABLE_STATUS_CODES or (error.code or 0) >= 500
+    return isinstance(error, (httpx.TransportError, TimeoutError, ConnectionError))
+
+
+def backoff_delay(attempt: int, base_delay: float) -> float:
+    """
+    Returns the wait before retry ``attempt + 1``: exponential with jitter.
+
+    The jitter keeps concurrent workers that failed together from retrying in lockstep.
+
+    Args:
+        attempt (int): The attempt that just failed (0 for the first try).
+        base_delay (float): Seconds before the first retry; doubles on each attempt.
+
+    Returns:
+        float: Seconds to wait.
+    """
+    return base_delay * (2 ** attempt) * (0.5 + random.random())
+
+
+def _retry_settings(max_retries: Optional[int], base_delay: Optional[float]) -> tuple[int, float]:
+    if max_retries is None:
+        max_retries = int(env_number("GENAI_MAX_RETRIES", DEFAULT_MAX_RETRIES))
+    if base_delay is None:
+        base_delay = env_number("GENAI_RETRY_BASE_DELAY", DEFAULT_RETRY_BASE_DELAY)
+    return max_retries, base_delay
+
+
+def call_with_retry(function: Callable[..., Any], *args: Any, max_retries: Optional[int] = None,
+                    base_delay: Optional[float] = None, **kwargs: Any) -> Any:
+    """
+    Calls ``function(*args, **kwargs)``, retrying transient errors with exponential backoff.
+
+    Args:
+        function (Callable[..., Any]): The call to make, e.g. ``client.models.generate_content``.
+        *args (Any): Positional arguments of the call.
+        max_retries (Optional[int]): Retries after the first attempt; defaults to ``GENAI_MAX_RETRIES``.
+        base_delay (Optional[float]): Seconds before the first retry; defaults to ``GENAI_RETRY_BASE_DELAY``.
+        **kwargs (Any): Keyword arguments of the call.
+
+    Returns:
+        Any: The result of the first successful attempt.
+
+    Raises:
+        Exception: A non-retryable error, or the last error once all retries are exhausted.
+    """
+    max_retries, base_delay = _retry_settings(max_retries, base_delay)
+    for attempt in range(max_retries + 1):
+        try:
+            with retry_attempt(attempt):
+                return function(*args, **kwargs)
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable_error(e):
+                raise
+            time.sleep(backoff_delay(attempt, base_delay))
+    raise AssertionError("unreachable")
+
+
+async def call_with_retry_async(function: Callable[..., Awaitable[Any]], *args: Any, max_retries: Optional[int] = None,
+                                base_delay: Optional[float] = None, **kwargs: Any) -> Any:
+    """
+    Async version of ``call_with_retry`` for coroutine functions such as ``client.aio.models.generate_content``.
+
+    Args:
+        function (Callable[..., Awaitable[Any]]): The coroutine function to call.
+        *args (Any): Positional arguments of the call.
+        max_retries (Optional[int]): Retries after the first attempt; defaults to ``GENAI_MAX_RETRIES``.
+        base_delay (Optional[float]): Seconds before the first retry; defaults to ``GENAI_RETRY_BASE_DELAY``.
+        **kwargs (Any): Keyword arguments of the call.
+
+    Returns:
+        Any: The result of the first successful attempt.
+
+    Raises:
+        Exception: A non-retryable error, or the last error once all retries are exhausted.
+    """
+    max_retries, base_delay = _retry_settings(max_retries, base_delay)
+    for attempt in range(max_retries + 1):
+        try:
+            with retry_attempt(attempt):
+                return await function(*args, **kwargs)
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable_error(e):
+                raise
+            await asyncio.sleep(backoff_delay(attempt, base_delay))
+    raise AssertionError("unreachable")
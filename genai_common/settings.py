@@ -0,0 +1,55 @@
+"""
+Helpers for reading the optional environment settings of the shared modules.
+"""
+
+import os
+from typing import Optional
+
+
+def env_number(name: str, default: float) -> float:
+    """
+    Reads a numeric setting from the environment.
+
+    Args:
+        name (str): Environment variable name.
+        default (float): Value used when the variable is unset or empty.
+
+    Returns:
+        float: The configured value.
+
+    Raises:
+        ValueError: If the variable is set but is not a number.
+    """
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got: {value!r}")
+
+
+def env_optional_number(name: str) -> Optional[float]:
+    """
+    Reads an optional numeric setting from the environment.
+
+    Args:
+        name (str): Environment variable name.
+
+    Returns:
+        Optional[float]: The configured value, or None when unset or empty.
+    """
+    return env_number(name, 0.0) if os.getenv(name) else None
+
+
+def env_flag(name: str) -> bool:
+    """
+    Reads a boolean switch from the environment.
+
+    Args:
+        name (str): Environment variable name.
+
+    Returns:
+        bool: True for "1", "true", "yes" or "on" (case-insensitive).
+    """
+    return os.getenv(name, "").strip().lower() in {"1", "true", "yes", "on"}
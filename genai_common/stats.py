@@ -0,0 +1,51 @@
+"""
+Latency statistics for the batch modes of the tools.
+"""
+
+import math
+from typing import Iterable
+
+
+def percentile(values: Iterable[float], pct: float) -> float:
+    """
+    Computes a percentile with linear interpolation between the closest ranks.
+
+    Args:
+        values (Iterable[float]): The samples.
+        pct (float): Percentile between 0 and 100.
+
+    Returns:
+        float: The percentile, or 0.0 when there are no samples.
+
+    Raises:
+        ValueError: If ``pct`` is outside 0-100.
+    """
+    if not 0 <= pct <= 100:
+        raise ValueError(f"pct must be between 0 and 100, got: {pct}")
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def latency_summary(latencies: Iterable[float]) -> dict:
+    """
+    Summarizes request latencies.
+
+    Args:
+        latencies (Iterable[float]): Latencies in seconds.
+
+    Returns:
+        dict: ``count``, ``mean``, ``p50``, ``p95`` and ``max`` in seconds.
+    """
+    samples = list(latencies)
+    return {
+        "count": len(samples),
+        "mean": sum(samples) / len(samples) if samples else 0.0,
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "max": max(samples, default=0.0),
+    }
@@ -0,0 +1,80 @@
+"""
+Streamed generation that prints text as it arrives.
+
+``stream_generate`` wraps ``client.models.generate_content_stream`` and writes
+every chunk to the console immediately, so interactive tools show output
+after the first token instead of after the whole response. It measures
+time-to-first-token and total latency for the caller to report.
+"""
+
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from google import genai
+
+
+@dataclass
+class StreamResult:
+    """
+    Outcome of a streamed generation.
+
+    Attributes:
+        text (str): The full generated text.
+        time_to_first_token (Optional[float]): Seconds until the first text chunk
+            arrived, or None if the model returned no text.
+        total_seconds (float): Seconds until the stream finished.
+    """
+
+    text: str
+    time_to_first_token: Optional[float]
+    total_seconds: float
+
+    def timing_summary(self) -> str:
+        """
+        Formats the latency figures for display.
+
+        Returns:
+            str: A one-line summary such as "Time to first token: 0.42s | Total: 3.10s".
+        """
+        first = "n/a" if self.time_to_first_token is None else f"{self.time_to_first_token:.2f}s"
+        return f"Time to first token: {first} | Total: {self.total_seconds:.2f}s"
+
+
+def _write_to_stdout(text: str) -> None:
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+def stream_generate(client: genai.Client, *, model: str, contents: Any, config: Any = None,
+                    on_text: Callable[[str], None] = _write_to_stdout) -> StreamResult:
+    """
+    Generates content as a stream, handing each text chunk to ``on_text`` as it arrives.
+
+    Errors from the SDK propagate unchanged so each tool can turn them into
+    its usual error messages.
+
+    Args:
+        client (genai.Client): Authenticated GenAI client.
+        model (str): Model name.
+        contents (Any): Prompt contents.
+        config (Any): Optional generation config.
+        on_text (Callable[[str], None]): Receives each chunk; prints to stdout by default.
+
+    Returns:
+        StreamResult: The full text with time-to-first-token and total latency.
+    """
+    started = time.perf_counter()
+    first_token: Optional[float] = None
+    parts: list[str] = []
+    for chunk in client.models.generate_content_stream(model=model, contents=contents, config=config):
+        text = chunk.text
+        if not text:
+            continue
+        if first_token is None:
+            first_token = time.perf_counter() - started
+        parts.append(text)
+        on_text(text)
+    return StreamResult(text="".join(parts), time_to_first_token=first_token,
+                        total_seconds=time.perf_counter() - started)
@@ -0,0 +1,430 @@
+"""
+Request-level telemetry for every model call.
+
+``instrument_client`` wraps ``generate_content``, ``generate_content_stream``
+and ``embed_content`` of a client (and their ``client.aio`` counterparts),
+and ``caches.create``, so that every call is recorded with its wall time,
+model, status, token usage and retry attempt. ``get_genai_client`` instruments the shared client when
+telemetry is enabled, so all tools are covered without changes of their own.
+
+Records can be appended to a JSONL file as they happen and aggregated into a
+Prometheus textfile (for the node exporter's textfile collector). At process
+exit a summary table of calls, errors, retries, latency percentiles and
+tokens per operation and model is printed to stderr.
+
+Retry loops mark their attempts with ``retry_attempt`` (see
+``genai_common.retry``) so that the calls made inside are recorded with the
+attempt number.
+
+Configured from the environment:
+
+    GENAI_TELEMETRY               "1" to record calls and print the summary at exit
+    GENAI_TELEMETRY_JSONL         JSONL file that receives one line per call (enables telemetry)
+    GENAI_TELEMETRY_PROM          Prometheus textfile rewritten with the aggregates (enables telemetry)
+    GENAI_TELEMETRY_SUMMARY       "0" to skip the summary table at exit
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional, TextIO
+
+from google import genai
+
+from genai_common.context_cache import estimate_tokens, usage_from_response
+from genai_common.retry import current_retry_attempt
+from genai_common.settings import env_flag
+from genai_common.stats import percentile
+
+# Minimum seconds between rewrites of the Prometheus textfile while running
+PROM_WRITE_INTERVAL_SECONDS: float = 10.0
+
+@dataclass
+class CallRecord:
+    """
+    One recorded model call.
+
+    Attributes:
+        timestamp (float): Unix time when the call started.
+        operation (str): "generate_content", "generate_content_stream", "embed_content"
+            or "create_cached_content".
+        model (str): Model name.
+        status (str): "ok" or "error".
+        latency_seconds (float): Wall time of the call (of the whole stream for streaming calls).
+        retries (int): Retry attempt the call belongs to (0 for a first try).
+        input_tokens (int): Prompt tokens (estimated for embeddings; the uploaded
+            prefix for ``create_cached_content``).
+        cached_tokens (int): Prompt tokens served from the context cache.
+        output_tokens (int): Generated tokens.
+        error (Optional[str]): Exception type and message of a failed call.
+    """
+
+    timestamp: float
+    operation: str
+    model: str
+    status: str
+    latency_seconds: float
+    retries: int = 0
+    input_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class _Aggregate:
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    input_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+    latencies: list[float] = field(default_factory=list)
+
+
+def _prom_escape(value: str) -> str:
+    """Escapes a label value for the Prometheus text format (backslash, double quote and newline)."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _prom_labels(operation: str, model: str, **extra: str) -> str:
+    labels = {"operation": operation, "model": model, **extra}
+    return ",".join(f'{name}="{_prom_escape(value)}"' for name, value in labels.items())
+
+
+class Telemetry:
+    """
+    Collects call records and exports them to the configured sinks.
+
+    Thread-safe; records are aggregated per (operation, model).
+    """
+
+    def __init__(self, jsonl_path: Optional[str] = None, prom_path: Optional[str] = None):
+        """
+        Creates the collector.
+
+        Args:
+            jsonl_path (Optional[str]): JSONL file receiving one line per call; None disables it.
+            prom_path (Optional[str]): Prometheus textfile for the aggregates; None disables it.
+        """
+        self.jsonl_path = jsonl_path
+        self.prom_path = prom_path
+        self._aggregates: dict[tuple[str, str], _Aggregate] = {}
+        self._lock = threading.Lock()
+        self._prom_lock = threading.Lock()
+        self._jsonl: Optional[TextIO] = None
+        self._prom_written = 0.0
+        if jsonl_path:
+            os.makedirs(os.path.dirname(os.path.abspath(jsonl_path)), exist_ok=True)
+            self._jsonl = open(jsonl_path, "a", encoding="utf-8")
+
+    def record(self, record: CallRecord) -> None:
+        """
+        Adds a call to the aggregates and appends it to the JSONL sink.
+
+        Args:
+            record (CallRecord): The call to record.
+        """
+        with self._lock:
+            aggregate = self._aggregates.setdefault((record.operation, record.model), _Aggregate())
+            aggregate.calls += 1
+            aggregate.errors += record.status != "ok"
+            aggregate.retries += record.retries > 0
+            aggregate.input_tokens += record.input_tokens
+            aggregate.cached_tokens += record.cached_tokens
+            aggregate.output_tokens += record.output_tokens
+            aggregate.latencies.append(record.latency_seconds)
+            if self._jsonl is not None:
+                self._jsonl.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
+                self._jsonl.flush()
+            write_prom = self.prom_path and time.monotonic() - self._prom_written >= PROM_WRITE_INTERVAL_SECONDS
+            if write_prom:
+                self._prom_written = time.monotonic()
+        if write_prom:
+            self.write_prometheus()
+
+    def summary(self) -> list[dict]:
+        """
+        Returns the aggregates, slowest total time first.
+
+        Returns:
+            list[dict]: One row per (operation, model) with ``calls``, ``errors``,
+            ``retries``, ``p50``/``p95``/``p99``/``max`` latency, ``total_seconds``
+            and token totals.
+        """
+        with self._lock:
+            items = [(key, aggregate, list(aggregate.latencies)) for key, aggregate in self._aggregates.items()]
+        rows = []
+        for (operation, model), aggregate, latencies in items:
+            rows.append({
+                "operation": operation,
+                "model": model,
+                "calls": aggregate.calls,
+                "errors": aggregate.errors,
+                "retries": aggregate.retries,
+                "p50": percentile(latencies, 50),
+                "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99),
+                "max": max(latencies, default=0.0),
+                "total_seconds": sum(latencies),
+                "input_tokens": aggregate.input_tokens,
+                "cached_tokens": aggregate.cached_tokens,
+                "output_tokens": aggregate.output_tokens,
+            })
+        return sorted(rows, key=lambda row: row["total_seconds"], reverse=True)
+
+    def write_prometheus(self) -> None:
+        """Rewrites the Prometheus textfile with the current aggregates (atomically)."""
+        if not self.prom_path:
+            return
+        lines = [
+            "# HELP genai_requests_total Model calls by operation, model and status.",
+            "# TYPE genai_requests_total counter",
+        ]
+        rows = self.summary()
+        for row in rows:
+            labels = (row["operation"], row["model"])
+            lines.append(f"genai_requests_total{{{_prom_labels(*labels, status='ok')}}} {row['calls'] - row['errors']}")
+            lines.append(f"genai_requests_total{{{_prom_labels(*labels, status='error')}}} {row['errors']}")
+        lines += ["# HELP genai_request_retries_total Model calls that were retries.",
+                  "# TYPE genai_request_retries_total counter"]
+        lines += [f"genai_request_retries_total{{{_prom_labels(row['operation'], row['model'])}}} {row['retries']}"
+                  for row in rows]
+        lines += ["# HELP genai_tokens_total Tokens by operation, model and kind.",
+                  "# TYPE genai_tokens_total counter"]
+        for row in rows:
+            for kind in ("input", "cached", "output"):
+                labels = _prom_labels(row["operation"], row["model"], kind=kind)
+                lines.append(f"genai_tokens_total{{{labels}}} {row[f'{kind}_tokens']}")
+        lines += ["# HELP genai_request_latency_seconds Wall time of model calls.",
+                  "# TYPE genai_request_latency_seconds summary"]
+        for row in rows:
+            labels = _prom_labels(row["operation"], row["model"])
+            for quantile, column in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+                quantile_labels = _prom_labels(row["operation"], row["model"], quantile=quantile)
+                lines.append(f"genai_request_latency_seconds{{{quantile_labels}}} {row[column]:.6f}")
+            lines.append(f"genai_request_latency_seconds_sum{{{labels}}} {row['total_seconds']:.6f}")
+            lines.append(f"genai_request_latency_seconds_count{{{labels}}} {row['calls']}")
+
+        directory = os.path.dirname(os.path.abspath(self.prom_path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.prom_path}.{os.getpid()}.tmp"
+        with self._prom_lock:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                file.write("\n".join(lines) + "\n")
+            # The textfile collector must never read a half-written file
+            os.replace(temp_path, self.prom_path)
+
+    def print_summary(self, stream: TextIO = sys.stderr) -> None:
+        """
+        Prints the aggregates as a table.
+
+        Args:
+            stream (TextIO): Where to print; stderr by default so piped output stays clean.
+        """
+        rows = self.summary()
+        if not rows:
+            return
+        print("\n=== Model call telemetry ===", file=stream)
+        print(f"{'operation':<24} {'model':<28} {'calls':>6} {'errors':>6} {'retries':>7} {'p50':>7} {'p95':>7} "
+              f"{'p99':>7} {'total':>8} {'in tok':>9} {'out tok':>9}", file=stream)
+        for row in rows:
+            print(f"{row['operation']:<24} {row['model']:<28} {row['calls']:>6} {row['errors']:>6} "
+                  f"{row['retries']:>7} {row['p50']:>6.2f}s {row['p95']:>6.2f}s {row['p99']:>6.2f}s "
+                  f"{row['total_seconds']:>7.2f}s {row['input_tokens']:>9} {row['output_tokens']:>9}", file=stream)
+
+    def close(self) -> None:
+        """Writes the final Prometheus textfile and closes the JSONL sink."""
+        self.write_prometheus()
+        with self._lock:
+            if self._jsonl is not None:
+                self._jsonl.close()
+                self._jsonl = None
+
+
+def _input_tokens(contents: Any) -> int:
+    """Estimates the prompt tokens of embedding contents, which report no usage."""
+    if isinstance(contents, str):
+        return estimate_tokens(contents)
+    if isinstance(contents, (list, tuple)):
+        return sum(_input_tokens(item) for item in contents)
+    return 0
+
+
+def _make_record(operation: str, model: str, started: float, elapsed: float, response: Any = None,
+                 error: Optional[BaseException] = None, contents: Any = None) -> CallRecord:
+    record = CallRecord(timestamp=started, operation=operation, model=model,
+                        status="ok" if error is None else "error", latency_seconds=elapsed,
+                        retries=current_retry_attempt())
+    if error is not None:
+        record.error = f"{type(error).__name__}: {error}"
+    elif operation == "embed_content":
+        record.input_tokens = _input_tokens(contents)
+    elif operation == "create_cached_content":
+        record.input_tokens = getattr(getattr(response, "usage_metadata", None), "total_token_count", None) or 0
+    elif response is not None:
+        usage = usage_from_response(response)
+        record.input_tokens = usage.input_tokens
+        record.cached_tokens = usage.cached_tokens
+        record.output_tokens = usage.output_tokens
+    return record
+
+
+@dataclass
+class _StreamTotals:
+    text: str
+    usage_metadata: Any
+
+
+def _wrap_call(telemetry: Telemetry, operation: str, method: Any) -> Any:
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        started, clock = time.time(), time.perf_counter()
+        try:
+            response = method(*args, **kwargs)
+        except Exception as e:
+            telemetry.record(_make_record(operation, kwargs.get("model", ""), started,
+                                          time.perf_counter() - clock, error=e))
+            raise
+        telemetry.record(_make_record(operation, kwargs.get("model", ""), started, time.perf_counter() - clock,
+                                      response=response, contents=kwargs.get("contents")))
+        return response
+    return wrapper
+
+
+def _wrap_async_call(telemetry: Telemetry, operation: str, method: Any) -> Any:
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        started, clock = time.time(), time.perf_counter()
+        try:
+            response = await method(*args, **kwargs)
+        except Exception as e:
+            telemetry.record(_make_record(operation, kwargs.get("model", ""), started,
+                                          time.perf_counter() - clock, error=e))
+            raise
+        telemetry.record(_make_record(operation, kwargs.get("model", ""), started, time.perf_counter() - clock,
+                                      response=response, contents=kwargs.get("contents")))
+        return response
+    return wrapper
+
+
+def _wrap_stream(telemetry: Telemetry, method: Any) -> Any:
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        started, clock = time.time(), time.perf_counter()
+        model = kwargs.get("model", "")
+        last_chunk, parts = None, []
+        try:
+            for chunk in method(*args, **kwargs):
+                last_chunk = chunk
+                parts.append(getattr(chunk, "text", None) or "")
+                yield chunk
+        except Exception as e:
+            telemetry.record(_make_record("generate_content_stream", model, started,
+                                          time.perf_counter() - clock, error=e))
+            raise
+        # Usage metadata arrives with the final chunk; the text is the joined stream
+        final = _StreamTotals(text="".join(parts), usage_metadata=getattr(last_chunk, "usage_metadata", None))
+        telemetry.record(_make_record("generate_content_stream", model, started, time.perf_counter() - clock,
+                                      response=final))
+    return wrapper
+
+
+def _wrap_async_stream(telemetry: Telemetry, method: Any) -> Any:
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        started, clock = time.time(), time.perf_counter()
+        model = kwargs.get("model", "")
+        try:
+            stream = await method(*args, **kwargs)
+        except Exception as e:
+            telemetry.record(_make_record("generate_content_stream", model, started,
+                                          time.perf_counter() - clock, error=e))
+            raise
+
+        async def chunks():
+            last_chunk, parts = None, []
+            try:
+                async for chunk in stream:
+                    last_chunk = chunk
+                    parts.append(getattr(chunk, "text", None) or "")
+                    yield chunk
+            except Exception as e:
+                telemetry.record(_make_record("generate_content_stream", model, started,
+                                              time.perf_counter() - clock, error=e))
+                raise
+            final = _StreamTotals(text="".join(parts), usage_metadata=getattr(last_chunk, "usage_metadata", None))
+            telemetry.record(_make_record("generate_content_stream", model, started, time.perf_counter() - clock,
+                                          response=final))
+        return chunks()
+    return wrapper
+
+
+def instrument_client(client: genai.Client, telemetry: "Telemetry") -> genai.Client:
+    """
+    Records every ``generate_content``, ``generate_content_stream`` and
+    ``embed_content`` call made through a client (sync and ``client.aio``),
+    and every context cache upload (``caches.create``).
+
+    Instrumenting the same client twice has no further effect. Errors are
+    recorded and re-raised unchanged.
+
+    Args:
+        client (genai.Client): The client to instrument.
+        telemetry (Telemetry): Collector receiving the records.
+
+    Returns:
+        genai.Client: The same client.
+    """
+    models, aio_models = client.models, client.aio.models
+    if getattr(models, "_telemetry", None) is not None:
+        return client
+    models.generate_content = _wrap_call(telemetry, "generate_content", models.generate_content)
+    models.embed_content = _wrap_call(telemetry, "embed_content", models.embed_content)
+    models.generate_content_stream = _wrap_stream(telemetry, models.generate_content_stream)
+    aio_models.generate_content = _wrap_async_call(telemetry, "generate_content", aio_models.generate_content)
+    aio_models.embed_content = _wrap_async_call(telemetry, "embed_content", aio_models.embed_content)
+    aio_models.generate_content_stream = _wrap_async_stream(telemetry, aio_models.generate_content_stream)
+    client.caches.create = _wrap_call(telemetry, "create_cached_content", client.caches.create)
+    models._telemetry = telemetry
+    return client
+
+
+_telemetry: Optional[Telemetry] = None
+_telemetry_lock = threading.Lock()
+
+
+def _shutdown(telemetry: Telemetry) -> None:
+    telemetry.close()
+    if os.getenv("GENAI_TELEMETRY_SUMMARY", "").strip().lower() not in {"0", "false", "no", "off"}:
+        telemetry.print_summary()
+
+
+def get_telemetry() -> Optional[Telemetry]:
+    """
+    Returns the process-wide telemetry collector configured from the environment.
+
+    The first call registers an exit handler that writes the final
+    Prometheus textfile and prints the summary table.
+
+    Returns:
+        Optional[Telemetry]: The shared collector, or None when telemetry is not
+        enabled (none of ``GENAI_TELEMETRY``, ``GENAI_TELEMETRY_JSONL`` or
+        ``GENAI_TELEMETRY_PROM`` is set).
+    """
+    global _telemetry
+    jsonl_path = os.getenv("GENAI_TELEMETRY_JSONL")
+    prom_path = os.getenv("GENAI_TELEMETRY_PROM")
+    if not (env_flag("GENAI_TELEMETRY") or jsonl_path or prom_path):
+        return None
+    if _telemetry is None:
+        with _telemetry_lock:
+            if _telemetry is None:
+                _telemetry = Telemetry(jsonl_path=jsonl_path, prom_path=prom_path)
+                atexit.register(_shutdown, _telemetry)
+    return _telemetry